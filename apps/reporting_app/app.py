@@ -1,4 +1,4 @@
-from dash import Dash, html, dcc
+from dash import Dash, DiskcacheManager, html, dcc, Input, Output, callback, no_update
 import dash_bootstrap_components as dbc
 from src.components.tabs.sprint_dashboard.callbacks \
     import avg_cycletime_callbacks, filters_callbacks, \
@@ -9,22 +9,75 @@ from src.components.tabs.sprint_dashboard.sprint_tab import create_sprint_tab
 from src.components.tabs.dora_dashboard.dora_tab import create_dora_tab
 from src.components.tabs.dora_dashboard.callbacks import filters_callbacks as dora_filters_callbacks
 from src.components.tabs.dora_dashboard.callbacks import dora_tiles_callbacks
-from flask import send_file
+from src.components.loading import create_loading_content
+from flask import send_file, request, g, Response
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from src.utils.s3_utils import download_csv_from_s3
+from src.utils.startup_utils import StartupTimer
+from src.utils.metrics_utils import METRICS_REGISTRY
+from src.utils.profiler_utils import CallbackProfiler
+from src.utils.cache_utils import SqliteCache
+from src.data.data_filters import JiraDataFilterService
+from src.data.data_durations import JiraDataSprintDurationService
+from src.data.data_tables import JiraDataTicketTableService
+from src.data.data_stage_metrics import JiraDataStageMetricsService
+from src.config.app_settings import AppSettings
 
 # load environment variables
 load_dotenv()
 
-# Download CSV from S3 if configured
-download_csv_from_s3()
-
-# Access jira data
+startup_timer = StartupTimer()
+startup_errors = []
 jira_data_singleton = JiraDataSingleton()
-jira_data = jira_data_singleton.get_jira_data()
 
-app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+def load_jira_data():
+    try:
+        # Download CSV from S3 if configured
+        with startup_timer.phase('download csv'):
+            download_csv_from_s3()
+
+        # Access jira data, new versions of the CSV are loaded in the background and picked up by the next request
+        with startup_timer.phase('load jira data'):
+            jira_data_singleton.get_jira_data()
+        jira_data_singleton.start_watcher(AppSettings().REPORTING_RELOAD_INTERVAL_SECONDS)
+    except Exception as e:
+        print(f"Error loading jira data: {str(e)}")
+        startup_errors.append(str(e))
+
+# With lazy startup the server starts right away and serves a loading page until the data is loaded
+lazy_startup_enabled = AppSettings().REPORTING_LAZY_STARTUP_ENABLED
+if lazy_startup_enabled:
+    threading.Thread(target=load_jira_data, name='jira-data-startup', daemon=True).start()
+else:
+    load_jira_data()
+
+# The grid tables are built in worker processes when enabled, keeping the request threads free for the light callbacks
+background_callbacks_enabled = AppSettings().REPORTING_BACKGROUND_CALLBACKS_ENABLED
+background_callback_manager = None
+if background_callbacks_enabled:
+    try:
+        import diskcache
+        # Results are kept on disk per dataset version, the first poll for a table another user already built gets it
+        background_callback_manager = DiskcacheManager(
+            diskcache.Cache(AppSettings().REPORTING_BACKGROUND_CALLBACKS_DIR),
+            cache_by=[lambda: getattr(jira_data_singleton.get_loaded_jira_data(), 'version', None)],
+            expire=AppSettings().REPORTING_RESULT_CACHE_TTL_SECONDS
+        )
+        # The page requests read the tables the worker processes built from a file next to their results
+        JiraDataTicketTableService.set_shared_cache(SqliteCache(
+            os.path.join(AppSettings().REPORTING_BACKGROUND_CALLBACKS_DIR, 'ticket_tables.sqlite'), 'ticket_table',
+            max_size=AppSettings().TICKET_TABLE_CACHE_MAX_SIZE, ttl_seconds=AppSettings().REPORTING_RESULT_CACHE_TTL_SECONDS
+        ))
+    except ImportError as e:
+        print(f"Background callbacks need diskcache, multiprocess and psutil, running them in the request threads: {str(e)}")
+        background_callbacks_enabled = False
+
+app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], background_callback_manager=background_callback_manager)
+# WSGI entry point of the production server, see gunicorn.conf.py
+server = app.server
 
 @app.server.route('/download_csv_file')
 def download_jira_csv():
@@ -33,29 +86,161 @@ def download_jira_csv():
         return "CSV file not found", 404
     return send_file(csv_path, as_attachment=True, download_name='jira_metrics.csv', mimetype='text/csv')
 
-# Create main layout with tabs
-app.layout = html.Div([
-    # Add dcc.Store component to store ticket IDs
-    dcc.Store(id='tickets-in-stage-ticket-ids'),
+def collect_metrics() -> list[tuple[str, str, dict, float]]:
+    samples = [('reporting_startup_phase_seconds', 'gauge', {'phase': phase}, seconds) for phase, seconds in startup_timer.get_phases().items()]
+
+    jira_data = jira_data_singleton.get_loaded_jira_data()
+    samples.append(('reporting_dataset_loaded', 'gauge', {}, int(jira_data is not None)))
+    if jira_data is not None:
+        samples.append(('reporting_dataset_info', 'gauge', {'version': jira_data.version}, 1))
+        samples.append(('reporting_dataset_tickets', 'gauge', {}, len(jira_data.get_tickets())))
+
+    for cache_name, service in [('filter', JiraDataFilterService), ('sprint_duration', JiraDataSprintDurationService),
+                                ('ticket_table', JiraDataTicketTableService), ('avg_days', JiraDataStageMetricsService)]:
+        stats = service.get_cache_stats()
+        lookups = stats['hits'] + stats['misses']
+        samples.extend([
+            ('reporting_cache_hits_total', 'counter', {'cache': cache_name}, stats['hits']),
+            ('reporting_cache_misses_total', 'counter', {'cache': cache_name}, stats['misses']),
+            ('reporting_cache_hit_ratio', 'gauge', {'cache': cache_name}, stats['hits'] / lookups if lookups else 0),
+            ('reporting_cache_entries', 'gauge', {'cache': cache_name}, stats['size'])
+        ])
+    return samples
+
+# Latency of every callback request and the state of the data and caches, cheap enough to stay enabled
+if AppSettings().REPORTING_METRICS_ENABLED:
+    METRICS_REGISTRY.describe('reporting_callback_seconds', 'Latency of the Dash callback requests by output and status')
+    METRICS_REGISTRY.describe('reporting_filter_tickets_seconds', 'Latency of JiraDataFilterService.filter_tickets')
+    METRICS_REGISTRY.describe('reporting_calculate_tickets_duration_in_sprint_seconds', 'Latency of StageUtils.calculate_tickets_duration_in_sprint')
+    METRICS_REGISTRY.describe('reporting_load_phase_seconds', 'Latency of the phases of loading and reloading the data')
+    METRICS_REGISTRY.add_collector(collect_metrics)
+
+    def observe_callback_latency(status_code: int):
+        # Every callback is a request to the same route, told apart by its outputs
+        if request.path.endswith('/_dash-update-component') and 'request_start_time' in g:
+            callback_request = request.get_json(silent=True) or {}
+            METRICS_REGISTRY.observe('reporting_callback_seconds', time.perf_counter() - g.pop('request_start_time'),
+                                     output=callback_request.get('output', ''), status=str(status_code))
+
+    @app.server.before_request
+    def start_request_timer():
+        g.request_start_time = time.perf_counter()
+
+    @app.server.after_request
+    def observe_callback_response(response):
+        observe_callback_latency(response.status_code)
+        return response
+
+    @app.server.teardown_request
+    def observe_callback_error(error):
+        # Requests failing with an exception get no response to observe
+        if error is not None:
+            observe_callback_latency(500)
+
+    @app.server.route('/metrics')
+    def get_metrics():
+        return Response(METRICS_REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
-    create_header(),
-    dbc.Tabs([
+# Profiles of the callbacks slower than the budget with their inputs, too costly to profile every request by default
+if AppSettings().REPORTING_PROFILER_ENABLED:
+    callback_profiler = CallbackProfiler(AppSettings().REPORTING_PROFILER_DIR, AppSettings().REPORTING_PROFILER_BUDGET_SECONDS,
+                                         AppSettings().REPORTING_PROFILER_MAX_FILES)
+
+    def stop_callback_profile(status_code: int):
+        profile = g.pop('callback_profile', None)
+        if profile is None:
+            return
+        elapsed_seconds = time.perf_counter() - g.pop('callback_profile_start_time')
+        callback_request = request.get_json(silent=True) or {}
+        output = callback_request.get('output', '')
+        callback_function = app.callback_map.get(output, {}).get('callback')
+        try:
+            callback_profiler.stop(profile, elapsed_seconds, getattr(callback_function, '__name__', output), {
+                'output': output,
+                'status': status_code,
+                'inputs': callback_request.get('inputs', []),
+                'state': callback_request.get('state', [])
+            })
+        except Exception as e:
+            print(f"Error saving callback profile: {str(e)}")
+
+    @app.server.before_request
+    def start_callback_profile():
+        if request.path.endswith('/_dash-update-component'):
+            profile = callback_profiler.start()
+            if profile is not None:
+                g.callback_profile = profile
+                g.callback_profile_start_time = time.perf_counter()
+
+    @app.server.after_request
+    def stop_callback_profile_response(response):
+        stop_callback_profile(response.status_code)
+        return response
+
+    @app.server.teardown_request
+    def stop_callback_profile_error(error):
+        if error is not None:
+            stop_callback_profile(500)
+
+def create_tabs(jira_data=None):
+    return dbc.Tabs([
         create_sprint_tab(jira_data),
         #create_dora_tab(jira_data)
-    ], id='tabs-component',style={'marginTop': '10px'}),
+    ], id='tabs-component',style={'marginTop': '10px'})
+
+# Create main layout with tabs, built on every page load so the filters list the projects of the current data
+def create_layout(tabs=None):
+    jira_data = jira_data_singleton.get_loaded_jira_data()
+    if tabs is None:
+        tabs = create_tabs(jira_data) if jira_data is not None else create_loading_content()
+
+    return html.Div([
+        # Add dcc.Store component to store ticket IDs
+        dcc.Store(id='tickets-in-stage-ticket-ids'),
+        # Dataset version and selection of the tables built for the ticket grids, their pages are requested once it changes
+        dcc.Store(id='sprint-tickets-with-options-table-built'),
+        dcc.Store(id='tickets-in-stage-table-built'),
+
+        create_header(),
+        html.Div(tabs, id='tabs-container'),
+        # Checks whether the data has been loaded while the loading content is shown
+        dcc.Interval(id='startup-interval', interval=1000, disabled=jira_data is not None),
+
+        # Add a placeholder for the notification
+        html.Div(id='notification', style={"position": "fixed", "top": 10, "right": 10, "zIndex": 9999}),
+
+    ], style={'minHeight': '100vh', 'padding': '20px', 'backgroundColor': '#f8f9fa'})
+
+app.layout = create_layout
+# Callbacks are validated against the layout with the tabs, the served layout may only have the loading content
+app.validation_layout = create_layout(tabs=create_tabs())
+
+@callback(
+    [Output('tabs-container', 'children'),
+     Output('startup-interval', 'disabled')],
+    Input('startup-interval', 'n_intervals'),
+    prevent_initial_call=True
+)
+def update_tabs_container(n_intervals):
+    if startup_errors:
+        return create_loading_content(error=startup_errors[-1]), True
 
-    # Add a placeholder for the notification
-    html.Div(id='notification', style={"position": "fixed", "top": 10, "right": 10, "zIndex": 9999}),
+    jira_data = jira_data_singleton.get_loaded_jira_data()
+    if jira_data is None:
+        return no_update, False
 
-], style={'minHeight': '100vh', 'padding': '20px', 'backgroundColor': '#f8f9fa'})
+    return create_tabs(jira_data), True
 
-# Register callbacks with app
-filters_callbacks.init_callbacks(app, jira_data.get_tickets())
-sprint_goals_callbacks.init_callbacks(app, jira_data.get_tickets())
-avg_cycletime_callbacks.init_callbacks(app, jira_data.get_tickets())
-sprint_tickets_with_options_callbacks.init_callbacks(app, jira_data.get_tickets())
-#dora_filters_callbacks.init_callbacks(app, jira_data.get_tickets())
-#dora_tiles_callbacks.init_callbacks(app, jira_data.get_tickets())
+# Register callbacks with app, they resolve the current data on every request
+with startup_timer.phase('register callbacks'):
+    filters_callbacks.init_callbacks(app, jira_data_singleton.get_current_jira_data)
+    sprint_goals_callbacks.init_callbacks(app, jira_data_singleton.get_current_jira_data)
+    avg_cycletime_callbacks.init_callbacks(app, jira_data_singleton.get_current_jira_data, background=background_callbacks_enabled)
+    sprint_tickets_with_options_callbacks.init_callbacks(app, jira_data_singleton.get_current_jira_data, background=background_callbacks_enabled)
+    #dora_filters_callbacks.init_callbacks(app, jira_data_singleton.get_current_jira_data)
+    #dora_tiles_callbacks.init_callbacks(app, jira_data_singleton.get_current_jira_data)
 
 if __name__ == '__main__':
+    print(f"Starting server {startup_timer.get_elapsed_seconds():.2f}s after startup"
+          f"{', the data is loading in the background' if lazy_startup_enabled else ''}")
     app.run(debug=True, use_reloader=False, port=8050)
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Computes the stage averages, threshold violations and DORA metrics of every project, squad and sprint
+and writes them to an output directory, without going through the dashboard.
+
+Uses the same settings as the dashboard (REPORTING_CSV_PATH, snapshots, S3). Run from apps/reporting_app:
+
+    python batch_metrics.py --output-dir reports --format parquet --workers 8
+"""
+import argparse
+import os
+import time
+from dotenv import load_dotenv
+from src.config.app_settings import AppSettings
+from src.data.data_batch import get_batch_metrics
+from src.utils.s3_utils import download_csv_from_s3
+
+OUTPUT_FORMATS = ['parquet', 'csv']
+
+def write_frame(frame, output_dir: str, name: str, output_format: str) -> str:
+    filepath = os.path.join(output_dir, f"{name}.{output_format}")
+    if output_format == 'parquet':
+        frame.to_parquet(filepath, index=False)
+    else:
+        frame.to_csv(filepath, index=False)
+    return filepath
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv_filepath', nargs='?', default=None, help='CSV to compute the metrics of, REPORTING_CSV_PATH when not set')
+    parser.add_argument('--output-dir', default='reports')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='parquet', dest='output_format')
+    parser.add_argument('--project', action='append', dest='projects', help='Only this project, can be repeated')
+    parser.add_argument('--workers', type=int, default=None, help='Number of processes, the number of CPUs when not set')
+    parser.add_argument('--download', action='store_true', help='Download the CSV from S3 first')
+    args = parser.parse_args()
+
+    if args.download:
+        download_csv_from_s3()
+
+    csv_filepath = args.csv_filepath or AppSettings().REPORTING_CSV_PATH
+    if not csv_filepath or not os.path.exists(csv_filepath):
+        parser.error(f"CSV file not found: {csv_filepath}")
+
+    start_time = time.perf_counter()
+    batch_metrics_results = get_batch_metrics(csv_filepath, projects=args.projects, max_workers=args.workers)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for name, frame in [('stage_averages', batch_metrics_results.stage_averages),
+                        ('threshold_violations', batch_metrics_results.threshold_violations),
+                        ('dora_metrics', batch_metrics_results.dora_metrics)]:
+        print(f"Wrote {len(frame)} rows to {write_frame(frame, args.output_dir, name, args.output_format)}")
+    print(f"Computed batch metrics in {time.perf_counter() - start_time:.2f}s")
+
+if __name__ == '__main__':
+    main()
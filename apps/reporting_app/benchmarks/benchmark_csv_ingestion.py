@@ -0,0 +1,66 @@
+"""
+Compares parse time and peak memory of the CsvDataLoader ingestion modes.
+
+Every mode runs in a fresh process so peak RSS isn't shared between them.
+Run from apps/reporting_app:
+
+    python -m benchmarks.benchmark_csv_ingestion path/to/jira_metrics.csv --repeat 3
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+INGESTION_MODES = [
+    ('inferred', False, None),
+    ('inferred pyarrow', False, 'pyarrow'),
+    ('schema', True, None),
+    ('schema pyarrow', True, 'pyarrow')
+]
+
+def get_max_rss_mb() -> float:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return max_rss / 1024 / 1024 if sys.platform == 'darwin' else max_rss / 1024
+
+def run_ingestion(csv_filepath: str, use_schema: bool, engine: str) -> dict:
+    from src.data.data_loaders import CsvDataLoader
+
+    csv_data_loader = CsvDataLoader(use_schema=use_schema, engine=engine)
+    baseline_rss_mb = get_max_rss_mb()
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        jira_tickets = csv_data_loader.load_data(csv_filepath)
+    parse_time = time.perf_counter() - start_time
+
+    return {
+        'parse_time': parse_time,
+        'peak_rss_mb': get_max_rss_mb() - baseline_rss_mb,
+        'frame_mb': jira_tickets.memory_usage(deep=True).sum() / 1024 / 1024,
+        'columns': len(jira_tickets.columns)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv_filepath', nargs='?', default='tests/jira_metrics_mock.csv')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'mode':<18}{'parse (s)':>12}{'peak rss (MB)':>16}{'frame (MB)':>13}{'columns':>10}")
+    spawn_context = multiprocessing.get_context('spawn')
+    for mode_name, use_schema, engine in INGESTION_MODES:
+        results = []
+        for _ in range(args.repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn_context) as executor:
+                results.append(executor.submit(run_ingestion, args.csv_filepath, use_schema, engine).result())
+
+        # Best of the runs, the slower ones measure the machine rather than the loader
+        best = min(results, key=lambda result: result['parse_time'])
+        print(f"{mode_name:<18}{best['parse_time']:>12.3f}{best['peak_rss_mb']:>16.1f}{best['frame_mb']:>13.1f}{best['columns']:>10}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Times the hot paths of the reporting data layer on a synthetic Jira export and saves the results as JSON.
+
+Loading, filtering, in-sprint durations, stage averages, threshold violations and DORA metrics are timed in
+a fresh process with empty caches, so the results measure the calculations rather than the caches. When a
+baseline JSON of an earlier run is given, steps slower than the baseline by more than the tolerance are
+reported as regressions and the exit code is 1. Run from apps/reporting_app:
+
+    python -m benchmarks.benchmark_data_layer --tickets 50000 --sprints 120 --output benchmark_results.json
+    python -m benchmarks.benchmark_data_layer --tickets 50000 --sprints 120 --baseline benchmark_results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from benchmarks.benchmark_csv_ingestion import get_max_rss_mb
+from benchmarks.synthetic_jira_data import generate_jira_csv
+from src.config.constants import ALL_STAGE_NAMES
+
+def time_step(timings: dict, step_name: str, run_step, repeat: int):
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = run_step()
+        durations.append(time.perf_counter() - start_time)
+    timings[step_name] = {'best': min(durations), 'mean': sum(durations) / len(durations), 'runs': len(durations)}
+    return result
+
+def run_benchmarks(csv_filepath: str, repeat: int, sprint_sample: int) -> dict:
+    os.environ['REPORTING_SNAPSHOT_ENABLED'] = 'false'
+    # Clearing the caches between runs must not clear a result cache shared with a running server
+    os.environ['REPORTING_RESULT_CACHE_BACKEND'] = 'memory'
+    import numpy as np
+    from src.config.constants import COLUMN_NAME_PROJECT
+    from src.data.data_dora import JiraDataDoraMetrics, JiraDataDoraMetricsFilter
+    from src.data.data_durations import JiraDataSprintDurationService
+    from src.data.data_filters import JiraDataFilter, JiraDataFilterService
+    from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+    from src.data.data_stage_metrics import JiraDataStageMetricsService
+    from src.utils.stage_utils import StageUtils
+
+    timings = {}
+    baseline_rss_mb = get_max_rss_mb()
+    jira_data_loader = JiraDataLoader(CsvDataLoader(use_schema=True))
+    with contextlib.redirect_stdout(io.StringIO()):
+        jira_data = time_step(timings, 'load_data', lambda: jira_data_loader.load_data(csv_filepath), 1)
+    jira_tickets = jira_data.get_tickets()
+    sprint_index = jira_data.get_sprint_index()
+
+    # The same evenly spaced sprints every run, each step goes through all of them
+    sprint_names = np.sort(jira_data.get_sprint_memberships().to_frame()['value'].dropna().unique().astype(str))
+    sprint_names = sprint_names[np.linspace(0, len(sprint_names) - 1, min(sprint_sample, len(sprint_names))).astype(int)].tolist()
+    sprint_tickets = {}
+
+    def filter_tickets():
+        JiraDataFilterService.clear_cache()
+        for sprint_name in sprint_names:
+            sprint_tickets[sprint_name] = JiraDataFilterService(jira_data).filter_tickets(jira_tickets, JiraDataFilter(sprints=[sprint_name]), facets=[]).tickets
+
+    def calculate_tickets_duration_in_sprint():
+        for sprint_name in sprint_names:
+            StageUtils.calculate_tickets_duration_in_sprint(sprint_tickets[sprint_name], sprint_name, sprint_index)
+
+    def get_avg_days():
+        JiraDataFilterService.clear_cache()
+        JiraDataSprintDurationService.clear_cache()
+        JiraDataStageMetricsService.clear_cache()
+        for sprint_name in sprint_names:
+            JiraDataStageMetricsService(jira_data).get_avg_days(sprint_name, JiraDataFilter(sprints=[sprint_name]))
+
+    def get_threshold_violations():
+        for sprint_name in sprint_names:
+            JiraDataStageMetricsService(jira_data).get_threshold_violations(sprint_tickets[sprint_name], sprint_name)
+
+    projects = [None] + [[project] for project in jira_tickets[COLUMN_NAME_PROJECT].dropna().unique().tolist()]
+
+    def get_dora_metrics():
+        jira_data_dora_metrics = JiraDataDoraMetrics(jira_tickets, sprint_index, jira_data.get_sprint_memberships())
+        for project in projects:
+            jira_data_dora_metrics.get_metrics(JiraDataDoraMetricsFilter(projects=project, squads=None, start_date=None, end_date=None))
+
+    time_step(timings, 'filter_tickets', filter_tickets, repeat)
+    time_step(timings, 'calculate_tickets_duration_in_sprint', calculate_tickets_duration_in_sprint, repeat)
+    time_step(timings, 'get_avg_days', get_avg_days, repeat)
+    time_step(timings, 'get_threshold_violations', get_threshold_violations, repeat)
+    time_step(timings, 'get_dora_metrics', get_dora_metrics, repeat)
+
+    return {
+        'timings': timings,
+        'sprints': len(sprint_names),
+        'projects': len(projects) - 1,
+        'tickets': len(jira_tickets),
+        'peak_rss_mb': get_max_rss_mb() - baseline_rss_mb,
+        'frame_mb': jira_tickets.memory_usage(deep=True).sum() / 1024 / 1024
+    }
+
+def get_regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for step_name, timing in results['timings'].items():
+        baseline_timing = baseline.get('timings', {}).get(step_name)
+        # Best of the runs, the slower ones measure the machine rather than the code
+        if baseline_timing and timing['best'] > baseline_timing['best'] * (1 + tolerance):
+            regressions.append(f"{step_name}: {timing['best']:.3f}s, baseline {baseline_timing['best']:.3f}s")
+    if 'peak_rss_mb' in baseline and results['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance):
+        regressions.append(f"peak_rss_mb: {results['peak_rss_mb']:.1f}MB, baseline {baseline['peak_rss_mb']:.1f}MB")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv_filepath', nargs='?', default=None, help='Export to benchmark, a synthetic one is generated when not set')
+    parser.add_argument('--tickets', type=int, default=50000)
+    parser.add_argument('--sprints', type=int, default=120)
+    parser.add_argument('--stage-columns', type=int, default=len(ALL_STAGE_NAMES))
+    parser.add_argument('--multi-sprint-ratio', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=0)
+    # More sprints than SPRINT_DURATION_CACHE_MAX_SIZE make the threshold violations recalculate the in-sprint durations
+    parser.add_argument('--sprint-sample', type=int, default=12, help='Number of sprints every per-sprint step goes through')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default=None, help='Results JSON of an earlier run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Slowdown over the baseline reported as a regression')
+    args = parser.parse_args()
+
+    parameters = {
+        'tickets': args.tickets,
+        'sprints': args.sprints,
+        'stage_columns': args.stage_columns,
+        'multi_sprint_ratio': args.multi_sprint_ratio,
+        'seed': args.seed,
+        'sprint_sample': args.sprint_sample,
+        'repeat': args.repeat
+    }
+    spawn_context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_filepath = args.csv_filepath
+        if csv_filepath is None:
+            # Generated in another process too, a child process starts with the peak RSS of its parent on Linux
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn_context) as executor:
+                csv_filepath = executor.submit(generate_jira_csv, os.path.join(temp_dir, 'jira_metrics_synthetic.csv'), args.tickets,
+                                               args.sprints, args.stage_columns, args.multi_sprint_ratio, args.seed).result()
+        else:
+            parameters = {'csv_filepath': csv_filepath, 'sprint_sample': args.sprint_sample, 'repeat': args.repeat}
+
+        # A fresh process so peak RSS and the class-level caches aren't shared with earlier runs
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn_context) as executor:
+            results = executor.submit(run_benchmarks, csv_filepath, args.repeat, args.sprint_sample).result()
+
+    import pandas as pd
+    results = {
+        'parameters': parameters,
+        'environment': {'python': platform.python_version(), 'pandas': pd.__version__, 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        **results
+    }
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2)
+
+    print(f"{'step':<40}{'best (s)':>10}{'mean (s)':>10}")
+    for step_name, timing in results['timings'].items():
+        print(f"{step_name:<40}{timing['best']:>10.3f}{timing['mean']:>10.3f}")
+    print(f"{results['tickets']} tickets, peak rss {results['peak_rss_mb']:.1f}MB, frame {results['frame_mb']:.1f}MB, results in {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = get_regressions(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Regression {regression}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
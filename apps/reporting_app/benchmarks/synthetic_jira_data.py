@@ -0,0 +1,196 @@
+"""
+Generates a synthetic Jira export in the format of jira_metrics.csv, for benchmarking the data layer at sizes
+the mock CSV doesn't reach.
+
+Tickets move through a workflow of the given number of stages, in sprints of squads of a few projects.
+Run from apps/reporting_app:
+
+    python -m benchmarks.synthetic_jira_data jira_metrics_synthetic.csv --tickets 50000 --sprints 120
+"""
+import argparse
+import numpy as np
+import pandas as pd
+from src.config.constants import (
+    ALL_STAGE_NAMES,
+    STAGE_NAME_FINAL_STAGES,
+    STAGE_NAME_BACKLOG,
+    STAGE_NAME_IN_DEVELOPMENT,
+    STAGE_NAME_IN_CODE_REVIEW,
+    STAGE_NAME_IN_PR,
+    STAGE_NAME_IN_SIT_TEST,
+    STAGE_NAME_IN_UAT_TEST,
+    STAGE_NAME_AWAITING_PROD_DEPLOYMENT,
+    STAGE_NAME_DONE,
+    COLUMN_NAME_ID,
+    COLUMN_NAME_LINK,
+    COLUMN_NAME_NAME,
+    COLUMN_NAME_TYPE,
+    COLUMN_NAME_SPRINT,
+    COLUMN_NAME_SPRINT_GOALS,
+    COLUMN_NAME_SPRINT_START_DATE,
+    COLUMN_NAME_SPRINT_END_DATE,
+    COLUMN_NAME_STORY_POINTS,
+    COLUMN_NAME_STAGE,
+    COLUMN_NAME_PRIORITY,
+    COLUMN_NAME_COMPONENTS,
+    COLUMN_NAME_PARENT_NAME,
+    COLUMN_NAME_PARENT_TYPE,
+    COLUMN_NAME_ASSIGNEE_NAME,
+    COLUMN_NAME_CREATED_DATE,
+    COLUMN_NAME_UPDATED_DATE,
+    COLUMN_NAME_FIX_VERSIONS,
+    COLUMN_NAME_PROJECT,
+    COLUMN_NAME_SQUAD
+)
+from src.utils.stage_utils import StageUtils
+
+# Stages every workflow has, so the threshold, grouping and DORA calculations have tickets to work on
+WORKFLOW_STAGE_NAMES = [
+    STAGE_NAME_BACKLOG,
+    STAGE_NAME_IN_DEVELOPMENT,
+    STAGE_NAME_IN_CODE_REVIEW,
+    STAGE_NAME_IN_PR,
+    STAGE_NAME_IN_SIT_TEST,
+    STAGE_NAME_IN_UAT_TEST,
+    STAGE_NAME_AWAITING_PROD_DEPLOYMENT,
+    STAGE_NAME_DONE
+]
+
+TICKET_TYPES = ['Test', 'Task', 'Story', 'Defect', 'Sub-task', 'Spike', 'Epic', 'Bug']
+TICKET_TYPE_WEIGHTS = [0.45, 0.2, 0.1, 0.08, 0.05, 0.05, 0.04, 0.03]
+PRIORITIES = ['Low', 'Medium', 'High', 'P1', 'P2', 'P3', 'P4']
+PRIORITY_WEIGHTS = [0.45, 0.2, 0.12, 0.02, 0.03, 0.13, 0.05]
+COMPONENTS = ['FE', 'BFF', 'XM', 'CH', 'SFCC', 'FEWeb', 'FEApp']
+SQUADS_PER_PROJECT = 3
+SPRINT_DAYS = 14
+START_DATE = np.datetime64('2024-01-01T00:00:00', 'ms')
+
+def get_stage_names(stage_column_count: int) -> list[str]:
+    """Workflow stages followed by other stages of ALL_STAGE_NAMES, in the order of ALL_STAGE_NAMES."""
+    other_stage_names = [stage_name for stage_name in ALL_STAGE_NAMES if stage_name not in WORKFLOW_STAGE_NAMES]
+    stage_names = (WORKFLOW_STAGE_NAMES + other_stage_names)[:max(stage_column_count, 1)]
+    return [stage_name for stage_name in ALL_STAGE_NAMES if stage_name in stage_names]
+
+def to_jira_dates(dates: np.ndarray) -> np.ndarray:
+    # Jira exports UTC timestamps with milliseconds, missing dates are empty
+    return np.where(np.isnat(dates), None, np.char.add(np.datetime_as_string(dates, unit='ms'), 'Z').astype(object))
+
+def to_jira_list(first: np.ndarray, second: np.ndarray, is_list: np.ndarray) -> np.ndarray:
+    # Multi-valued fields are exported as ["a"-"b"]
+    return np.where(is_list, '["' + first.astype(object) + '"-"' + second.astype(object) + '"]', first.astype(object))
+
+def generate_jira_tickets(ticket_count: int, sprint_count: int, stage_column_count: int = len(ALL_STAGE_NAMES),
+                          multi_sprint_ratio: float = 0.2, seed: int = 0) -> pd.DataFrame:
+    """
+    Args:
+        ticket_count (int): Number of tickets
+        sprint_count (int): Number of sprints, spread over squads of SQUADS_PER_PROJECT squads per project
+        stage_column_count (int): Number of stages with days, start and recurrence columns
+        multi_sprint_ratio (float): Share of the tickets carried over to the next sprint of their squad
+        seed (int): Seed of the random values, the same arguments generate the same tickets
+
+    Returns:
+        pd.DataFrame: Tickets with the columns of a Jira export
+    """
+    random = np.random.default_rng(seed)
+
+    # Sprints of consecutive squads run in parallel, the sprints of a squad follow each other
+    squad_count = max(1, min(sprint_count, SQUADS_PER_PROJECT * max(1, sprint_count // 20)))
+    sprint_squads = np.arange(sprint_count) % squad_count
+    sprint_numbers = np.arange(sprint_count) // squad_count + 1
+    sprint_names = np.array([f"Squad {squad + 1} Sprint {number}" for squad, number in zip(sprint_squads, sprint_numbers)], dtype=object)
+    sprint_start_dates = START_DATE + ((sprint_numbers - 1) * SPRINT_DAYS).astype('timedelta64[D]')
+    sprint_end_dates = sprint_start_dates + np.timedelta64(SPRINT_DAYS - 1, 'D')
+    # Next sprint of the same squad, -1 for the last one
+    next_sprints = np.where(np.arange(sprint_count) + squad_count < sprint_count, np.arange(sprint_count) + squad_count, -1)
+
+    sprints = random.integers(0, sprint_count, ticket_count)
+    is_multi_sprint = (random.random(ticket_count) < multi_sprint_ratio) & (next_sprints[sprints] >= 0)
+    next_ticket_sprints = np.where(is_multi_sprint, next_sprints[sprints], sprints)
+    squads = sprint_squads[sprints]
+
+    # Tickets are created up to a month before their sprint and move through the stages of the workflow in order
+    stage_names = get_stage_names(stage_column_count)
+    created_dates = sprint_start_dates[sprints] - (random.random(ticket_count) * 30 * 86400000).astype('timedelta64[ms]')
+    stage_days = np.round(random.exponential(2.5, (ticket_count, len(stage_names))), 1) + 0.1
+    is_reached = np.arange(len(stage_names)) < random.integers(1, len(stage_names) + 1, ticket_count)[:, None]
+    is_visited = is_reached & ((random.random((ticket_count, len(stage_names))) < 0.6) | (np.arange(len(stage_names)) == 0))
+    # Final stages other than the last reached one are skipped, a ticket is only closed once
+    is_final = np.isin(stage_names, STAGE_NAME_FINAL_STAGES)
+    last_stages = len(stage_names) - 1 - np.argmax(is_visited[:, ::-1], axis=1)
+    is_visited &= ~is_final | (np.arange(len(stage_names)) == last_stages[:, None])
+    last_stages = len(stage_names) - 1 - np.argmax(is_visited[:, ::-1], axis=1)
+
+    visited_days = np.where(is_visited, stage_days, 0)
+    offsets = np.cumsum(visited_days, axis=1) - visited_days
+    stage_start_dates = created_dates[:, None] + (offsets * 86400000).astype('timedelta64[ms]')
+    stage_start_dates = np.where(is_visited, stage_start_dates, np.datetime64('NaT', 'ms'))
+    updated_dates = stage_start_dates[np.arange(ticket_count), last_stages]
+
+    ids = np.char.add('SYN-', np.arange(1, ticket_count + 1).astype(str)).astype(object)
+    types = random.choice(TICKET_TYPES, ticket_count, p=TICKET_TYPE_WEIGHTS)
+    first_components = random.choice(COMPONENTS, ticket_count)
+    is_done = np.isin(np.array(stage_names, dtype=object)[last_stages], STAGE_NAME_FINAL_STAGES)
+    releases = np.datetime_as_string(updated_dates.astype('datetime64[D]') + np.timedelta64(7, 'D'))
+
+    columns = {
+        COLUMN_NAME_ID: ids,
+        COLUMN_NAME_LINK: 'https://example.com//browse/' + ids,
+        COLUMN_NAME_NAME: 'Synthetic ticket ' + ids,
+        COLUMN_NAME_TYPE: types
+    }
+    for column_index, stage_name in enumerate(stage_names):
+        columns[f"Stage {stage_name} days"] = np.where(is_visited[:, column_index], stage_days[:, column_index], np.nan)
+    for column_index, stage_name in enumerate(stage_names):
+        columns[StageUtils.to_stage_start_date_column_name(f"Stage {stage_name} days")] = to_jira_dates(stage_start_dates[:, column_index])
+    for column_index, stage_name in enumerate(stage_names):
+        columns[f"Stage {stage_name} recurrence"] = np.where(is_visited[:, column_index], 1.0, np.nan)
+
+    columns.update({
+        COLUMN_NAME_SPRINT: to_jira_list(sprint_names[sprints], sprint_names[next_ticket_sprints], is_multi_sprint),
+        COLUMN_NAME_SPRINT_GOALS: '1. Deliver the goals of ' + sprint_names[sprints],
+        COLUMN_NAME_SPRINT_START_DATE: to_jira_list(to_jira_dates(sprint_start_dates[sprints]), to_jira_dates(sprint_start_dates[next_ticket_sprints]), is_multi_sprint),
+        COLUMN_NAME_SPRINT_END_DATE: to_jira_list(to_jira_dates(sprint_end_dates[sprints]), to_jira_dates(sprint_end_dates[next_ticket_sprints]), is_multi_sprint),
+        COLUMN_NAME_STORY_POINTS: random.choice([0.0, 1.0, 2.0, 3.0, 5.0, 8.0, np.nan], ticket_count),
+        COLUMN_NAME_STAGE: np.array(stage_names, dtype=object)[last_stages],
+        'StatusCategory': np.where(is_done, 'Done', np.where(last_stages == 0, 'To Do', 'In Progress')),
+        COLUMN_NAME_PRIORITY: random.choice(PRIORITIES, ticket_count, p=PRIORITY_WEIGHTS),
+        'Labels': None,
+        COLUMN_NAME_COMPONENTS: to_jira_list(first_components, random.choice(COMPONENTS, ticket_count), random.random(ticket_count) < 0.1),
+        'Version': None,
+        'VersionRelease': None,
+        'ParentId': 'SYN-EPIC-' + (squads + 1).astype(str).astype(object),
+        COLUMN_NAME_PARENT_NAME: 'Synthetic epic of squad ' + (squads + 1).astype(str).astype(object),
+        COLUMN_NAME_PARENT_TYPE: 'Epic',
+        COLUMN_NAME_ASSIGNEE_NAME: 'Assignee ' + (squads * 10 + random.integers(0, 8, ticket_count)).astype(str).astype(object),
+        'Timeoriginalestimate': None,
+        'Timeestimate': None,
+        'Timespent': None,
+        COLUMN_NAME_CREATED_DATE: np.char.add(np.datetime_as_string(created_dates, unit='ms'), '+0000'),
+        COLUMN_NAME_UPDATED_DATE: np.char.add(np.datetime_as_string(updated_dates, unit='ms'), '+0000'),
+        COLUMN_NAME_FIX_VERSIONS: np.where(is_done, releases.astype(object), None),
+        COLUMN_NAME_PROJECT: 'Project ' + (squads // SQUADS_PER_PROJECT + 1).astype(str).astype(object),
+        COLUMN_NAME_SQUAD: 'Squad ' + (squads + 1).astype(str).astype(object)
+    })
+    return pd.DataFrame(columns)
+
+def generate_jira_csv(csv_filepath: str, ticket_count: int, sprint_count: int, stage_column_count: int = len(ALL_STAGE_NAMES),
+                      multi_sprint_ratio: float = 0.2, seed: int = 0) -> str:
+    generate_jira_tickets(ticket_count, sprint_count, stage_column_count, multi_sprint_ratio, seed).to_csv(csv_filepath, index=False)
+    return csv_filepath
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv_filepath')
+    parser.add_argument('--tickets', type=int, default=50000)
+    parser.add_argument('--sprints', type=int, default=120)
+    parser.add_argument('--stage-columns', type=int, default=len(ALL_STAGE_NAMES))
+    parser.add_argument('--multi-sprint-ratio', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generate_jira_csv(args.csv_filepath, args.tickets, args.sprints, args.stage_columns, args.multi_sprint_ratio, args.seed)
+    print(f"Wrote {args.tickets} tickets to {args.csv_filepath}")
+
+if __name__ == '__main__':
+    main()
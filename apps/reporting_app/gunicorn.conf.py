@@ -0,0 +1,50 @@
+"""
+Production server settings, run from apps/reporting_app with:
+
+    gunicorn app:server
+
+Preloading and lazy startup (REPORTING_LAZY_STARTUP_ENABLED) are mutually exclusive:
+
+- Without lazy startup the app is loaded once in the master process before the workers are forked. Nothing listens
+  on the port until the CSV is processed, so the healthcheck start period has to cover the load. The workers share
+  the pages of the processed tickets with the master copy-on-write: pages stay shared until a worker writes to them,
+  and pandas copies that e.g. to_pandas() or filtering make are private to the worker. gc.freeze only keeps the
+  garbage collector from dirtying the pages by touching the reference counts of the startup objects, the workers
+  still dirty the pages of the objects they use.
+- With lazy startup nothing is preloaded, as a thread loading the data in the master would not be copied into the
+  workers. Each worker starts right away, serves the loading page and loads the data itself, the first one writes
+  the snapshot and the others load it instead of parsing the CSV.
+
+Either way each worker watches the CSV and holds its own private copy of the versions loaded after startup.
+"""
+import gc
+import os
+import sys
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from src.config.app_settings import AppSettings
+
+load_dotenv()
+
+# Same variables as the development server
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8050')}"
+workers = AppSettings().REPORTING_SERVER_WORKERS
+threads = AppSettings().REPORTING_SERVER_THREADS
+# Loading a large CSV on a cold start takes longer than the default
+timeout = 120
+preload_app = not AppSettings().REPORTING_LAZY_STARTUP_ENABLED
+
+def when_ready(server):
+    if not preload_app:
+        return
+    # Threads don't survive forking, the workers start their own watcher
+    sys.modules['app'].jira_data_singleton.stop_watcher()
+    # Objects the garbage collector never visits don't get their reference counts touched by its collections
+    gc.collect()
+    gc.freeze()
+
+def post_fork(server, worker):
+    # Without preloading the worker loads the app after forking and starts its watcher itself
+    if preload_app:
+        sys.modules['app'].jira_data_singleton.start_watcher(AppSettings().REPORTING_RELOAD_INTERVAL_SECONDS)
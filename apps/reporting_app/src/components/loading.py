@@ -0,0 +1,12 @@
+from dash import html
+import dash_bootstrap_components as dbc
+
+def create_loading_content(error: str = None):
+    """Placeholder shown instead of the tabs while the data is loading."""
+    if error:
+        return dbc.Alert(f"Loading the Jira data failed: {error}", color='danger', style={'marginTop': '10px'})
+
+    return html.Div([
+        dbc.Spinner(color='primary'),
+        html.P("Loading Jira data, the dashboard opens once it is ready", style={'marginTop': '10px'})
+    ], style={'marginTop': '40px', 'textAlign': 'center'})
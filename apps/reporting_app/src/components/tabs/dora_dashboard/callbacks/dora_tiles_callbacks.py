@@ -1,11 +1,14 @@
+from typing import Callable
 from dash import Input, Output, callback
-from src.data.data_dora import JiraDataDoraMetrics, JiraDataDoraMetricsFilter
+import plotly.graph_objects as go
+from src.data.data_dora import JiraDataDoraMetricsFilter, JiraDataDoraMetricsResult
+from src.data.data_loaders import JiraData
 import pandas as pd
 from datetime import datetime, timedelta
 from pytz import UTC
 from dash.exceptions import PreventUpdate
 
-def init_callbacks(app, jira_tickets: pd.DataFrame):
+def init_callbacks(app, get_jira_data: Callable[[], JiraData]):
     def _get_dates_from_time_range(time_range: str) -> tuple[datetime, datetime]:
         start_date = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
         end_date = datetime.now(UTC).replace(hour=23, minute=59, second=59, microsecond=999999)
@@ -35,25 +38,7 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
 
         return start_date_result, end_date_result
 
-    @callback(
-        Output('lead-time-to-change-badge', 'children'),
-        Output('lead-time-to-change-badge', 'color'),
-        Output('lead-time-to-change-value', 'children'),
-        Input('dora-tab-project-dropdown', 'value'),
-        Input('dora-tab-squads-dropdown', 'value'),
-        Input('dora-tab-time-range-dropdown', 'value'),
-        Input('dora-tab-date-range', 'start_date'),
-        Input('dora-tab-date-range', 'end_date')
-    )
-    def update_lead_time_to_change_tile(projects: list[str], squads: list[str], time_range: str, start_date: str, end_date: str):
-        if time_range == 'custom_date_range' and (start_date is None or end_date is None):
-            raise PreventUpdate
-
-        start_date, end_date = _get_dates(time_range, start_date, end_date)
-
-        jira_data_dora_metrics = JiraDataDoraMetrics(jira_tickets)
-        lead_time_to_change = jira_data_dora_metrics.get_lead_time_for_changes(JiraDataDoraMetricsFilter(projects=projects, squads=squads, start_date=start_date, end_date=end_date))
-
+    def get_lead_time_to_change_tile(lead_time_to_change: JiraDataDoraMetricsResult) -> tuple[str, str, str]:
         if lead_time_to_change.value < 1:
             badge_text = 'Elite'
             badge_color = 'primary'
@@ -69,25 +54,7 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
 
         return badge_text, badge_color, lead_time_to_change.format_days_duration(lead_time_to_change.value)
 
-    @callback(
-        Output('deployment-frequency-badge', 'children'),
-        Output('deployment-frequency-badge', 'color'),
-        Output('deployment-frequency-value', 'children'),
-        Input('dora-tab-project-dropdown', 'value'),
-        Input('dora-tab-squads-dropdown', 'value'),
-        Input('dora-tab-time-range-dropdown', 'value'),
-        Input('dora-tab-date-range', 'start_date'),
-        Input('dora-tab-date-range', 'end_date')
-    )
-    def update_deployment_frequency_tile(projects: list[str], squads: list[str], time_range: str, start_date: str, end_date: str):
-        if time_range == 'custom_date_range' and (start_date is None or end_date is None):
-            raise PreventUpdate
-
-        start_date, end_date = _get_dates(time_range, start_date, end_date)
-
-        jira_data_dora_metrics = JiraDataDoraMetrics(jira_tickets)
-        deployment_frequency = jira_data_dora_metrics.get_deployment_frequency(JiraDataDoraMetricsFilter(projects=projects, squads=squads, start_date=start_date, end_date=end_date))
-
+    def get_deployment_frequency_tile(deployment_frequency: JiraDataDoraMetricsResult) -> tuple[str, str, str]:
         # more than once a day
         if deployment_frequency.value > 1:
             badge_text = 'Elite'
@@ -108,25 +75,7 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
         deployment_frequency_value = f"{deployment_frequency.value:.2f} deployments per day"
         return badge_text, badge_color, deployment_frequency_value
 
-    @callback(
-        Output('change-failure-rate-badge', 'children'),
-        Output('change-failure-rate-badge', 'color'),
-        Output('change-failure-rate-value', 'children'),
-        Input('dora-tab-project-dropdown', 'value'),
-        Input('dora-tab-squads-dropdown', 'value'),
-        Input('dora-tab-time-range-dropdown', 'value'),
-        Input('dora-tab-date-range', 'start_date'),
-        Input('dora-tab-date-range', 'end_date')
-    )
-    def update_change_failure_rate_tile(projects: list[str], squads: list[str], time_range: str, start_date: str, end_date: str):
-        if time_range == 'custom_date_range' and (start_date is None or end_date is None):
-            raise PreventUpdate
-
-        start_date, end_date = _get_dates(time_range, start_date, end_date)
-
-        jira_data_dora_metrics = JiraDataDoraMetrics(jira_tickets)
-        change_failure_rate = jira_data_dora_metrics.get_change_failure_rate(JiraDataDoraMetricsFilter(projects=projects, squads=squads, start_date=start_date, end_date=end_date))
-
+    def get_change_failure_rate_tile(change_failure_rate: JiraDataDoraMetricsResult) -> tuple[str, str, str]:
         if change_failure_rate.value <= 5:
             badge_text = 'Elite'
             badge_color = 'primary'
@@ -142,36 +91,77 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
 
         return badge_text, badge_color, change_failure_rate.format_percentage(change_failure_rate.value)
 
+    def get_time_to_restore_service_tile(time_to_restore_service: JiraDataDoraMetricsResult) -> tuple[str, str, str]:
+        if time_to_restore_service.value <= 0.1:
+            badge_text = 'Elite'
+            badge_color = 'primary'
+        elif time_to_restore_service.value >= 0.1 and time_to_restore_service.value <= 1:
+            badge_text = 'High'
+            badge_color = 'success'
+        elif time_to_restore_service.value >= 1 and time_to_restore_service.value <= 2:
+            badge_text = 'Medium'
+            badge_color = 'warning'
+        else:
+            badge_text = 'Low'
+            badge_color = 'danger'
+
+        return badge_text, badge_color, time_to_restore_service.format_days_duration(time_to_restore_service.value)
+
+    def get_sparkline_figure(weekly_values: pd.Series) -> go.Figure:
+        fig = go.Figure(go.Scatter(x=weekly_values.index, y=weekly_values.values, mode='lines', line={'width': 2},
+                                   hovertemplate='%{x|%d %b %Y}: %{y:.2f}<extra></extra>'))
+        fig.update_layout(
+            margin={'l': 0, 'r': 0, 't': 0, 'b': 0},
+            xaxis={'visible': False},
+            yaxis={'visible': False},
+            showlegend=False,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        return fig
+
+    # The four tiles share the same inputs, their metrics and weekly trends come from the DORA cube
     @callback(
+        Output('lead-time-to-change-badge', 'children'),
+        Output('lead-time-to-change-badge', 'color'),
+        Output('lead-time-to-change-value', 'children'),
+        Output('lead-time-to-change-sparkline', 'figure'),
+        Output('deployment-frequency-badge', 'children'),
+        Output('deployment-frequency-badge', 'color'),
+        Output('deployment-frequency-value', 'children'),
+        Output('deployment-frequency-sparkline', 'figure'),
+        Output('change-failure-rate-badge', 'children'),
+        Output('change-failure-rate-badge', 'color'),
+        Output('change-failure-rate-value', 'children'),
+        Output('change-failure-rate-sparkline', 'figure'),
         Output('time-to-restore-service-badge', 'children'),
         Output('time-to-restore-service-badge', 'color'),
         Output('time-to-restore-service-value', 'children'),
+        Output('time-to-restore-service-sparkline', 'figure'),
         Input('dora-tab-project-dropdown', 'value'),
         Input('dora-tab-squads-dropdown', 'value'),
         Input('dora-tab-time-range-dropdown', 'value'),
         Input('dora-tab-date-range', 'start_date'),
         Input('dora-tab-date-range', 'end_date')
     )
-    def update_time_to_restore_service_tile(projects: list[str], squads: list[str], time_range: str, start_date: str, end_date: str):
+    def update_dora_tiles(projects: list[str], squads: list[str], time_range: str, start_date: str, end_date: str):
         if time_range == 'custom_date_range' and (start_date is None or end_date is None):
             raise PreventUpdate
 
         start_date, end_date = _get_dates(time_range, start_date, end_date)
 
-        jira_data_dora_metrics = JiraDataDoraMetrics(jira_tickets)
-        time_to_restore_service = jira_data_dora_metrics.get_mean_time_to_recovery(JiraDataDoraMetricsFilter(projects=projects, squads=squads, start_date=start_date, end_date=end_date))
-
-        if time_to_restore_service.value <= 0.1:
-            badge_text = 'Elite'
-            badge_color = 'primary'
-        elif time_to_restore_service.value >= 0.1 and time_to_restore_service.value <= 1:
-            badge_text = 'High'
-            badge_color = 'success'
-        elif time_to_restore_service.value >= 1 and time_to_restore_service.value <= 2:
-            badge_text = 'Medium'
-            badge_color = 'warning'
-        else:
-            badge_text = 'Low'
-            badge_color = 'danger'
-
-        return badge_text, badge_color, time_to_restore_service.format_days_duration(time_to_restore_service.value)
\ No newline at end of file
+        dora_cube = get_jira_data().get_dora_cube()
+        dora_metrics_filter = JiraDataDoraMetricsFilter(projects=projects, squads=squads, start_date=start_date, end_date=end_date)
+        dora_metrics = dora_cube.get_metrics(dora_metrics_filter)
+        weekly_metrics = dora_cube.get_weekly_metrics(dora_metrics_filter)
+
+        return (
+            *get_lead_time_to_change_tile(dora_metrics.lead_time_for_changes),
+            get_sparkline_figure(weekly_metrics['lead_time_for_changes']),
+            *get_deployment_frequency_tile(dora_metrics.deployment_frequency),
+            get_sparkline_figure(weekly_metrics['deployments']),
+            *get_change_failure_rate_tile(dora_metrics.change_failure_rate),
+            get_sparkline_figure(weekly_metrics['change_failure_rate']),
+            *get_time_to_restore_service_tile(dora_metrics.mean_time_to_recovery),
+            get_sparkline_figure(weekly_metrics['mean_time_to_recovery'])
+        )
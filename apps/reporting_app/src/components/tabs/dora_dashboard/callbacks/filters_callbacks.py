@@ -1,11 +1,13 @@
+from typing import Callable
 from dash import Input, Output, callback
 from src.data.data_dora import JiraDataDoraMetrics, JiraDataDoraMetricsFilter
 from src.data.data_filters import JiraDataFilterService, JiraDataFilter
+from src.data.data_loaders import JiraData
 import pandas as pd
 from datetime import datetime, timedelta
 from pytz import UTC
 
-def init_callbacks(app, jira_tickets: pd.DataFrame):
+def init_callbacks(app, get_jira_data: Callable[[], JiraData]):
     @callback(
         Output('dora-tab-squads-dropdown', 'options'),
         Input('dora-tab-project-dropdown', 'value')
@@ -14,9 +16,10 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
         if not projects:
             return []
 
-        jira_data_filter_service = JiraDataFilterService()
+        jira_data = get_jira_data()
+        jira_data_filter_service = JiraDataFilterService(jira_data)
         jira_data_filter = JiraDataFilter(projects=projects)
-        jira_data_filter_result = jira_data_filter_service.filter_tickets(jira_tickets, jira_data_filter)
+        jira_data_filter_result = jira_data_filter_service.filter_tickets(jira_data.get_tickets(), jira_data_filter, facets=['squads'])
         squads = jira_data_filter_result.squads
 
         return [
@@ -1,4 +1,4 @@
-from dash import html
+from dash import html, dcc
 import dash_bootstrap_components as dbc
 
 def create_dora_tiles():
@@ -11,7 +11,8 @@ def create_dora_tiles():
                     ], style={'backgroundColor': 'rgb(44, 62, 80)'}),
                     dbc.CardBody([
                         html.H5("Lead Time for Changes (Average)"),
-                        html.H3("", id="lead-time-to-change-value")
+                        html.H3("", id="lead-time-to-change-value"),
+                        dcc.Graph(id="lead-time-to-change-sparkline", config={'displayModeBar': False}, style={'height': '60px'})
                     ])
                 ]),
             ]),
@@ -22,7 +23,8 @@ def create_dora_tiles():
                     ], style={'backgroundColor': 'rgb(44, 62, 80)'}),
                     dbc.CardBody([
                         html.H5("Deployment Frequency"),
-                        html.H3("", id="deployment-frequency-value")
+                        html.H3("", id="deployment-frequency-value"),
+                        dcc.Graph(id="deployment-frequency-sparkline", config={'displayModeBar': False}, style={'height': '60px'})
                     ])
                 ]),
             ]),
@@ -35,7 +37,8 @@ def create_dora_tiles():
                     ], style={'backgroundColor': 'rgb(44, 62, 80)'}),
                     dbc.CardBody([
                         html.H5("Change Failure Rate"),
-                        html.H3("", id="change-failure-rate-value")
+                        html.H3("", id="change-failure-rate-value"),
+                        dcc.Graph(id="change-failure-rate-sparkline", config={'displayModeBar': False}, style={'height': '60px'})
                     ])
                 ]),
             ]),
@@ -46,7 +49,8 @@ def create_dora_tiles():
                     ], style={'backgroundColor': 'rgb(44, 62, 80)'}),
                     dbc.CardBody([
                         html.H5("Time to Restore Service"),
-                        html.H3("", id="time-to-restore-service-value")
+                        html.H3("", id="time-to-restore-service-value"),
+                        dcc.Graph(id="time-to-restore-service-sparkline", config={'displayModeBar': False}, style={'height': '60px'})
                     ])
                 ]),
             ]),
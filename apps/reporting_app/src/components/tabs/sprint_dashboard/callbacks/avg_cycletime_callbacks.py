@@ -1,18 +1,24 @@
-from dash import Input, Output, callback
+import json
+from typing import Callable
+from dash import Input, Output, State, callback, clientside_callback, no_update
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 from src.config.constants import (
-    STAGE_THRESHOLDS, PRIORITY_ORDER, THRESHOLD_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS,
+    STAGE_THRESHOLDS, THRESHOLD_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS,
     COLUMN_NAME_SPRINT, COLUMN_NAME_TYPE, COLUMN_NAME_ID, COLUMN_NAME_PRIORITY, STAGE_NAME_GROUPINGS,
-    STAGE_NAME_IGNORE, ALL_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS, COLUMN_NAME_LINK, COLUMN_NAME_STORY_POINTS,
-    COLUMN_NAME_NAME, COLUMN_NAME_STAGE
+    STAGE_NAME_IGNORE, COLUMN_NAME_STORY_POINTS,
+    COLUMN_NAME_NAME, COLUMN_NAME_STAGE, COLUMN_NAME_PRIORITY_SORT
 )
 from src.utils.stage_utils import StageUtils
 from src.data.data_filters import JiraDataFilter, JiraDataFilterService
+from src.data.data_loaders import JiraData
+from src.data.data_durations import JiraDataSprintDurationService
+from src.data.data_stage_metrics import JiraDataStageMetricsService
+from src.data.data_tables import JiraDataTicketTable, JiraDataTicketTableService
 
-def init_callbacks(app, jira_tickets: pd.DataFrame):
-    def get_avg_days_dataframe(jira_tickets: pd.DataFrame, selected_sprint: str, selected_squad: str,
+def init_callbacks(app, get_jira_data: Callable[[], JiraData], background: bool = False):
+    def get_avg_days_dataframe(jira_data: JiraData, selected_sprint: str, selected_squad: str,
                                selected_types: list[str], selected_components: list[str], selected_ticket: str,
                                selected_assignee: str) -> pd.DataFrame:
         if not selected_sprint:
@@ -25,85 +31,7 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
                                 ticketIds=[selected_ticket],
                                 components=selected_components,
                                 assignees=[selected_assignee])
-        jira_data_filter_result = JiraDataFilterService().filter_tickets(jira_tickets, filter)
-        sprint_data = jira_data_filter_result.tickets
-        sprint_data = StageUtils.calculate_tickets_duration_in_sprint(sprint_data, selected_sprint)
-
-        # Calculate stage mean using stage_mappings
-        stage_sums = {}
-        stage_ticket_ids = {}  # New dictionary to store ticket IDs for each stage
-
-        for merged_stage, related_stages in STAGE_NAME_GROUPINGS.items():
-            # Calculate the mean for each group of related stages
-            related_stage_columns = [StageUtils.to_stage_in_sprint_duration_days_column_name(stage) for stage in related_stages]
-
-            # Filter out columns that don't exist in the DataFrame
-            existing_columns = [col for col in related_stage_columns if col in sprint_data.columns]
-
-            if not existing_columns:
-                stage_sums[merged_stage] = 0
-                stage_ticket_ids[merged_stage] = []
-                continue
-
-            # Get tickets with non-zero days in any of the related stages
-            tickets_in_stage = sprint_data[sprint_data[existing_columns].gt(0).any(axis=1)]
-
-            if not tickets_in_stage.empty:
-                for idx, ticket in tickets_in_stage.iterrows():
-                    days_in_stages = [ticket[col] for col in existing_columns if ticket[col] > 0]
-                    avg_days = sum(days_in_stages) / len(days_in_stages) if days_in_stages else 0
-
-                total_days = tickets_in_stage[existing_columns].sum().sum()
-                num_tickets = len(tickets_in_stage)
-                stage_avg = total_days / num_tickets if num_tickets > 0 else 0
-                stage_sums[merged_stage] = round(stage_avg, 2)
-                stage_ticket_ids[merged_stage] = tickets_in_stage[COLUMN_NAME_ID].tolist()  # Store ticket IDs
-            else:
-                stage_sums[merged_stage] = 0
-                stage_ticket_ids[merged_stage] = []  # Empty list if no tickets
-
-        # Process remaining stages from ALL_STAGE_COLUMNS_DURATIONS_IN_DAYS
-        for stage_column in ALL_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS:
-            if stage_column not in sprint_data.columns:
-                continue  # Skip this column if it doesn't exist
-
-            stage_name = StageUtils.to_stage_name(stage_column)
-
-            # Skip if stage is already processed in STAGE_NAME_GROUPINGS
-            if any(stage_name in related_stages for related_stages in STAGE_NAME_GROUPINGS.values()):
-                continue
-
-            # Get tickets with non-zero days in this stage
-            tickets_in_stage = sprint_data[sprint_data[stage_column] > 0]
-
-            if not tickets_in_stage.empty:
-                total_days = tickets_in_stage[stage_column].sum()
-                num_tickets = len(tickets_in_stage)
-                stage_avg = total_days / num_tickets if num_tickets > 0 else 0
-                stage_sums[stage_name] = round(stage_avg, 2)
-                stage_ticket_ids[stage_name] = tickets_in_stage[COLUMN_NAME_ID].tolist()  # Store ticket IDs
-            else:
-                stage_ticket_ids[stage_name] = []  # Empty list if no tickets
-
-        # Remove ignored stages
-        stage_sums = {stage: value for stage, value in stage_sums.items()
-                     if stage not in STAGE_NAME_IGNORE}
-        stage_ticket_ids = {stage: ids for stage, ids in stage_ticket_ids.items()
-                            if stage not in STAGE_NAME_IGNORE}
-
-        # Filter out zero values
-        stage_sums = {k: v for k, v in stage_sums.items() if v > 0}
-        stage_ticket_ids = {k: v for k, v in stage_ticket_ids.items() if k in stage_sums}
-
-        # Create DataFrame for the chart
-        result = pd.DataFrame({
-            'Stage': list(stage_sums.keys()),
-            'Days': list(stage_sums.values()),
-            'Ticket IDs': [', '.join(map(str, ids)) for ids in stage_ticket_ids.values()],
-            'Grouped Stages': [', '.join(STAGE_NAME_GROUPINGS.get(stage, [stage])) for stage in stage_sums.keys()]
-        })
-
-        return result
+        return JiraDataStageMetricsService(jira_data).get_avg_days(selected_sprint, filter)
 
     @callback(
         Output('tickets-in-stage-bar-chart', 'figure'),
@@ -115,7 +43,7 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
         Input('assignee-dropdown', 'value')]
     )
     def update_bar_chart(selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_assignee):
-        chart_data = get_avg_days_dataframe(jira_tickets, selected_sprint, selected_squad, selected_types, selected_components, selected_ticket, selected_assignee)
+        chart_data = get_avg_days_dataframe(get_jira_data(), selected_sprint, selected_squad, selected_types, selected_components, selected_ticket, selected_assignee)
         # Create empty figure if no data
         if chart_data.empty:
             fig = go.Figure()
@@ -163,29 +91,14 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
         Input('assignee-dropdown', 'value')]
     )
     def update_avg_days_table(selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_assignee):
-        table_data = get_avg_days_dataframe(jira_tickets, selected_sprint, selected_squad, selected_types, selected_components, selected_ticket, selected_assignee)
+        table_data = get_avg_days_dataframe(get_jira_data(), selected_sprint, selected_squad, selected_types, selected_components, selected_ticket, selected_assignee)
 
         # Convert DataFrame to list of dictionaries for Dash table
         return table_data.to_dict('records')
 
-    @callback(
-        [Output('tickets-in-stage-table', 'rowData'),
-         Output('tickets-in-stage-title', 'children'),
-         Output('tickets-in-stage-ticket-ids', 'data')],
-        [Input('tickets-in-stage-bar-chart', 'clickData'),
-         Input('sprint-dropdown', 'value'),
-         Input('type-dropdown', 'value'),
-         Input('ticket-dropdown', 'value'),
-         Input('squad-dropdown', 'value'),
-         Input('components-dropdown', 'value'),
-         Input('assignee-dropdown', 'value')]
-    )
-    def update_stage_tickets(click_data, selected_sprint: str, selected_types: list[str], selected_ticket: str, selected_squad: str, selected_components: list[str], selected_assignee: str) -> tuple[list[dict], str, list[str], dict]:
-        if not click_data or not selected_sprint:
-            return [], "No stage selected", []
-
-        clicked_stage = click_data['points'][0]['x']
-        ticket_ids = click_data['points'][0]['customdata'][0].split(', ')
+    def get_stage_tickets_table(jira_data: JiraData, clicked_stage: str, ticket_ids: list[str], selected_sprint: str, selected_types: list[str],
+                                selected_ticket: str, selected_squad: str, selected_components: list[str], selected_assignee: str) -> JiraDataTicketTable:
+        jira_tickets = jira_data.get_tickets()
 
         # Filter by ticket IDs
         ticket_ids_filter = jira_tickets[COLUMN_NAME_ID].isin(ticket_ids)
@@ -196,21 +109,18 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
                                 ticketIds=[selected_ticket],
                                 components=selected_components,
                                 assignees=[selected_assignee])
-        jira_data_filter_result = JiraDataFilterService().filter_tickets(jira_tickets, filter)
+        jira_data_filter_result = JiraDataFilterService(jira_data).filter_tickets(jira_tickets, filter, facets=[])
 
         # Apply ticket ID filter after the main filtering
         sprint_data = jira_data_filter_result.tickets[ticket_ids_filter]
-
-        if sprint_data.empty:
-            return [], "No tickets found", []
-
-        sprint_data = StageUtils.calculate_tickets_duration_in_sprint(sprint_data, selected_sprint)
+        sprint_data = JiraDataSprintDurationService(jira_data).get_tickets_duration_in_sprint(sprint_data, selected_sprint)
 
         # Use stage_mappings to get all related stages
         related_stages = STAGE_NAME_GROUPINGS.get(clicked_stage, [clicked_stage])
         if not related_stages:
             related_stages = [clicked_stage]
         days_column_names = [StageUtils.to_stage_in_sprint_duration_days_column_name(stage) for stage in related_stages]
+        days_column_names = [column_name for column_name in days_column_names if column_name in sprint_data.columns]
 
         # Get tickets that spent time in any of the related stages
         stage_tickets = sprint_data[sprint_data[days_column_names].sum(axis=1) > 0].copy()
@@ -220,14 +130,13 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
         thresholds = STAGE_THRESHOLDS.get(clicked_stage, STAGE_THRESHOLDS['default'])
         stage_tickets['thresholds'] = [thresholds for _ in range(len(stage_tickets))]
 
-        # Add priority order column for sorting
-        if COLUMN_NAME_PRIORITY in stage_tickets.columns:
-            stage_tickets['priority_sort'] = stage_tickets[COLUMN_NAME_PRIORITY].map(lambda x: PRIORITY_ORDER.get(x, 8))
-        else:
-            stage_tickets['priority_sort'] = 8
+        # Sort by the priority order precomputed at load time first, then days in stage
+        stage_tickets = stage_tickets.sort_values(
+            by=[COLUMN_NAME_PRIORITY_SORT, 'days_in_stage'],
+            ascending=[True, False]
+        )
 
-        # Define columns to select
-        available_columns = [
+        return JiraDataTicketTable(stage_tickets, [
             COLUMN_NAME_ID,
             COLUMN_NAME_NAME,
             COLUMN_NAME_TYPE,
@@ -237,39 +146,119 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
             'days_in_stage',
             COLUMN_NAME_STORY_POINTS,
             'thresholds'
-            ]
+        ])
 
-        # Sort by priority first, then days in stage
-        stage_tickets = stage_tickets.sort_values(
-            by=['priority_sort', 'days_in_stage'],
-            ascending=[True, False]
-        )
+    @callback(
+        [Output('tickets-in-stage-title', 'children'),
+         Output('tickets-in-stage-ticket-ids', 'data')],
+        [Input('tickets-in-stage-bar-chart', 'clickData'),
+         Input('sprint-dropdown', 'value')]
+    )
+    def refresh_stage_tickets(click_data, selected_sprint: str) -> tuple[str, list[str]]:
+        if not click_data or not selected_sprint:
+            return "No stage selected", []
 
-        # Convert ID column to markdown links
-        stage_tickets[COLUMN_NAME_ID] = stage_tickets.apply(lambda x: f'[{x[COLUMN_NAME_ID]}]({x[COLUMN_NAME_LINK]})', axis=1)
+        clicked_stage = click_data['points'][0]['x']
+        ticket_ids = click_data['points'][0]['customdata'][0].split(', ')
+        return f"Tickets in {clicked_stage} Stage", ticket_ids
 
-        # Convert to records and drop the sorting column
-        table_data = stage_tickets[available_columns].to_dict('records')
+    def get_table_key(click_data, selected_sprint: str, selected_types: list[str], selected_ticket: str, selected_squad: str,
+                      selected_components: list[str], selected_assignee: str) -> tuple:
+        clicked_stage = click_data['points'][0]['x']
+        ticket_ids = click_data['points'][0]['customdata'][0].split(', ')
+        return ('tickets-in-stage', clicked_stage, tuple(ticket_ids), selected_sprint, tuple(selected_types or []), selected_ticket,
+                selected_squad, tuple(selected_components or []), selected_assignee)
 
-        return (
-            table_data,
-            f"Tickets in {clicked_stage} Stage",
-            ticket_ids,  # Return the extracted ticket IDs
-        )
+    def is_table_built(built_table: dict, key: tuple) -> bool:
+        # Compared as JSON, the store holds the key with lists in place of the tuples
+        return bool(built_table) and json.dumps(built_table.get('key')) == json.dumps(key)
+
+    def get_table(jira_data: JiraData, click_data, selected_sprint: str, selected_types: list[str], selected_ticket: str,
+                  selected_squad: str, selected_components: list[str], selected_assignee: str) -> JiraDataTicketTable:
+        clicked_stage = click_data['points'][0]['x']
+        ticket_ids = click_data['points'][0]['customdata'][0].split(', ')
+        key = get_table_key(click_data, selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_assignee)
+        return JiraDataTicketTableService(jira_data).get_table(key, lambda: get_stage_tickets_table(
+            jira_data, clicked_stage, ticket_ids, selected_sprint, selected_types, selected_ticket, selected_squad,
+            selected_components, selected_assignee))
+
+    @callback(
+        Output('tickets-in-stage-table-built', 'data'),
+        [Input('tickets-in-stage-bar-chart', 'clickData'),
+         Input('sprint-dropdown', 'value'),
+         Input('type-dropdown', 'value'),
+         Input('ticket-dropdown', 'value'),
+         Input('squad-dropdown', 'value'),
+         Input('components-dropdown', 'value'),
+         Input('assignee-dropdown', 'value')],
+        # Runs in a worker process of the background callback manager when enabled, which cancels a build superseded by another selection
+        background=background,
+        interval=250
+    )
+    def build_stage_tickets(click_data, selected_sprint: str, selected_types: list[str], selected_ticket: str, selected_squad: str,
+                            selected_components: list[str], selected_assignee: str) -> dict:
+        if not click_data or not selected_sprint:
+            return {}
+
+        jira_data = get_jira_data()
+        table = get_table(jira_data, click_data, selected_sprint, selected_types, selected_ticket, selected_squad,
+                          selected_components, selected_assignee)
+        key = get_table_key(click_data, selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_assignee)
+        return {'version': jira_data.version, 'key': key, 'rowCount': len(table)}
+
+    # The grid keeps the pages it already requested, purging them once the table of the new selection is built
+    # makes it request its rows
+    clientside_callback(
+        """
+        function() {
+            dash_ag_grid.getApiAsync('tickets-in-stage-table').then(api => api.purgeInfiniteCache());
+        }
+        """,
+        Input('tickets-in-stage-table-built', 'data'),
+        prevent_initial_call=True
+    )
+
+    @callback(
+        Output('tickets-in-stage-table', 'getRowsResponse'),
+        Input('tickets-in-stage-table', 'getRowsRequest'),
+        [State('tickets-in-stage-bar-chart', 'clickData'),
+         State('sprint-dropdown', 'value'),
+         State('type-dropdown', 'value'),
+         State('ticket-dropdown', 'value'),
+         State('squad-dropdown', 'value'),
+         State('components-dropdown', 'value'),
+         State('assignee-dropdown', 'value'),
+         State('tickets-in-stage-table-built', 'data')]
+    )
+    def update_stage_tickets(request: dict, click_data, selected_sprint: str, selected_types: list[str], selected_ticket: str,
+                             selected_squad: str, selected_components: list[str], selected_assignee: str, built_table: dict) -> dict:
+        if not request:
+            return no_update
+        if not click_data or not selected_sprint:
+            return {'rowData': [], 'rowCount': 0}
+
+        # Pages are only sliced from the table build_stage_tickets built, until then the grid gets no rows
+        # and it requests them again once the table is built
+        key = get_table_key(click_data, selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_assignee)
+        if not is_table_built(built_table, key):
+            return {'rowData': [], 'rowCount': 0}
+
+        table = get_table(get_jira_data(), click_data, selected_sprint, selected_types, selected_ticket, selected_squad,
+                          selected_components, selected_assignee)
+        return table.get_rows(request)
 
     @callback(
         [Output('tickets-in-stage-ticket-details-table', 'rowData'),
         Output('tickets-in-stage-ticket-details-title', 'children')],
         [Input('sprint-dropdown', 'value'),
-        Input('tickets-in-stage-table', 'selectedRows'),
-        Input('tickets-in-stage-table', 'rowData')]
+        Input('tickets-in-stage-table', 'selectedRows')]
     )
-    def update_stage_ticket_details(selected_sprint, selected_rows, table_data):
+    def update_stage_ticket_details(selected_sprint, selected_rows):
         result = (
             [],
             "Ticket's Cycle Time"
         )
-        if not selected_rows or not table_data or len(selected_rows) == 0 or len(table_data) == 0:
+        if not selected_rows or len(selected_rows) == 0:
             return result
 
         try:
@@ -280,8 +269,9 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
             return result
 
         # Process data for selected ticket
-        sprint_data = jira_tickets[jira_tickets[COLUMN_NAME_SPRINT].str.contains(selected_sprint, na=False)]
-        sprint_data = StageUtils.calculate_tickets_duration_in_sprint(sprint_data, selected_sprint)
+        jira_data = get_jira_data()
+        sprint_data = jira_data.get_tickets().loc[jira_data.get_sprint_index().get_ticket_rows([selected_sprint])]
+        sprint_data = JiraDataSprintDurationService(jira_data).get_tickets_duration_in_sprint(sprint_data, selected_sprint)
         ticket_data = sprint_data[sprint_data[COLUMN_NAME_ID] == selected_ticket]
         if ticket_data.empty:
             return result
@@ -1,9 +1,11 @@
+from typing import Callable
 from dash import Input, Output, callback
 import pandas as pd
 from src.data.data_filters import JiraDataFilter, JiraDataFilterService
+from src.data.data_loaders import JiraData
 from src.config.constants import COLUMN_NAME_ID, COLUMN_NAME_NAME
 
-def init_callbacks(app, jira_tickets: pd.DataFrame):
+def init_callbacks(app, get_jira_data: Callable[[], JiraData]):
     @callback(
     [Output('squad-dropdown', 'options'),
      Output('squad-dropdown', 'value')],
@@ -13,8 +15,9 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
         if not selected_project:
             return [], None
 
+        jira_data = get_jira_data()
         filter = JiraDataFilter(projects=[selected_project])
-        jira_data_filter_result = JiraDataFilterService().filter_tickets(jira_tickets, filter)
+        jira_data_filter_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter, facets=['squads'])
         squads = jira_data_filter_result.squads
         squad_options = [{'label': squad, 'value': squad} for squad in sorted(squads)]
         return squad_options, None
@@ -34,9 +37,10 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
         if not selected_project:
             return [], None, [], [], [], None
 
+        jira_data = get_jira_data()
         filter = JiraDataFilter(projects=[selected_project],
                                 squads=[selected_squad])
-        jira_data_filter_result = JiraDataFilterService().filter_tickets(jira_tickets, filter)
+        jira_data_filter_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter, facets=['sprints'])
         sprint_set = jira_data_filter_result.sprints
         sprint_options = [{'label': sprint, 'value': sprint} for sprint in list(sprint_set)]
 
@@ -61,20 +65,24 @@ def init_callbacks(app, jira_tickets: pd.DataFrame):
         if not selected_project or not selected_sprint:
             return [], [], [], None, [], [], [], None
 
+        jira_data = get_jira_data()
         filter = JiraDataFilter(projects=[selected_project],
                                 squads=[selected_squad],
                                 sprints=[selected_sprint],
                                 ticket_types=selected_types)
-        jira_data_filter_result = JiraDataFilterService().filter_tickets(jira_tickets, filter)
+        jira_data_filter_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter,
+                                                                                  facets=['ticket_types', 'components', 'assignees'])
 
         # Get ticket types options
         types = jira_data_filter_result.ticket_types
         type_options = [{'label': type_name, 'value': type_name} for type_name in types if pd.notna(type_name)]
 
         # Get ticket options
+        tickets = jira_data_filter_result.tickets
+        ticket_labels = tickets[COLUMN_NAME_ID].astype(str) + " - " + tickets[COLUMN_NAME_NAME].astype(str).str[:15] + ".."
         ticket_options = [
-            {'label': f"{row[COLUMN_NAME_ID]} - {row[COLUMN_NAME_NAME][:15]}..", 'value': row[COLUMN_NAME_ID]}
-            for _, row in jira_data_filter_result.tickets.iterrows()
+            {'label': label, 'value': ticket_id}
+            for label, ticket_id in zip(ticket_labels.tolist(), tickets[COLUMN_NAME_ID].tolist())
         ]
 
         # Get components options
@@ -1,19 +1,20 @@
+from typing import Callable
 from dash import Input, Output, callback, html
 from datetime import datetime
 from src.data.data_filters import JiraDataFilter, JiraDataFilterService
 from src.utils.stage_utils import StageUtils
 from src.config.constants import (
-    COLUMN_NAME_SPRINT, COLUMN_NAME_SPRINT_GOALS, COLUMN_NAME_STORY_POINTS, COLUMN_NAME_STAGE, STAGE_NAME_FINAL_STAGES,
+    COLUMN_NAME_STORY_POINTS, COLUMN_NAME_STAGE, STAGE_NAME_FINAL_STAGES,
     ALL_STAGE_NAMES, STAGE_NAME_IGNORE, COLUMN_NAME_TYPE
 )
-from src.utils.sprint_utils import get_sprint_date_range
-from src.utils.string_utils import split_string_array
 from src.data.data_filters import JiraDataFilterResult
+from src.data.data_loaders import JiraData
+from src.data.data_durations import JiraDataSprintDurationService
 
-def init_callbacks(app, jira_tickets):
-    def calculate_lead_time_for_changes(jira_data_filter_result: JiraDataFilterResult, sprint_name: str) -> float:
+def init_callbacks(app, get_jira_data: Callable[[], JiraData]):
+    def calculate_lead_time_for_changes(jira_data: JiraData, jira_data_filter_result: JiraDataFilterResult, sprint_name: str) -> float:
         tickets = jira_data_filter_result.tickets
-        tickets = StageUtils.calculate_tickets_duration_in_sprint(tickets, sprint_name)
+        tickets = JiraDataSprintDurationService(jira_data).get_tickets_duration_in_sprint(tickets, sprint_name)
         tickets = tickets[tickets[COLUMN_NAME_STAGE].isin(STAGE_NAME_FINAL_STAGES)]
         valid_stage_names = [stage for stage in ALL_STAGE_NAMES if stage not in STAGE_NAME_IGNORE]
         valid_stage_names = [StageUtils.to_stage_in_sprint_duration_days_column_name(stage) for stage in valid_stage_names]
@@ -51,49 +52,27 @@ def init_callbacks(app, jira_tickets):
         Input('assignee-dropdown', 'value')]
     )
     def update_sprint_info(selected_sprint: str, selected_types: list[str], selected_components: list[str], selected_ticket: str, selected_assignee: str) -> tuple[str, str, str]:
-        def is_multiple_values(value):
-            if isinstance(value, str) and '[' in value:
-                return True
-            return False
-        def get_sprint_value_index(value, list):
-            # example value: ["LFW 1.1.25"-"LFW 2.1.25"]
-            if is_multiple_values(list):
-                list = split_string_array(list, '"-"')
-                return list.index(value)
-            return 0
-        def get_sprint_goals_from_multiple_values(index, list):
-            # example value: ["Complete Apple Pay- Complete Wishlist in Bag- Complete prepartion for Non-Shoppable (Design- Tickets- Test Plan- TC Prep- Env)"-"Apple Pay defects- Non-shoppable PDPs development"]
-            if is_multiple_values(list):
-                list = split_string_array(list, '"-"')
-                return list[index]
-            return list
-
         if not selected_sprint:
             return "No sprint selected", "", ""
 
+        jira_data = get_jira_data()
         filter = JiraDataFilter(sprints=[selected_sprint], ticket_types=selected_types, components=selected_components, ticketIds=[selected_ticket], assignees=[selected_assignee])
-        jira_data_filter_result = JiraDataFilterService().filter_tickets(jira_tickets, filter)
+        jira_data_filter_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter, facets=[])
 
         if len(jira_data_filter_result.tickets) == 0:
             return "No tickets found for this sprint", "Sprint dates not available", "No sprint statistics available"
 
-        jira_ticket = jira_data_filter_result.tickets.iloc[0]
-
-        if is_multiple_values(jira_ticket[COLUMN_NAME_SPRINT]):
-            sprint_index = get_sprint_value_index(selected_sprint, jira_ticket[COLUMN_NAME_SPRINT])
-            sprint_goals = get_sprint_goals_from_multiple_values(sprint_index, jira_ticket[COLUMN_NAME_SPRINT_GOALS])
-        else:
-            sprint_goals = jira_ticket[COLUMN_NAME_SPRINT_GOALS]
+        sprint = jira_data.get_sprint_index().get_sprint(selected_sprint)
 
         goals_component = html.Div([
             html.H4("Sprint Goal:"),
-            html.P(sprint_goals)
+            html.P(sprint.goals)
         ])
 
         # Get sprint dates
         sprint_dates = "Sprint dates not available"
-        sprint_start_date, sprint_end_date = get_sprint_date_range(jira_data_filter_result.tickets, selected_sprint)
-        sprint_dates = f"{sprint_start_date.strftime('%d %b %Y')} - {sprint_end_date.strftime('%d %b %Y')}"
+        if sprint.start_date is not None and sprint.end_date is not None:
+            sprint_dates = f"{sprint.start_date.strftime('%d %b %Y')} - {sprint.end_date.strftime('%d %b %Y')}"
         sprint_dates_component = html.Div([
             html.H4("Sprint Dates:"),
             html.P(sprint_dates)
@@ -108,7 +87,7 @@ def init_callbacks(app, jira_tickets):
         non_subtask_completed_tickets = completed_tickets[completed_tickets[COLUMN_NAME_TYPE] != 'Sub-task']
         total_completed_tickets = len(completed_tickets)
         total_points_completed = int(non_subtask_completed_tickets[non_subtask_completed_tickets[COLUMN_NAME_STAGE].isin(STAGE_NAME_FINAL_STAGES)][COLUMN_NAME_STORY_POINTS].sum())
-        lead_time_for_changes = calculate_lead_time_for_changes(jira_data_filter_result, selected_sprint)
+        lead_time_for_changes = calculate_lead_time_for_changes(jira_data, jira_data_filter_result, selected_sprint)
 
         sprint_stats_component = html.Div([
             html.H4("Sprint Planned:"),
@@ -1,11 +1,17 @@
+import json
+from typing import Callable
 import pandas as pd
-from dash import Input, Output, callback
+from dash import Input, Output, State, callback, clientside_callback, no_update
 from src.data.data_filters import JiraDataFilter, JiraDataFilterService
+from src.data.data_loaders import JiraData
+from src.data.data_durations import JiraDataSprintDurationService
+from src.data.data_stage_metrics import JiraDataStageMetricsService
+from src.data.data_tables import JiraDataTicketTable, JiraDataTicketTableService
 from src.config.constants import COLUMN_NAME_ID, COLUMN_NAME_LINK, COLUMN_NAME_TYPE, COLUMN_NAME_PARENT_TYPE, \
     COLUMN_NAME_PARENT_NAME, COLUMN_NAME_STAGE, COLUMN_NAME_STORY_POINTS, COLUMN_NAME_FIX_VERSIONS, \
     COLUMN_NAME_CREATED_DATE, COLUMN_NAME_UPDATED_DATE, COLUMN_NAME_SPRINT, COLUMN_NAME_NAME, COLUMN_NAME_PRIORITY, \
-    PRIORITY_ORDER, THRESHOLD_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS, STAGE_THRESHOLDS, COLUMN_NAME_ASSIGNEE_NAME, \
-    ALL_STAGE_COLUMNS_DURATIONS_IN_DAYS, STAGE_NAME_IN_PROGRESS_GROUPINGS
+    THRESHOLD_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS, STAGE_THRESHOLDS, COLUMN_NAME_ASSIGNEE_NAME, \
+    ALL_STAGE_COLUMNS_DURATIONS_IN_DAYS, STAGE_NAME_IN_PROGRESS_GROUPINGS, COLUMN_NAME_TYPE_SORT
 from src.utils.sprint_utils import get_sprint_date_range
 from src.utils.stage_utils import StageUtils
 
@@ -38,193 +44,164 @@ def get_column_defs(hide_exceeding_stages: bool = True)->list[dict]:
             }
         ];
 
-def init_callbacks(app, jira_tickets):
-    def get_defects(jira_tickets: pd.DataFrame, selected_sprint: str) -> list[dict]:
-        defects = jira_tickets[jira_tickets[COLUMN_NAME_TYPE].isin(['Bug', 'Defect'])].copy()
-        sprint_start_date, sprint_end_date = get_sprint_date_range(defects, selected_sprint)
+def init_callbacks(app, get_jira_data: Callable[[], JiraData], background: bool = False):
+    def get_defects(jira_data: JiraData, jira_tickets: pd.DataFrame, selected_sprint: str) -> JiraDataTicketTable:
+        defects = jira_tickets[jira_tickets[COLUMN_NAME_TYPE].isin(['Bug', 'Defect'])]
+        sprint_start_date, sprint_end_date = get_sprint_date_range(defects, selected_sprint, jira_data.get_sprint_index())
         # Filter defects created during the sprint
         if sprint_start_date is not None:
             defects = defects[defects[COLUMN_NAME_CREATED_DATE] >= sprint_start_date]
         if sprint_end_date is not None:
             defects = defects[defects[COLUMN_NAME_CREATED_DATE] <= sprint_end_date]
 
-        # Add priority order for sorting
-        defects['priority_sort'] = defects[COLUMN_NAME_PRIORITY].map(lambda x: PRIORITY_ORDER.get(x, 8))
-
-        # Prepare table data with markdown links
-        table_data = defects[[
+        return JiraDataTicketTable(defects, [
             COLUMN_NAME_ID, COLUMN_NAME_NAME, COLUMN_NAME_PRIORITY, COLUMN_NAME_STAGE, COLUMN_NAME_STORY_POINTS,
             COLUMN_NAME_PARENT_TYPE, COLUMN_NAME_PARENT_NAME, COLUMN_NAME_LINK, COLUMN_NAME_TYPE, COLUMN_NAME_CREATED_DATE,
             COLUMN_NAME_UPDATED_DATE, COLUMN_NAME_SPRINT, COLUMN_NAME_FIX_VERSIONS
-        ]].copy()
-
-        # Convert ID column to markdown links
-        table_data[COLUMN_NAME_ID] = table_data.apply(lambda x: f'[{x[COLUMN_NAME_ID]}]({x[COLUMN_NAME_LINK]})', axis=1)
-
-        return table_data.to_dict('records')
-
-    def get_threshold_violations(jira_tickets: pd.DataFrame, selected_sprint: str) -> list[dict]:
-        sprint_data = jira_tickets
-        sprint_data = StageUtils.calculate_tickets_duration_in_sprint(sprint_data, selected_sprint)
-
-        tickets_exceeding_threshold = []
-        for _, ticket in sprint_data.iterrows():
-            # Track all stages exceeding thresholds
-            exceeding_stages = []
-            max_threshold_ratio = 0
-
-            for stage_col in THRESHOLD_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS:
-                stage_name = StageUtils.to_stage_name(stage_col)
-                days_in_stage = ticket[stage_col]
-                thresholds = STAGE_THRESHOLDS.get(stage_name, STAGE_THRESHOLDS['default'])
-
-                if days_in_stage >= thresholds['warning']:
-                    # Calculate violation ratio (how many times over the warning threshold)
-                    threshold_ratio = days_in_stage / thresholds['warning']
-                    if threshold_ratio > max_threshold_ratio:
-                        max_threshold_ratio = threshold_ratio
-
-                    # Add stage to exceeding stages list with days
-                    exceeding_stages.append(f"{stage_name} ({days_in_stage:.1f}d)")
-
-            # Add ticket if it had any violations
-            if exceeding_stages:
-                # Get priority value from the available columns
-                priority = None
-                if COLUMN_NAME_PRIORITY in ticket and pd.notna(ticket[COLUMN_NAME_PRIORITY]):
-                    priority = str(ticket[COLUMN_NAME_PRIORITY])
-
-                if not priority or pd.isna(priority) or priority.lower() == 'nan':
-                    priority = 'N/A'
-
-                ticket_data = {
-                    COLUMN_NAME_ID: ticket[COLUMN_NAME_ID],
-                    COLUMN_NAME_NAME: ticket[COLUMN_NAME_NAME],
-                    COLUMN_NAME_TYPE: ticket[COLUMN_NAME_TYPE],
-                    COLUMN_NAME_PRIORITY: priority,
-                    COLUMN_NAME_STAGE: ticket[COLUMN_NAME_STAGE],
-                    COLUMN_NAME_ASSIGNEE_NAME: ticket[COLUMN_NAME_ASSIGNEE_NAME],
-                    'exceeding_stages': ', '.join(exceeding_stages),
-                    COLUMN_NAME_STORY_POINTS: ticket[COLUMN_NAME_STORY_POINTS],
-                    COLUMN_NAME_SPRINT: ticket[COLUMN_NAME_SPRINT],
-                    '_threshold_ratio': max_threshold_ratio,
-                    '_priority_order': PRIORITY_ORDER.get(priority, 8),
-                    COLUMN_NAME_LINK: ticket[COLUMN_NAME_LINK],
-                    COLUMN_NAME_FIX_VERSIONS: ticket[COLUMN_NAME_FIX_VERSIONS],
-                    COLUMN_NAME_CREATED_DATE: ticket[COLUMN_NAME_CREATED_DATE],
-                    COLUMN_NAME_UPDATED_DATE: ticket[COLUMN_NAME_UPDATED_DATE],
-                    COLUMN_NAME_PARENT_TYPE: ticket[COLUMN_NAME_PARENT_TYPE],
-                    COLUMN_NAME_PARENT_NAME: ticket[COLUMN_NAME_PARENT_NAME],
-                    COLUMN_NAME_PRIORITY: ticket[COLUMN_NAME_PRIORITY]
-                }
-                tickets_exceeding_threshold.append(ticket_data)
-
-        # Sort the list of dictionaries by priority first, then threshold ratio
-        tickets_exceeding_threshold.sort(key=lambda x: (x['_priority_order'], -x['_threshold_ratio']))
-
-        # Remove sorting keys before returning
-        for ticket in tickets_exceeding_threshold:
-            del ticket['_priority_order']
-            del ticket['_threshold_ratio']
-
-        # Convert ID to markdown link in the ticket_data dictionary
-        for ticket in tickets_exceeding_threshold:
-            ticket[COLUMN_NAME_ID] = f"[{ticket[COLUMN_NAME_ID]}]({ticket[COLUMN_NAME_LINK]})"
-
-        return tickets_exceeding_threshold
-
-    def get_all_tickets(jira_tickets: pd.DataFrame, selected_sprint: str) -> list[dict]:
-        # Define type order for sorting
-        type_order = {
-            'Epic': 0,
-            'Story': 1,
-            'User Story': 1,
-            'Task': 2,
-            'Sub-task': 2,
-            'Bug': 3,
-            'Defect': 3,
-        }
+        ])
+
+    def get_threshold_violations(jira_data: JiraData, jira_tickets: pd.DataFrame, selected_sprint: str) -> JiraDataTicketTable:
+        violations = JiraDataStageMetricsService(jira_data).get_threshold_violations(jira_tickets, selected_sprint)
+
+        return JiraDataTicketTable(violations, [
+            COLUMN_NAME_ID, COLUMN_NAME_NAME, COLUMN_NAME_TYPE, COLUMN_NAME_PRIORITY, COLUMN_NAME_STAGE,
+            COLUMN_NAME_ASSIGNEE_NAME, 'exceeding_stages', COLUMN_NAME_STORY_POINTS, COLUMN_NAME_SPRINT, COLUMN_NAME_LINK,
+            COLUMN_NAME_FIX_VERSIONS, COLUMN_NAME_CREATED_DATE, COLUMN_NAME_UPDATED_DATE, COLUMN_NAME_PARENT_TYPE,
+            COLUMN_NAME_PARENT_NAME
+        ])
+
+    def get_all_tickets(jira_tickets: pd.DataFrame, selected_sprint: str) -> JiraDataTicketTable:
+        # Sort by the type order precomputed at load time, then ID
+        sprint_data = jira_tickets.sort_values([COLUMN_NAME_TYPE_SORT, COLUMN_NAME_ID])
+
+        return JiraDataTicketTable(sprint_data, [
+            COLUMN_NAME_ID, COLUMN_NAME_NAME, COLUMN_NAME_TYPE, COLUMN_NAME_PARENT_TYPE, COLUMN_NAME_PARENT_NAME,
+            COLUMN_NAME_STAGE, COLUMN_NAME_STORY_POINTS, COLUMN_NAME_FIX_VERSIONS, COLUMN_NAME_CREATED_DATE,
+            COLUMN_NAME_UPDATED_DATE, COLUMN_NAME_SPRINT, COLUMN_NAME_PRIORITY
+        ])
+
+    def get_tickets_in_sprint_table(jira_data: JiraData, selected_sprint: str, selected_types: list[str], selected_ticket: str,
+                                    selected_squad: str, selected_components: list[str], selected_view: str) -> JiraDataTicketTable:
+        filter = JiraDataFilter(sprints=[selected_sprint],
+                                ticket_types=selected_types,
+                                ticketIds=[selected_ticket],
+                                squads=[selected_squad],
+                                components=selected_components)
+        jira_data_filter_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter, facets=[])
 
-        # Create a copy and add the type order column
-        sprint_data = jira_tickets.copy()
-        sprint_data['type_sort'] = sprint_data['Type'].map(lambda x: type_order.get(x, 999))
+        if selected_view == 'defects':
+            return get_defects(jira_data, jira_data_filter_result.tickets, selected_sprint)
+        elif selected_view == 'threshold':
+            return get_threshold_violations(jira_data, jira_data_filter_result.tickets, selected_sprint)
 
-        # Sort the data using the temporary column
-        sprint_data = sprint_data.sort_values(['type_sort', 'ID'])
+        return get_all_tickets(jira_data_filter_result.tickets, selected_sprint)
 
-        # Convert ID column to markdown links
-        sprint_data[COLUMN_NAME_ID] = sprint_data.apply(lambda x: f'[{x[COLUMN_NAME_ID]}]({x[COLUMN_NAME_LINK]})', axis=1)
+    @callback(
+        Output('sprint-tickets-with-options-table', 'columnDefs'),
+        Input('sprint-tickets-with-options-radio', 'value')
+    )
+    def refresh_tickets_in_sprint_table(selected_view: str) -> list[dict]:
+        return get_column_defs(hide_exceeding_stages=selected_view != 'threshold')
 
-        # Convert to records and remove the temporary sorting column
-        sprint_records = sprint_data.drop(columns=['type_sort']).to_dict('records')
+    def get_table_key(selected_sprint: str, selected_types: list[str], selected_ticket: str, selected_squad: str,
+                      selected_components: list[str], selected_view: str) -> tuple:
+        return ('sprint-tickets', selected_sprint, tuple(selected_types or []), selected_ticket, selected_squad,
+                tuple(selected_components or []), selected_view)
 
-        # Filter to only include columns shown in the table
-        sprint_records = [{
-            COLUMN_NAME_ID: record[COLUMN_NAME_ID],
-            COLUMN_NAME_NAME: record[COLUMN_NAME_NAME],
-            COLUMN_NAME_TYPE: record[COLUMN_NAME_TYPE],
-            COLUMN_NAME_PARENT_TYPE: record[COLUMN_NAME_PARENT_TYPE],
-            COLUMN_NAME_PARENT_NAME: record[COLUMN_NAME_PARENT_NAME],
-            COLUMN_NAME_STAGE: record[COLUMN_NAME_STAGE],
-            COLUMN_NAME_STORY_POINTS: record[COLUMN_NAME_STORY_POINTS],
-            COLUMN_NAME_FIX_VERSIONS: record[COLUMN_NAME_FIX_VERSIONS],
-            COLUMN_NAME_CREATED_DATE: record[COLUMN_NAME_CREATED_DATE],
-            COLUMN_NAME_UPDATED_DATE: record[COLUMN_NAME_UPDATED_DATE],
-            COLUMN_NAME_SPRINT: record[COLUMN_NAME_SPRINT],
-            COLUMN_NAME_PRIORITY: record[COLUMN_NAME_PRIORITY]
-        } for record in sprint_records]
+    def is_table_built(built_table: dict, key: tuple) -> bool:
+        # Compared as JSON, the store holds the key with lists in place of the tuples
+        return bool(built_table) and json.dumps(built_table.get('key')) == json.dumps(key)
 
-        return sprint_records
+    def get_table(jira_data: JiraData, selected_sprint: str, selected_types: list[str], selected_ticket: str,
+                  selected_squad: str, selected_components: list[str], selected_view: str) -> JiraDataTicketTable:
+        key = get_table_key(selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_view)
+        return JiraDataTicketTableService(jira_data).get_table(key, lambda: get_tickets_in_sprint_table(
+            jira_data, selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_view))
 
     @callback(
-        [Output('sprint-tickets-with-options-table', 'rowData'),
-        Output('sprint-tickets-with-options-table', 'columnDefs')],
+        Output('sprint-tickets-with-options-table-built', 'data'),
         [Input('sprint-dropdown', 'value'),
         Input('type-dropdown', 'value'),
         Input('ticket-dropdown', 'value'),
         Input('squad-dropdown', 'value'),
         Input('components-dropdown', 'value'),
-        Input('sprint-tickets-with-options-radio', 'value')]
+        Input('sprint-tickets-with-options-radio', 'value')],
+        # Building the table of a large sprint takes seconds, when enabled it runs in a worker process of the
+        # background callback manager, which cancels a build superseded by another selection
+        background=background,
+        interval=250
     )
-    def update_tickets_in_sprint_table(
+    def build_tickets_in_sprint_table(
         selected_sprint: str,
         selected_types: list[str],
         selected_ticket: str,
         selected_squad: str,
         selected_components: list[str],
-        selected_view: str) -> list[dict]:
-
+        selected_view: str) -> dict:
         if not selected_sprint:
-            return [], get_column_defs()
+            return {}
+
+        jira_data = get_jira_data()
+        table = get_table(jira_data, selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_view)
+        key = get_table_key(selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_view)
+        return {'version': jira_data.version, 'key': key, 'rowCount': len(table)}
+
+    # The grid keeps the pages it already requested, purging them once the table of the new selection is built
+    # makes it request its rows
+    clientside_callback(
+        """
+        function() {
+            dash_ag_grid.getApiAsync('sprint-tickets-with-options-table').then(api => api.purgeInfiniteCache());
+        }
+        """,
+        Input('sprint-tickets-with-options-table-built', 'data'),
+        prevent_initial_call=True
+    )
 
-        filter = JiraDataFilter(sprints=[selected_sprint],
-                                ticket_types=selected_types,
-                                ticketIds=[selected_ticket],
-                                squads=[selected_squad],
-                                components=selected_components)
-        jira_data_filter_result = JiraDataFilterService().filter_tickets(jira_tickets, filter)
+    @callback(
+        Output('sprint-tickets-with-options-table', 'getRowsResponse'),
+        Input('sprint-tickets-with-options-table', 'getRowsRequest'),
+        [State('sprint-dropdown', 'value'),
+        State('type-dropdown', 'value'),
+        State('ticket-dropdown', 'value'),
+        State('squad-dropdown', 'value'),
+        State('components-dropdown', 'value'),
+        State('sprint-tickets-with-options-radio', 'value'),
+        State('sprint-tickets-with-options-table-built', 'data')]
+    )
+    def update_tickets_in_sprint_table(
+        request: dict,
+        selected_sprint: str,
+        selected_types: list[str],
+        selected_ticket: str,
+        selected_squad: str,
+        selected_components: list[str],
+        selected_view: str,
+        built_table: dict) -> dict:
 
-        if selected_view == 'defects':
-            return get_defects(jira_data_filter_result.tickets, selected_sprint), get_column_defs()
-        elif selected_view == 'threshold':
-            return get_threshold_violations(jira_data_filter_result.tickets, selected_sprint), get_column_defs(hide_exceeding_stages=False)
+        if not request:
+            return no_update
+        # Pages are only sliced from the table build_tickets_in_sprint_table built, until then the grid gets no rows
+        # and it requests them again once the table is built
+        key = get_table_key(selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_view)
+        if not selected_sprint or not is_table_built(built_table, key):
+            return {'rowData': [], 'rowCount': 0}
 
-        all_tickets = get_all_tickets(jira_data_filter_result.tickets, selected_sprint)
-        return all_tickets, get_column_defs()
+        table = get_table(get_jira_data(), selected_sprint, selected_types, selected_ticket, selected_squad, selected_components, selected_view)
+        return table.get_rows(request)
 
     @callback(
         [Output('sprint-tickets-with-options-details-table', 'rowData'),
         Output('sprint-tickets-with-options-details-title', 'children')],
         [Input('sprint-dropdown', 'value'),
-        Input('sprint-tickets-with-options-table', 'selectedRows'),
-        Input('sprint-tickets-with-options-table', 'rowData')]
+        Input('sprint-tickets-with-options-table', 'selectedRows')]
     )
-    def update_ticket_stage_details_table(selected_sprint, selected_rows, table_data):
+    def update_ticket_stage_details_table(selected_sprint, selected_rows):
         result = (
             [],
             "Ticket's Cycle Time"
         )
-        if not selected_rows or not table_data or len(selected_rows) == 0:
+        if not selected_rows or len(selected_rows) == 0:
             return result
 
         try:
@@ -235,13 +212,14 @@ def init_callbacks(app, jira_tickets):
             return result
 
         # Process data for selected ticket
+        jira_data = get_jira_data()
         filter = JiraDataFilter(sprints=[selected_sprint],
                                 ticket_types=[],
                                 ticketIds=[selected_ticket],
                                 squads=[],
                                 components=[])
-        sprint_data = JiraDataFilterService().filter_tickets(jira_tickets, filter).tickets
-        sprint_data = StageUtils.calculate_tickets_duration_in_sprint(sprint_data, selected_sprint)
+        sprint_data = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter, facets=[]).tickets
+        sprint_data = JiraDataSprintDurationService(jira_data).get_tickets_duration_in_sprint(sprint_data, selected_sprint)
         ticket_data = sprint_data[sprint_data[COLUMN_NAME_ID] == selected_ticket]
         if ticket_data.empty:
             return result
@@ -74,7 +74,9 @@ def create_avg_cycletime_report():
                         ],
                         columnSize="sizeToFit",
                         className="ag-theme-quartz compact",
-                        dashGridOptions={"rowSelection": "single", "tooltipShowDelay": 0},
+                        # Rows are requested page by page from the server
+                        rowModelType="infinite",
+                        dashGridOptions={"rowSelection": "single", "tooltipShowDelay": 0, "cacheBlockSize": 100, "maxBlocksInCache": 10},
                     )
                 ], style={'width': '80%', 'display': 'inline-block', 'verticalAlign': 'top'}),
 
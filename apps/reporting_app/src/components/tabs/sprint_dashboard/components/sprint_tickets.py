@@ -25,7 +25,9 @@ def create_sprint_tickets():
                         columnDefs=get_column_defs(),
                         columnSize="sizeToFit",
                         className="ag-theme-quartz compact",
-                        dashGridOptions={"rowSelection": "single", "tooltipShowDelay": 0},
+                        # Rows are filtered, sorted and requested page by page from the server
+                        rowModelType="infinite",
+                        dashGridOptions={"rowSelection": "single", "tooltipShowDelay": 0, "cacheBlockSize": 100, "maxBlocksInCache": 10},
                         defaultColDef={"resizable": True, "filter": "agTextColumnFilter", "floatingFilter": True}
                     )
                 ], id="sprint-tickets-with-options-container-left", style={'width': '80%', 'display': 'inline-block', 'verticalAlign': 'top'}),
@@ -7,9 +7,11 @@ from src.components.tabs.sprint_dashboard.components.sprint_tickets import creat
 from src.data.data_loaders import JiraData
 from src.config.app_settings import AppSettings
 
-def create_sprint_tab(jira_data: JiraData):
+def create_sprint_tab(jira_data: JiraData = None):
     app_settings = AppSettings()
-    projects = [project for project in jira_data.get_projects() if project in app_settings.SPRINT_DASHBOARD_VALID_PROJECT_NAMES]
+    # Without data the tab only lists no projects, as in the layout Dash validates the callbacks against
+    projects = [project for project in jira_data.get_projects() if project in app_settings.SPRINT_DASHBOARD_VALID_PROJECT_NAMES] \
+        if jira_data is not None else []
 
     filters = html.Div([
         html.Div([
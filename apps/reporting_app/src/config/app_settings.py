@@ -13,6 +13,114 @@ class AppSettings:
     def SPRINT_DASHBOARD_VALID_PROJECT_NAMES(self) -> list[str]:
         return os.getenv('SPRINT_DASHBOARD_VALID_PROJECT_NAMES', '').split(',') or []
 
+    @property
+    def REPORTING_SNAPSHOT_ENABLED(self) -> bool:
+        return os.getenv('REPORTING_SNAPSHOT_ENABLED', 'true').lower() == 'true'
+
+    @property
+    def REPORTING_CSV_SCHEMA_ENABLED(self) -> bool:
+        return os.getenv('REPORTING_CSV_SCHEMA_ENABLED', 'false').lower() == 'true'
+
+    @property
+    def REPORTING_CSV_ENGINE(self) -> str:
+        return os.getenv('REPORTING_CSV_ENGINE', '')
+
+    @property
+    def REPORTING_INCREMENTAL_RELOAD_ENABLED(self) -> bool:
+        return os.getenv('REPORTING_INCREMENTAL_RELOAD_ENABLED', 'true').lower() == 'true'
+
+    @property
+    def REPORTING_LAZY_STARTUP_ENABLED(self) -> bool:
+        return os.getenv('REPORTING_LAZY_STARTUP_ENABLED', 'false').lower() == 'true'
+
+    @property
+    def REPORTING_RELOAD_INTERVAL_SECONDS(self) -> float:
+        return float(os.getenv('REPORTING_RELOAD_INTERVAL_SECONDS', '60'))
+
+    @property
+    def REPORTING_SERVER_WORKERS(self) -> int:
+        return int(os.getenv('REPORTING_SERVER_WORKERS', '2'))
+
+    @property
+    def REPORTING_SERVER_THREADS(self) -> int:
+        return int(os.getenv('REPORTING_SERVER_THREADS', '4'))
+
+    @property
+    def REPORTING_METRICS_ENABLED(self) -> bool:
+        return os.getenv('REPORTING_METRICS_ENABLED', 'true').lower() == 'true'
+
+    @property
+    def REPORTING_PROFILER_ENABLED(self) -> bool:
+        return os.getenv('REPORTING_PROFILER_ENABLED', 'false').lower() == 'true'
+
+    @property
+    def REPORTING_PROFILER_BUDGET_SECONDS(self) -> float:
+        return float(os.getenv('REPORTING_PROFILER_BUDGET_SECONDS', '1'))
+
+    @property
+    def REPORTING_PROFILER_DIR(self) -> str:
+        return os.getenv('REPORTING_PROFILER_DIR', 'profiles')
+
+    @property
+    def REPORTING_PROFILER_MAX_FILES(self) -> int:
+        return int(os.getenv('REPORTING_PROFILER_MAX_FILES', '20'))
+
     @property
     def S3_BUCKET_NAME(self) -> str:
         return os.getenv('S3_BUCKET_NAME', '')
+
+    @property
+    def S3_CSV_COMPRESSION(self) -> str:
+        return os.getenv('S3_CSV_COMPRESSION', '').lower()
+
+    @property
+    def S3_MULTIPART_THRESHOLD_MB(self) -> int:
+        return int(os.getenv('S3_MULTIPART_THRESHOLD_MB', '64'))
+
+    @property
+    def S3_MULTIPART_CHUNKSIZE_MB(self) -> int:
+        return int(os.getenv('S3_MULTIPART_CHUNKSIZE_MB', '16'))
+
+    @property
+    def S3_MAX_CONCURRENCY(self) -> int:
+        return int(os.getenv('S3_MAX_CONCURRENCY', '8'))
+
+    @property
+    def FILTER_CACHE_MAX_SIZE(self) -> int:
+        return int(os.getenv('FILTER_CACHE_MAX_SIZE', '128'))
+
+    @property
+    def SPRINT_DURATION_CACHE_MAX_SIZE(self) -> int:
+        return int(os.getenv('SPRINT_DURATION_CACHE_MAX_SIZE', '16'))
+
+    @property
+    def TICKET_TABLE_CACHE_MAX_SIZE(self) -> int:
+        return int(os.getenv('TICKET_TABLE_CACHE_MAX_SIZE', '32'))
+
+    @property
+    def AVG_DAYS_CACHE_MAX_SIZE(self) -> int:
+        return int(os.getenv('AVG_DAYS_CACHE_MAX_SIZE', '128'))
+
+    @property
+    def REPORTING_RESULT_CACHE_BACKEND(self) -> str:
+        return os.getenv('REPORTING_RESULT_CACHE_BACKEND', 'memory').lower()
+
+    @property
+    def REPORTING_RESULT_CACHE_TTL_SECONDS(self) -> float:
+        return float(os.getenv('REPORTING_RESULT_CACHE_TTL_SECONDS', '3600'))
+
+    @property
+    def REPORTING_RESULT_CACHE_PATH(self) -> str:
+        return os.getenv('REPORTING_RESULT_CACHE_PATH', 'cache/results.sqlite')
+
+    @property
+    def REPORTING_RESULT_CACHE_REDIS_URL(self) -> str:
+        return os.getenv('REPORTING_RESULT_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+    @property
+    def REPORTING_BACKGROUND_CALLBACKS_ENABLED(self) -> bool:
+        return os.getenv('REPORTING_BACKGROUND_CALLBACKS_ENABLED', 'false').lower() == 'true'
+
+    @property
+    def REPORTING_BACKGROUND_CALLBACKS_DIR(self) -> str:
+        return os.getenv('REPORTING_BACKGROUND_CALLBACKS_DIR', 'cache/callbacks')
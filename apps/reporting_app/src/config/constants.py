@@ -23,6 +23,17 @@ PRIORITY_ORDER = {
     'N/A': 8
 }
 
+# Order of the ticket types in the sprint tickets table
+TYPE_ORDER = {
+    'Epic': 0,
+    'Story': 1,
+    'User Story': 1,
+    'Task': 2,
+    'Sub-task': 2,
+    'Bug': 3,
+    'Defect': 3,
+}
+
 COLUMN_NAME_ID = "ID"
 COLUMN_NAME_LINK = "Link"
 COLUMN_NAME_PROJECT = "Project"
@@ -46,6 +57,9 @@ COLUMN_NAME_SPRINT_END_DATE = "SprintEndDate"
 COLUMN_NAME_PARENT_TYPE = "ParentType"
 COLUMN_NAME_PARENT_NAME = "ParentName"
 COLUMN_NAME_ASSIGNEE_NAME = "AssigneeName"
+# Sort keys of the ticket tables, added at load time
+COLUMN_NAME_PRIORITY_SORT = "priority_sort"
+COLUMN_NAME_TYPE_SORT = "type_sort"
 # Stage Columns
 COLUMN_NAME_STAGE_BACKLOG_DAYS = "Stage Backlog days"
 COLUMN_NAME_STAGE_DELIVERY_BACKLOG_DAYS = "Stage Delivery Backlog days"
@@ -295,4 +309,40 @@ THRESHOLD_STAGE_COLUMNS_DURATION_IN_DAYS = [
 
 THRESHOLD_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS = [
     f"{stage.replace(' days', ' days in sprint')}" for stage in THRESHOLD_STAGE_COLUMNS_DURATION_IN_DAYS
-]
\ No newline at end of file
+]
+
+ALL_STAGE_COLUMNS_START_DATE = [
+    f"Stage {stage} start" for stage in ALL_STAGE_NAMES
+]
+
+# Columns read by the typed CSV ingestion, grouped by the dtype they are converted to
+CSV_STRING_COLUMNS = [
+    COLUMN_NAME_ID,
+    COLUMN_NAME_LINK,
+    COLUMN_NAME_NAME,
+    COLUMN_NAME_SPRINT,
+    COLUMN_NAME_SPRINT_GOALS,
+    COLUMN_NAME_SPRINT_START_DATE,
+    COLUMN_NAME_SPRINT_END_DATE,
+    COLUMN_NAME_COMPONENTS,
+    COLUMN_NAME_FIX_VERSIONS,
+    COLUMN_NAME_PARENT_TYPE,
+    COLUMN_NAME_PARENT_NAME,
+    COLUMN_NAME_ASSIGNEE_NAME,
+    COLUMN_NAME_SQUAD,
+    COLUMN_NAME_SQUAD2,
+    # Read as strings, their UTC offsets vary between tickets and the loader converts them to UTC
+    COLUMN_NAME_CREATED_DATE,
+    COLUMN_NAME_UPDATED_DATE
+]
+
+CSV_CATEGORICAL_COLUMNS = [
+    COLUMN_NAME_PROJECT,
+    COLUMN_NAME_TYPE,
+    COLUMN_NAME_STAGE,
+    COLUMN_NAME_PRIORITY
+]
+
+CSV_NUMERIC_COLUMNS = [COLUMN_NAME_STORY_POINTS] + ALL_STAGE_COLUMNS_DURATIONS_IN_DAYS
+
+CSV_DATE_COLUMNS = ALL_STAGE_COLUMNS_START_DATE
@@ -0,0 +1,185 @@
+import itertools
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from src.config.constants import (
+    COLUMN_NAME_ID,
+    COLUMN_NAME_NAME,
+    COLUMN_NAME_TYPE,
+    COLUMN_NAME_PRIORITY,
+    COLUMN_NAME_STAGE,
+    COLUMN_NAME_ASSIGNEE_NAME,
+    COLUMN_NAME_STORY_POINTS,
+    COLUMN_NAME_PROJECT,
+    COLUMN_NAME_SQUAD,
+    COLUMN_NAME_SQUAD2
+)
+from src.data.data_loaders import JiraData, JiraDataLoader
+from src.data.data_filters import JiraDataFilter, JiraDataFilterService
+from src.data.data_dora import JiraDataDoraMetricsFilter
+from src.data.data_stage_metrics import JiraDataStageMetricsService
+
+KEY_COLUMNS = ['project', 'squad', 'sprint']
+STAGE_AVERAGE_COLUMNS = ['Stage', 'Days', 'Ticket IDs']
+THRESHOLD_VIOLATION_COLUMNS = [COLUMN_NAME_ID, COLUMN_NAME_NAME, COLUMN_NAME_TYPE, COLUMN_NAME_PRIORITY, COLUMN_NAME_STAGE,
+                               COLUMN_NAME_ASSIGNEE_NAME, COLUMN_NAME_STORY_POINTS, 'exceeding_stages', 'threshold_ratio']
+DORA_METRIC_COLUMNS = ['start_date', 'end_date', 'ticket_count', 'lead_time_for_changes', 'deployment_frequency',
+                       'change_failure_rate', 'mean_time_to_recovery']
+
+def _concat_frames(frames: list[pd.DataFrame], column_names: list[str]) -> pd.DataFrame:
+    # Key columns first, empty frames are left out as their columns have no dtype
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=KEY_COLUMNS + column_names)
+    return pd.concat(frames, ignore_index=True)[KEY_COLUMNS + column_names]
+
+class JiraDataBatchMetricsResults:
+    """Metrics of project, squad and sprint combinations, one row per combination and stage, violation or combination."""
+    @property
+    def stage_averages(self) -> pd.DataFrame:
+        return self._stage_averages
+
+    @property
+    def threshold_violations(self) -> pd.DataFrame:
+        return self._threshold_violations
+
+    @property
+    def dora_metrics(self) -> pd.DataFrame:
+        return self._dora_metrics
+
+    def __init__(self, stage_averages: pd.DataFrame, threshold_violations: pd.DataFrame, dora_metrics: pd.DataFrame):
+        self._stage_averages = stage_averages
+        self._threshold_violations = threshold_violations
+        self._dora_metrics = dora_metrics
+
+    @classmethod
+    def concat(cls, results: list['JiraDataBatchMetricsResults']) -> 'JiraDataBatchMetricsResults':
+        return cls(
+            _concat_frames([result.stage_averages for result in results], STAGE_AVERAGE_COLUMNS),
+            _concat_frames([result.threshold_violations for result in results], THRESHOLD_VIOLATION_COLUMNS),
+            _concat_frames([result.dora_metrics for result in results], DORA_METRIC_COLUMNS)
+        )
+
+class JiraDataBatchMetrics:
+    """
+    Stage averages, threshold violations and DORA metrics of every project, squad and sprint combination.
+
+    Each sprint is computed on its own so sprints can be spread over processes. Within a sprint, every project
+    with tickets in the sprint is computed for all its squads (squad None) and for each of its squads.
+    """
+    def __init__(self, jira_data: JiraData):
+        self.__jira_data = jira_data
+        # Built once, processes forked afterwards share it
+        self.__dora_cube = jira_data.get_dora_cube()
+
+    def get_sprint_names(self, projects: list[str] = None) -> list[str]:
+        """Sprints with tickets of the given projects, or of any project, most recent first."""
+        jira_data_filter_result = JiraDataFilterService(self.__jira_data).filter_tickets(
+            self.__jira_data.get_tickets(), JiraDataFilter(projects=projects), facets=['sprints'])
+        return jira_data_filter_result.sprints
+
+    def __get_combinations(self, sprint_tickets: pd.DataFrame, projects: list[str]) -> list[tuple[str, str]]:
+        combinations = []
+        for project in sorted(sprint_tickets[COLUMN_NAME_PROJECT].dropna().unique()):
+            if projects and project not in projects:
+                continue
+
+            project_tickets = sprint_tickets[sprint_tickets[COLUMN_NAME_PROJECT] == project]
+            squads = set()
+            for column_name in (COLUMN_NAME_SQUAD, COLUMN_NAME_SQUAD2):
+                if column_name in project_tickets.columns:
+                    squads.update(project_tickets[column_name].dropna().unique())
+            combinations.append((project, None))
+            combinations.extend((project, squad) for squad in sorted(squads))
+
+        return combinations
+
+    def get_sprint_metrics(self, sprint_name: str, projects: list[str] = None) -> JiraDataBatchMetricsResults:
+        """
+        Metrics of every project and squad combination of a sprint.
+
+        Args:
+            sprint_name (str): Name of the sprint
+            projects (list[str]): Only the combinations of these projects, all projects when not set
+
+        Returns:
+            JiraDataBatchMetricsResults: Metrics with the project, squad and sprint of every row
+        """
+        sprint_index = self.__jira_data.get_sprint_index()
+        sprint_tickets = self.__jira_data.get_tickets().loc[sprint_index.get_ticket_rows([sprint_name])]
+        sprint_start_date, sprint_end_date = sprint_index.get_sprint_date_range(sprint_name)
+        jira_data_filter_service = JiraDataFilterService(self.__jira_data)
+        jira_data_stage_metrics_service = JiraDataStageMetricsService(self.__jira_data)
+
+        stage_averages = []
+        threshold_violations = []
+        dora_metrics = []
+        for project, squad in self.__get_combinations(sprint_tickets, projects):
+            keys = {'project': project, 'squad': squad, 'sprint': sprint_name}
+            filter = JiraDataFilter(projects=[project], squads=[squad], sprints=[sprint_name])
+            tickets = jira_data_filter_service.filter_tickets(self.__jira_data.get_tickets(), filter, facets=[]).tickets
+
+            stage_averages.append(jira_data_stage_metrics_service.get_avg_days(sprint_name, filter)[STAGE_AVERAGE_COLUMNS]
+                                  .assign(**keys))
+            threshold_violations.append(jira_data_stage_metrics_service.get_threshold_violations(tickets, sprint_name)
+                                        [THRESHOLD_VIOLATION_COLUMNS].assign(**keys))
+
+            # DORA metrics of the tickets created during the sprint, sprints without dates have none
+            if sprint_start_date is not None and sprint_end_date is not None:
+                results = self.__dora_cube.get_metrics(JiraDataDoraMetricsFilter(
+                    projects=[project], squads=[squad] if squad is not None else None,
+                    start_date=sprint_start_date, end_date=sprint_end_date))
+                dora_metrics.append({
+                    **keys,
+                    'start_date': sprint_start_date,
+                    'end_date': sprint_end_date,
+                    'ticket_count': len(tickets),
+                    'lead_time_for_changes': results.lead_time_for_changes.value,
+                    'deployment_frequency': results.deployment_frequency.value,
+                    'change_failure_rate': results.change_failure_rate.value,
+                    'mean_time_to_recovery': results.mean_time_to_recovery.value
+                })
+
+        return JiraDataBatchMetricsResults(
+            _concat_frames(stage_averages, STAGE_AVERAGE_COLUMNS),
+            _concat_frames(threshold_violations, THRESHOLD_VIOLATION_COLUMNS),
+            pd.DataFrame(dora_metrics, columns=KEY_COLUMNS + DORA_METRIC_COLUMNS)
+        )
+
+# Batch metrics of the data loaded by the process, set before the process pool forks so workers don't load the data again
+_batch_metrics: JiraDataBatchMetrics = None
+
+def _init_batch_metrics_worker(csv_filepath: str):
+    global _batch_metrics
+    if _batch_metrics is None:
+        _batch_metrics = JiraDataBatchMetrics(JiraDataLoader.from_settings().load_data(csv_filepath))
+
+def _get_sprint_metrics(sprint_name: str, projects: list[str]) -> JiraDataBatchMetricsResults:
+    return _batch_metrics.get_sprint_metrics(sprint_name, projects)
+
+def get_batch_metrics(csv_filepath: str, projects: list[str] = None, max_workers: int = None) -> JiraDataBatchMetricsResults:
+    """
+    Metrics of every project, squad and sprint combination of the CSV, the sprints are spread over a process pool.
+
+    Args:
+        csv_filepath (str): Path of the CSV
+        projects (list[str]): Only the combinations of these projects, all projects when not set
+        max_workers (int): Number of processes, the number of CPUs when not set, 1 computes the sprints in this process
+
+    Returns:
+        JiraDataBatchMetricsResults: Metrics of all combinations, ordered by sprint (most recent first), project and squad
+    """
+    global _batch_metrics
+    _batch_metrics = JiraDataBatchMetrics(JiraDataLoader.from_settings().load_data(csv_filepath))
+    try:
+        sprint_names = _batch_metrics.get_sprint_names(projects)
+        print(f"Computing metrics of {len(sprint_names)} sprints")
+        if max_workers == 1 or len(sprint_names) <= 1:
+            results = [_get_sprint_metrics(sprint_name, projects) for sprint_name in sprint_names]
+        else:
+            # Processes that aren't forked load the data once in the initializer
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_batch_metrics_worker, initargs=(csv_filepath,)) as executor:
+                results = list(executor.map(_get_sprint_metrics, sprint_names, itertools.repeat(projects)))
+
+        return JiraDataBatchMetricsResults.concat(results)
+    finally:
+        _batch_metrics = None
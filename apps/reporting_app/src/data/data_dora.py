@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from src.config.constants import (
@@ -17,11 +18,12 @@ from src.config.constants import (
     COLUMN_NAME_SQUAD,
     COLUMN_NAME_SQUAD2,
     STAGE_NAME_FINAL_STAGES,
-    COLUMN_NAME_ID
+    COLUMN_NAME_ID,
+    COLUMN_NAME_CALCULATED_SPRINT
 )
 from src.utils.stage_utils import StageUtils
-from src.utils.string_utils import split_string_array
-from src.utils.sprint_utils import get_sprint_date_range
+from src.data.data_sprints import JiraDataSprintIndex
+from src.data.data_memberships import JiraDataMembership
 class JiraDataDoraMetricsResult:
     _category: str
     _value: str
@@ -76,17 +78,70 @@ class JiraDataDoraMetricsFilter:
         self._start_date = start_date
         self._end_date = end_date
 
+class JiraDataDoraMetricsResults:
+    """The four DORA metrics of the same filtered tickets."""
+    _lead_time_for_changes: JiraDataDoraMetricsResult
+    _deployment_frequency: JiraDataDoraMetricsResult
+    _change_failure_rate: JiraDataDoraMetricsResult
+    _mean_time_to_recovery: JiraDataDoraMetricsResult
+
+    @property
+    def lead_time_for_changes(self) -> JiraDataDoraMetricsResult:
+        return self._lead_time_for_changes
+
+    @property
+    def deployment_frequency(self) -> JiraDataDoraMetricsResult:
+        return self._deployment_frequency
+
+    @property
+    def change_failure_rate(self) -> JiraDataDoraMetricsResult:
+        return self._change_failure_rate
+
+    @property
+    def mean_time_to_recovery(self) -> JiraDataDoraMetricsResult:
+        return self._mean_time_to_recovery
+
+    def __init__(self, lead_time_for_changes: JiraDataDoraMetricsResult, deployment_frequency: JiraDataDoraMetricsResult,
+                 change_failure_rate: JiraDataDoraMetricsResult, mean_time_to_recovery: JiraDataDoraMetricsResult):
+        self._lead_time_for_changes = lead_time_for_changes
+        self._deployment_frequency = deployment_frequency
+        self._change_failure_rate = change_failure_rate
+        self._mean_time_to_recovery = mean_time_to_recovery
+
 class JiraDataDoraMetrics:
     _tickets: pd.DataFrame
 
-    def __init__(self, tickets: pd.DataFrame):
+    # we assume that all tickets that has fix version and is set to done has been deployed to prod
+    DONE_STAGE_NAMES = [
+        STAGE_NAME_DONE,
+        STAGE_NAME_CLOSED,
+        STAGE_NAME_BUG_FIXED,
+        STAGE_NAME_DEPLOYED_TO_PROD,
+        STAGE_NAME_IN_PRODUCTION
+    ]
+    # we assume tickets that are set with priority P1 or P2 are incident tickets
+    INCIDENT_PRIORITIES = ['P1', 'P2']
+
+    def __init__(self, tickets: pd.DataFrame, sprint_index: JiraDataSprintIndex = None, sprint_memberships: JiraDataMembership = None):
         self._tickets = tickets
+        # Sprint dates come from the precomputed sprint index of the dataset when given, otherwise they are built from the tickets
+        self.__sprint_index = sprint_index
+        self.__sprint_memberships = sprint_memberships
+
+    def __get_sprint_index(self) -> JiraDataSprintIndex:
+        if self.__sprint_index is None:
+            self.__sprint_index = JiraDataSprintIndex(self._tickets)
+        return self.__sprint_index
 
-    def __get_avg_duration_timespent_in_progress(self, tickets: pd.DataFrame) -> float:
+    def __get_sprint_memberships(self) -> JiraDataMembership:
+        if self.__sprint_memberships is None:
+            self.__sprint_memberships = JiraDataMembership(self._tickets, COLUMN_NAME_CALCULATED_SPRINT)
+        return self.__sprint_memberships
+
+    def __get_avg_duration_timespent_in_progress(self, tickets: pd.DataFrame, mask: np.ndarray = None) -> float:
         if(tickets.empty):
             return 0
 
-        tickets = tickets[tickets[COLUMN_NAME_STAGE].isin(STAGE_NAME_FINAL_STAGES)]
         valid_stage_names = [stage for stage in ALL_STAGE_NAMES if stage not in STAGE_NAME_IGNORE]
         valid_stage_names = [StageUtils.to_stage_duration_days_column_name(stage) for stage in valid_stage_names]
 
@@ -96,119 +151,129 @@ class JiraDataDoraMetrics:
         if not existing_columns:
             return 0
 
-        # Filter tickets that have at least one valid stage with duration > 0
-        valid_tickets = tickets[tickets[existing_columns].gt(0).any(axis=1)]
+        # Tickets in a final stage that have at least one valid stage with duration > 0
+        valid_mask = tickets[COLUMN_NAME_STAGE].isin(STAGE_NAME_FINAL_STAGES).to_numpy() & tickets[existing_columns].gt(0).any(axis=1).to_numpy()
+        if mask is not None:
+            valid_mask &= mask
+        valid_tickets = tickets.loc[valid_mask, existing_columns]
 
         if valid_tickets.empty:
             return 0
 
         # Sum the values of all valid stage duration columns for valid tickets
-        total_duration = valid_tickets[existing_columns].sum().sum()
+        total_duration = valid_tickets.sum().sum()
         average_duration = total_duration / len(valid_tickets)
 
         return average_duration
 
     def __get_filtered_tickets(self, filter: JiraDataDoraMetricsFilter) -> pd.DataFrame:
+        # Combined into one mask, the tickets given to the engine are left untouched
+        tickets = self._tickets
         # we are only interested in tickets that are assigned to a sprint
-        self._tickets = self._tickets[self._tickets[COLUMN_NAME_SPRINT].notna()]
+        mask = tickets[COLUMN_NAME_SPRINT].notna()
 
         if filter.projects:
-            self._tickets = self._tickets[self._tickets[COLUMN_NAME_PROJECT].isin(filter.projects)]
+            mask &= tickets[COLUMN_NAME_PROJECT].isin(filter.projects)
 
         if filter.squads:
-            if COLUMN_NAME_SQUAD in self._tickets.columns and COLUMN_NAME_SQUAD2 in self._tickets.columns:
-                self._tickets = self._tickets[self._tickets[COLUMN_NAME_SQUAD].isin(filter.squads) | self._tickets[COLUMN_NAME_SQUAD2].isin(filter.squads)]
-            elif COLUMN_NAME_SQUAD in self._tickets.columns:
-                self._tickets = self._tickets[self._tickets[COLUMN_NAME_SQUAD].isin(filter.squads)]
-            elif COLUMN_NAME_SQUAD2 in self._tickets.columns:
-                self._tickets = self._tickets[self._tickets[COLUMN_NAME_SQUAD2].isin(filter.squads)]
+            if COLUMN_NAME_SQUAD in tickets.columns and COLUMN_NAME_SQUAD2 in tickets.columns:
+                mask &= tickets[COLUMN_NAME_SQUAD].isin(filter.squads) | tickets[COLUMN_NAME_SQUAD2].isin(filter.squads)
+            elif COLUMN_NAME_SQUAD in tickets.columns:
+                mask &= tickets[COLUMN_NAME_SQUAD].isin(filter.squads)
+            elif COLUMN_NAME_SQUAD2 in tickets.columns:
+                mask &= tickets[COLUMN_NAME_SQUAD2].isin(filter.squads)
 
         if filter.start_date:
-            self._tickets = self._tickets[self._tickets[COLUMN_NAME_CREATED_DATE] >= filter.start_date]
+            mask &= tickets[COLUMN_NAME_CREATED_DATE] >= filter.start_date
 
         if filter.end_date:
-            self._tickets = self._tickets[self._tickets[COLUMN_NAME_CREATED_DATE] <= filter.end_date]
+            mask &= tickets[COLUMN_NAME_CREATED_DATE] <= filter.end_date
 
-        return self._tickets
+        return tickets[mask]
 
-    def get_lead_time_for_changes(self, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResult:
-        filtered_tickets = self.__get_filtered_tickets(filter)
+    def __get_sprints_date_range(self, tickets: pd.DataFrame) -> tuple[pd.Timestamp, pd.Timestamp]:
+        # Oldest sprint start date and most recent sprint end date of the sprints of the tickets
+        sprint_index = self.__get_sprint_index()
+        start_date = None
+        end_date = None
+        for sprint_name in self.__get_sprint_memberships().get_values(tickets.index.to_numpy()):
+            sprint_start_date, sprint_end_date = sprint_index.get_sprint_date_range(sprint_name)
+
+            if sprint_start_date is not None and (start_date is None or sprint_start_date < start_date):
+                start_date = sprint_start_date
+
+            if sprint_end_date is not None and (end_date is None or sprint_end_date > end_date):
+                end_date = sprint_end_date
+
+        return start_date, end_date
+
+    def __get_lead_time_for_changes(self, filtered_tickets: pd.DataFrame) -> JiraDataDoraMetricsResult:
         average_duration = self.__get_avg_duration_timespent_in_progress(filtered_tickets)
 
         return JiraDataDoraMetricsResult(category='Lead Time for Changes', value=average_duration)
 
-    def get_deployment_frequency(self, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResult:
-        filtered_tickets = self.__get_filtered_tickets(filter)
-        # we assume that all tickets that has fix version and is set to done has been deployed to prod
-        done_stage_names = [
-            STAGE_NAME_DONE,
-            STAGE_NAME_CLOSED,
-            STAGE_NAME_BUG_FIXED,
-            STAGE_NAME_DEPLOYED_TO_PROD,
-            STAGE_NAME_IN_PRODUCTION
-        ]
-        tickets_deployed_to_prod = filtered_tickets[
-            (filtered_tickets[COLUMN_NAME_FIX_VERSIONS].notna()) &
-            (filtered_tickets[COLUMN_NAME_STAGE].isin(done_stage_names))
-        ]
-        total_tickets_deployed_to_prod = len(tickets_deployed_to_prod)
+    def __get_deployment_frequency(self, filtered_tickets: pd.DataFrame, deployed_mask: np.ndarray, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResult:
+        total_tickets_deployed_to_prod = int((deployed_mask & filtered_tickets[COLUMN_NAME_STAGE].isin(self.DONE_STAGE_NAMES).to_numpy()).sum())
 
         start_date = filter.start_date
         end_date = filter.end_date
         if filter.start_date is None or filter.end_date is None:
-            # Get unique sprints
-            sprint_set = set()
-            for sprint_str in filtered_tickets[COLUMN_NAME_SPRINT].dropna().unique():
-                sprints = split_string_array(sprint_str, '"-"')
-                sprint_set.update(sprint.strip() for sprint in sprints)
-
-            # Get the oldest sprint start date and most recent end date from the sprint set
-            for sprint in sprint_set:
-                # Get one ticket from this sprint to get its dates
-                sprint_tickets = filtered_tickets[filtered_tickets[COLUMN_NAME_SPRINT].str.contains(sprint, na=False)]
-                if not sprint_tickets.empty:
-                    sprint_ticket = sprint_tickets.iloc[0]
-                    # Convert the Series to a DataFrame with a single row
-                    sprint_ticket_df = sprint_ticket.to_frame().T
-                    sprint_start_date, sprint_end_date = get_sprint_date_range(sprint_ticket_df, sprint)
-
-                    if sprint_start_date and not pd.isna(sprint_start_date):
-                        # Initialize start_date if not set, otherwise take the earlier date
-                        if start_date is None or sprint_start_date < start_date:
-                            start_date = sprint_start_date
-
-                    if sprint_end_date and not pd.isna(sprint_end_date):
-                        # Initialize end_date if not set, otherwise take the later date
-                        if end_date is None or sprint_end_date > end_date:
-                            end_date = sprint_end_date
+            sprints_start_date, sprints_end_date = self.__get_sprints_date_range(filtered_tickets)
+            # Only fills in the dates the filter didn't set, taking the earlier start and the later end
+            if sprints_start_date is not None and (start_date is None or sprints_start_date < start_date):
+                start_date = sprints_start_date
+            if sprints_end_date is not None and (end_date is None or sprints_end_date > end_date):
+                end_date = sprints_end_date
 
         total_working_days = len(pd.date_range(start=start_date, end=end_date, freq='B'))
         deployment_frequency = total_tickets_deployed_to_prod / total_working_days if total_working_days > 0 else 0
 
         return JiraDataDoraMetricsResult(category='Deployment Frequency', value=deployment_frequency)
 
-    def get_change_failure_rate(self, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResult:
-        filtered_tickets = self.__get_filtered_tickets(filter)
-        # we assume that all tickets that has fix version has been deployed to prod
-        ticket_deployed_to_prod = filtered_tickets[filtered_tickets[COLUMN_NAME_FIX_VERSIONS].notna()]
-        # we assume tickets that are set with priority P1 or P2 are incident tickets
-        incident_tickets = filtered_tickets[
-            (filtered_tickets[COLUMN_NAME_FIX_VERSIONS].notna()) &
-            (filtered_tickets[COLUMN_NAME_PRIORITY].isin(['P1', 'P2']))
-        ]
-        change_failure_rate = (len(incident_tickets) / len(ticket_deployed_to_prod)) * 100 if len(ticket_deployed_to_prod) > 0 else 0
+    def __get_change_failure_rate(self, deployed_mask: np.ndarray, incident_mask: np.ndarray) -> JiraDataDoraMetricsResult:
+        total_tickets_deployed_to_prod = int(deployed_mask.sum())
+        change_failure_rate = (int(incident_mask.sum()) / total_tickets_deployed_to_prod) * 100 if total_tickets_deployed_to_prod > 0 else 0
 
         return JiraDataDoraMetricsResult(category='Change Failure Rate', value=change_failure_rate)
 
-    def get_mean_time_to_recovery(self, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResult:
+    def __get_mean_time_to_recovery(self, filtered_tickets: pd.DataFrame, incident_mask: np.ndarray) -> JiraDataDoraMetricsResult:
+        # get average time spent to recover from an incident
+        average_duration = self.__get_avg_duration_timespent_in_progress(filtered_tickets, incident_mask) if incident_mask.any() else 0
+
+        return JiraDataDoraMetricsResult(category='Mean Time to Recovery', value=average_duration)
+
+    def __get_deployed_mask(self, filtered_tickets: pd.DataFrame) -> np.ndarray:
+        # we assume that all tickets that has fix version has been deployed to prod
+        return filtered_tickets[COLUMN_NAME_FIX_VERSIONS].notna().to_numpy()
+
+    def __get_incident_mask(self, filtered_tickets: pd.DataFrame, deployed_mask: np.ndarray) -> np.ndarray:
+        return deployed_mask & filtered_tickets[COLUMN_NAME_PRIORITY].isin(self.INCIDENT_PRIORITIES).to_numpy()
+
+    def get_metrics(self, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResults:
+        """All four DORA metrics, from a single filtering of the tickets and the masks shared between the metrics."""
         filtered_tickets = self.__get_filtered_tickets(filter)
-        # we assume tickets that are set with priority P1 or P2 are incident tickets
-        incident_tickets = filtered_tickets[
-            (filtered_tickets[COLUMN_NAME_FIX_VERSIONS].notna()) &
-            (filtered_tickets[COLUMN_NAME_PRIORITY].isin(['P1', 'P2']))
-        ]
+        deployed_mask = self.__get_deployed_mask(filtered_tickets)
+        incident_mask = self.__get_incident_mask(filtered_tickets, deployed_mask)
 
-        # get average time spent to recover from an incident
-        average_duration = self.__get_avg_duration_timespent_in_progress(incident_tickets)
+        return JiraDataDoraMetricsResults(
+            lead_time_for_changes=self.__get_lead_time_for_changes(filtered_tickets),
+            deployment_frequency=self.__get_deployment_frequency(filtered_tickets, deployed_mask, filter),
+            change_failure_rate=self.__get_change_failure_rate(deployed_mask, incident_mask),
+            mean_time_to_recovery=self.__get_mean_time_to_recovery(filtered_tickets, incident_mask)
+        )
 
-        return JiraDataDoraMetricsResult(category='Mean Time to Recovery', value=average_duration)
\ No newline at end of file
+    def get_lead_time_for_changes(self, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResult:
+        return self.__get_lead_time_for_changes(self.__get_filtered_tickets(filter))
+
+    def get_deployment_frequency(self, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResult:
+        filtered_tickets = self.__get_filtered_tickets(filter)
+        return self.__get_deployment_frequency(filtered_tickets, self.__get_deployed_mask(filtered_tickets), filter)
+
+    def get_change_failure_rate(self, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResult:
+        filtered_tickets = self.__get_filtered_tickets(filter)
+        deployed_mask = self.__get_deployed_mask(filtered_tickets)
+        return self.__get_change_failure_rate(deployed_mask, self.__get_incident_mask(filtered_tickets, deployed_mask))
+
+    def get_mean_time_to_recovery(self, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResult:
+        filtered_tickets = self.__get_filtered_tickets(filter)
+        return self.__get_mean_time_to_recovery(filtered_tickets, self.__get_incident_mask(filtered_tickets, self.__get_deployed_mask(filtered_tickets)))
@@ -0,0 +1,249 @@
+import numpy as np
+import pandas as pd
+from src.config.constants import (
+    STAGE_NAME_IGNORE,
+    ALL_STAGE_NAMES,
+    STAGE_NAME_FINAL_STAGES,
+    COLUMN_NAME_PROJECT,
+    COLUMN_NAME_CREATED_DATE,
+    COLUMN_NAME_FIX_VERSIONS,
+    COLUMN_NAME_PRIORITY,
+    COLUMN_NAME_SPRINT,
+    COLUMN_NAME_STAGE,
+    COLUMN_NAME_SQUAD,
+    COLUMN_NAME_SQUAD2
+)
+from src.data.data_dora import JiraDataDoraMetrics, JiraDataDoraMetricsFilter, JiraDataDoraMetricsResult, JiraDataDoraMetricsResults
+from src.data.data_sprints import JiraDataSprintIndex
+from src.data.data_memberships import JiraDataMembership
+from src.utils.stage_utils import StageUtils
+
+class JiraDataDoraCube:
+    """
+    DORA measures of the tickets pre-aggregated by project, squad and ISO week of their creation date.
+
+    A query sums the cells of the weeks its date range fully covers and only goes through the tickets of
+    the partially covered weeks at either end, so it gives the same metrics as JiraDataDoraMetrics
+    without filtering all tickets.
+    """
+    KEY_COLUMNS = ['project', 'squad', 'squad2', 'week']
+    SUM_COLUMNS = ['ticket_count', 'deployed_count', 'deployed_done_count', 'incident_count',
+                   'lead_time_days', 'lead_time_count', 'incident_lead_time_days', 'incident_lead_time_count']
+    WEEK = pd.Timedelta(days=7)
+
+    def __init__(self, tickets: pd.DataFrame, sprint_index: JiraDataSprintIndex, sprint_memberships: JiraDataMembership):
+        self.__squad_columns = [column_name for column_name in (COLUMN_NAME_SQUAD, COLUMN_NAME_SQUAD2) if column_name in tickets.columns]
+        self.__set_measures(self.__get_measures(tickets, sprint_index, sprint_memberships))
+        self.__cells = self.__aggregate(self.__measures)
+
+    def __set_measures(self, measures: pd.DataFrame):
+        # Ticket measures ordered by creation date, so the tickets of a date range are a slice of them
+        self.__measures = measures.sort_values('created', kind='stable')
+        self.__created_dates = self.__measures['created'].values
+
+    def __get_measures(self, tickets: pd.DataFrame, sprint_index: JiraDataSprintIndex, sprint_memberships: JiraDataMembership) -> pd.DataFrame:
+        # One row of measures per ticket, by row id, with the same rules as JiraDataDoraMetrics
+        tickets = tickets[tickets[COLUMN_NAME_SPRINT].notna()]
+        created_dates = tickets[COLUMN_NAME_CREATED_DATE]
+        deployed = tickets[COLUMN_NAME_FIX_VERSIONS].notna().to_numpy()
+        deployed_done = deployed & tickets[COLUMN_NAME_STAGE].isin(JiraDataDoraMetrics.DONE_STAGE_NAMES).to_numpy()
+        incident = deployed & tickets[COLUMN_NAME_PRIORITY].isin(JiraDataDoraMetrics.INCIDENT_PRIORITIES).to_numpy()
+
+        valid_stage_names = [stage for stage in ALL_STAGE_NAMES if stage not in STAGE_NAME_IGNORE]
+        duration_columns = [column_name for column_name in (StageUtils.to_stage_duration_days_column_name(stage) for stage in valid_stage_names)
+                            if column_name in tickets.columns]
+        durations = tickets[duration_columns]
+        lead_time_valid = tickets[COLUMN_NAME_STAGE].isin(STAGE_NAME_FINAL_STAGES).to_numpy() & durations.gt(0).any(axis=1).to_numpy()
+        lead_time_days = np.where(lead_time_valid, durations.sum(axis=1).to_numpy(dtype=float), 0.0)
+
+        sprint_start_dates, sprint_end_dates = self.__get_sprint_date_ranges(tickets.index, sprint_index, sprint_memberships)
+
+        return pd.DataFrame({
+            'project': tickets[COLUMN_NAME_PROJECT].astype(object).to_numpy(),
+            'squad': tickets[COLUMN_NAME_SQUAD].astype(object).to_numpy() if COLUMN_NAME_SQUAD in tickets.columns else None,
+            'squad2': tickets[COLUMN_NAME_SQUAD2].astype(object).to_numpy() if COLUMN_NAME_SQUAD2 in tickets.columns else None,
+            'week': created_dates.dt.floor('D') - pd.to_timedelta(created_dates.dt.weekday, unit='D'),
+            'created': created_dates,
+            'ticket_count': 1,
+            'deployed_count': deployed.astype(np.int64),
+            'deployed_done_count': deployed_done.astype(np.int64),
+            'incident_count': incident.astype(np.int64),
+            'lead_time_days': lead_time_days,
+            'lead_time_count': lead_time_valid.astype(np.int64),
+            'incident_lead_time_days': np.where(incident, lead_time_days, 0.0),
+            'incident_lead_time_count': (lead_time_valid & incident).astype(np.int64),
+            'sprint_start': sprint_start_dates,
+            'sprint_end': sprint_end_dates
+        }, index=tickets.index)
+
+    def __get_sprint_date_ranges(self, rows: pd.Index, sprint_index: JiraDataSprintIndex, sprint_memberships: JiraDataMembership) -> tuple[pd.Series, pd.Series]:
+        # Oldest sprint start date and most recent sprint end date over the sprints of every ticket
+        sprint_names = sprint_index.get_sprint_names()
+        sprint_start_dates = pd.Series(pd.to_datetime([sprint_index.get_sprint(name).start_date for name in sprint_names], utc=True), index=sprint_names)
+        sprint_end_dates = pd.Series(pd.to_datetime([sprint_index.get_sprint(name).end_date for name in sprint_names], utc=True), index=sprint_names)
+
+        ticket_sprints = sprint_memberships.to_frame()
+        ticket_sprints = ticket_sprints[ticket_sprints['row'].isin(rows)]
+        sprint_names = ticket_sprints['value'].astype(object)
+        date_ranges = pd.DataFrame({
+            'row': ticket_sprints['row'].to_numpy(),
+            'start': sprint_names.map(sprint_start_dates).to_numpy(),
+            'end': sprint_names.map(sprint_end_dates).to_numpy()
+        }).groupby('row').agg(start=('start', 'min'), end=('end', 'max')).reindex(rows)
+
+        return pd.to_datetime(date_ranges['start'], utc=True), pd.to_datetime(date_ranges['end'], utc=True)
+
+    def __aggregate(self, measures: pd.DataFrame) -> pd.DataFrame:
+        aggregations = {column_name: (column_name, 'sum') for column_name in self.SUM_COLUMNS}
+        aggregations['sprint_start'] = ('sprint_start', 'min')
+        aggregations['sprint_end'] = ('sprint_end', 'max')
+        cells = measures.groupby(self.KEY_COLUMNS, dropna=False, sort=False).agg(**aggregations).reset_index()
+        cells['key'] = self.__get_keys(cells)
+        return cells
+
+    def __get_keys(self, frame: pd.DataFrame) -> np.ndarray:
+        return pd.util.hash_pandas_object(frame[self.KEY_COLUMNS], index=False).to_numpy()
+
+    def merge(self, tickets: pd.DataFrame, sprint_index: JiraDataSprintIndex, sprint_memberships: JiraDataMembership,
+              row_mapping: np.ndarray) -> 'JiraDataDoraCube':
+        """
+        Cube of merged tickets, only aggregating the cells again that have tickets with different measures.
+
+        Args:
+            tickets (pd.DataFrame): Merged tickets
+            sprint_index (JiraDataSprintIndex): Sprint index of the merged tickets
+            sprint_memberships (JiraDataMembership): Sprint memberships of the merged tickets
+            row_mapping (np.ndarray): Row id in the merged tickets of every row id of the tickets of this cube, -1 for tickets that were removed or changed
+        """
+        dora_cube = JiraDataDoraCube.__new__(JiraDataDoraCube)
+        dora_cube.__squad_columns = [column_name for column_name in (COLUMN_NAME_SQUAD, COLUMN_NAME_SQUAD2) if column_name in tickets.columns]
+        measures = dora_cube.__get_measures(tickets, sprint_index, sprint_memberships)
+        dora_cube.__set_measures(measures)
+
+        previous_measures = self.__measures
+        rows = row_mapping[previous_measures.index.to_numpy()]
+        kept = (rows >= 0) & np.isin(rows, measures.index.to_numpy())
+        identical = np.zeros(len(previous_measures), dtype=bool)
+        if kept.any():
+            previous_values = previous_measures[kept]
+            values = measures.loc[rows[kept], previous_measures.columns]
+            identical[kept] = np.all([
+                (previous_values[column_name].to_numpy() == values[column_name].to_numpy()) |
+                (pd.isna(previous_values[column_name]).to_numpy() & pd.isna(values[column_name]).to_numpy())
+                for column_name in previous_measures.columns], axis=0)
+
+        # Cells of tickets that were removed, added or have other measures, both where they were and where they are now
+        identical_rows = rows[identical]
+        changed_keys = np.union1d(self.__get_keys(previous_measures[~identical]),
+                                  self.__get_keys(measures[~measures.index.isin(identical_rows)]))
+        changed_measures = measures[np.isin(self.__get_keys(measures), changed_keys)]
+        dora_cube.__cells = pd.concat([self.__cells[~np.isin(self.__cells['key'].to_numpy(), changed_keys)],
+                                       self.__aggregate(changed_measures)], ignore_index=True)
+        return dora_cube
+
+    def __get_key_mask(self, frame: pd.DataFrame, filter: JiraDataDoraMetricsFilter) -> np.ndarray:
+        mask = np.ones(len(frame), dtype=bool)
+        if filter.projects:
+            mask &= frame['project'].isin(filter.projects).to_numpy()
+
+        if filter.squads and self.__squad_columns:
+            squad_mask = np.zeros(len(frame), dtype=bool)
+            if COLUMN_NAME_SQUAD in self.__squad_columns:
+                squad_mask |= frame['squad'].isin(filter.squads).to_numpy()
+            if COLUMN_NAME_SQUAD2 in self.__squad_columns:
+                squad_mask |= frame['squad2'].isin(filter.squads).to_numpy()
+            mask &= squad_mask
+
+        return mask
+
+    def __get_week_start(self, date) -> pd.Timestamp:
+        date = pd.Timestamp(date).tz_convert('UTC')
+        return date.floor('D') - pd.Timedelta(days=date.weekday())
+
+    def __get_measures_between(self, start_date, end_date) -> pd.DataFrame:
+        # Tickets created from start_date (inclusive) until end_date (exclusive)
+        start = np.searchsorted(self.__created_dates, np.datetime64(pd.Timestamp(start_date).tz_convert('UTC').tz_localize(None), 'ns'), side='left') \
+            if start_date is not None else 0
+        end = np.searchsorted(self.__created_dates, np.datetime64(pd.Timestamp(end_date).tz_convert('UTC').tz_localize(None), 'ns'), side='left') \
+            if end_date is not None else len(self.__created_dates)
+        return self.__measures.iloc[start:max(start, end)]
+
+    def __select(self, filter: JiraDataDoraMetricsFilter) -> pd.DataFrame:
+        # Cells of the fully covered weeks and the measures of the tickets in the partially covered weeks
+        start_date = filter.start_date
+        end_date = pd.Timestamp(filter.end_date) + pd.Timedelta(1, unit='ns') if filter.end_date else None
+        cells = self.__cells
+        if not start_date and end_date is None:
+            return cells[self.__get_key_mask(cells, filter)]
+
+        first_week = None
+        if start_date:
+            first_week = self.__get_week_start(start_date)
+            if first_week < pd.Timestamp(start_date):
+                first_week += self.WEEK
+        end_week = self.__get_week_start(end_date) if end_date is not None else None
+
+        if first_week is not None and end_week is not None and first_week >= end_week:
+            # No week is fully covered
+            selected = [self.__get_measures_between(start_date, end_date)]
+        else:
+            weeks = cells['week']
+            week_mask = np.ones(len(cells), dtype=bool)
+            if first_week is not None:
+                week_mask &= (weeks >= first_week).to_numpy()
+            if end_week is not None:
+                week_mask &= (weeks < end_week).to_numpy()
+            selected = [cells[week_mask]]
+            if first_week is not None:
+                selected.append(self.__get_measures_between(start_date, first_week))
+            if end_week is not None:
+                selected.append(self.__get_measures_between(end_week, end_date))
+
+        selected = pd.concat([frame[self.KEY_COLUMNS + self.SUM_COLUMNS + ['sprint_start', 'sprint_end']] for frame in selected], ignore_index=True)
+        return selected[self.__get_key_mask(selected, filter)]
+
+    def get_metrics(self, filter: JiraDataDoraMetricsFilter) -> JiraDataDoraMetricsResults:
+        """Same metrics as JiraDataDoraMetrics.get_metrics, summed from the cells of the filter."""
+        selected = self.__select(filter)
+        totals = selected[self.SUM_COLUMNS].sum()
+
+        start_date = filter.start_date
+        end_date = filter.end_date
+        if filter.start_date is None or filter.end_date is None:
+            sprints_start_date = selected['sprint_start'].min()
+            sprints_end_date = selected['sprint_end'].max()
+            if pd.notna(sprints_start_date) and (start_date is None or sprints_start_date < start_date):
+                start_date = sprints_start_date
+            if pd.notna(sprints_end_date) and (end_date is None or sprints_end_date > end_date):
+                end_date = sprints_end_date
+        total_working_days = len(pd.date_range(start=start_date, end=end_date, freq='B'))
+
+        return JiraDataDoraMetricsResults(
+            lead_time_for_changes=JiraDataDoraMetricsResult(
+                category='Lead Time for Changes',
+                value=totals['lead_time_days'] / totals['lead_time_count'] if totals['lead_time_count'] > 0 else 0),
+            deployment_frequency=JiraDataDoraMetricsResult(
+                category='Deployment Frequency',
+                value=totals['deployed_done_count'] / total_working_days if total_working_days > 0 else 0),
+            change_failure_rate=JiraDataDoraMetricsResult(
+                category='Change Failure Rate',
+                value=(totals['incident_count'] / totals['deployed_count']) * 100 if totals['deployed_count'] > 0 else 0),
+            mean_time_to_recovery=JiraDataDoraMetricsResult(
+                category='Mean Time to Recovery',
+                value=totals['incident_lead_time_days'] / totals['incident_lead_time_count'] if totals['incident_lead_time_count'] > 0 else 0)
+        )
+
+    def get_weekly_metrics(self, filter: JiraDataDoraMetricsFilter) -> pd.DataFrame:
+        """
+        DORA metrics of every week with tickets of the filter, for trends.
+
+        Returns:
+            pd.DataFrame: lead time, deployments, change failure rate and time to restore by week, ordered by week
+        """
+        totals = self.__select(filter).groupby('week')[self.SUM_COLUMNS].sum().sort_index()
+        return pd.DataFrame({
+            'lead_time_for_changes': (totals['lead_time_days'] / totals['lead_time_count']).where(totals['lead_time_count'] > 0, 0.0),
+            'deployments': totals['deployed_done_count'],
+            'change_failure_rate': (totals['incident_count'] / totals['deployed_count'] * 100).where(totals['deployed_count'] > 0, 0.0),
+            'mean_time_to_recovery': (totals['incident_lead_time_days'] / totals['incident_lead_time_count']).where(totals['incident_lead_time_count'] > 0, 0.0)
+        }, index=totals.index)
@@ -0,0 +1,62 @@
+import pandas as pd
+from src.data.data_loaders import JiraData
+from src.utils.stage_utils import StageUtils
+from src.utils.cache_utils import LRUCache
+from src.config.app_settings import AppSettings
+
+class JiraDataSprintDurationService:
+    # In-sprint duration frames shared by every service instance, keyed by dataset version and sprint
+    __cache = LRUCache(max_size=AppSettings().SPRINT_DURATION_CACHE_MAX_SIZE)
+
+    def __init__(self, jira_data: JiraData):
+        self.__jira_data = jira_data
+
+    @classmethod
+    def get_cache_stats(cls) -> dict:
+        return cls.__cache.get_stats()
+
+    @classmethod
+    def clear_cache(cls):
+        cls.__cache.clear()
+
+    def __get_carried_over_sprint_durations(self, sprint_name: str) -> pd.DataFrame:
+        # Sprints whose tickets didn't change since the version this dataset was merged into keep their durations
+        changes = self.__jira_data.get_changes()
+        if changes is None or changes.is_sprint_changed(sprint_name):
+            return None
+
+        previous_sprint_durations = JiraDataSprintDurationService.__cache.get((changes.previous_version, sprint_name))
+        if previous_sprint_durations is None:
+            return None
+
+        return previous_sprint_durations.set_axis(changes.row_mapping[previous_sprint_durations.index.to_numpy()])
+
+    def __get_sprint_durations(self, sprint_name: str) -> pd.DataFrame:
+        # Frames of previous dataset versions are left to the LRU eviction so merged versions can carry them over
+        cache_key = (self.__jira_data.version, sprint_name)
+        sprint_durations = JiraDataSprintDurationService.__cache.get(cache_key)
+        if sprint_durations is None:
+            sprint_durations = self.__get_carried_over_sprint_durations(sprint_name)
+            if sprint_durations is None:
+                # Calculated once for every ticket of the sprint, filtered views are a row selection of it
+                sprint_index = self.__jira_data.get_sprint_index()
+                sprint_tickets = self.__jira_data.get_tickets().loc[sprint_index.get_ticket_rows([sprint_name])]
+                sprint_durations = StageUtils.calculate_tickets_duration_in_sprint(sprint_tickets, sprint_name, sprint_index)
+            JiraDataSprintDurationService.__cache.set(cache_key, sprint_durations)
+
+        return sprint_durations
+
+    def get_tickets_duration_in_sprint(self, tickets: pd.DataFrame, sprint_name: str) -> pd.DataFrame:
+        """
+        Same result as StageUtils.calculate_tickets_duration_in_sprint for tickets of the sprint,
+        selected from the in-sprint durations calculated once for the whole sprint.
+
+        Args:
+            tickets (pd.DataFrame): Tickets of the sprint, a subset of the dataset tickets
+            sprint_name (str): Name of the sprint
+
+        Returns:
+            pd.DataFrame: DataFrame with stage metrics for the sprint period, in the order of the given tickets
+        """
+        sprint_durations = self.__get_sprint_durations(sprint_name)
+        return sprint_durations.loc[tickets.index[tickets.index.isin(sprint_durations.index)]]
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+from src.config.constants import (
+    COLUMN_NAME_PROJECT,
+    COLUMN_NAME_SQUAD,
+    COLUMN_NAME_SQUAD2,
+    COLUMN_NAME_TYPE,
+    COLUMN_NAME_ID,
+    COLUMN_NAME_ASSIGNEE_NAME
+)
+from src.data.data_memberships import JiraDataMembership
+
+def _get_offsets(keys: np.ndarray, key_count: int) -> np.ndarray:
+    # Start of every key in keys sorted by key, followed by the end of the last key
+    return np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=key_count))])
+
+def _get_slices(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # Positions of the slices [start, end) one after the other
+    lengths = ends - starts
+    return np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths - starts, lengths)
+
+class JiraDataFacet:
+    """
+    Values of one ticket column, or one list column through its membership table, indexed both ways:
+    the sorted row ids of every value and the values of every row id, as flat arrays with offsets.
+    """
+    __categories: pd.Index
+    __value_rows: np.ndarray
+    __value_offsets: np.ndarray
+    __row_codes: np.ndarray
+    __row_offsets: np.ndarray
+
+    def __init__(self, rows: np.ndarray, values: pd.Categorical, row_count: int):
+        codes = values.codes.astype(np.int64)
+        rows = rows.astype(np.int64)[codes >= 0]
+        codes = codes[codes >= 0]
+        self.__categories = values.categories
+
+        order = np.lexsort((rows, codes))
+        self.__value_rows = rows[order]
+        self.__value_offsets = _get_offsets(codes[order], len(self.__categories))
+
+        order = np.lexsort((codes, rows))
+        self.__row_codes = codes[order]
+        self.__row_offsets = _get_offsets(rows[order], row_count)
+
+    @classmethod
+    def from_column(cls, values: pd.Series) -> 'JiraDataFacet':
+        # Row ids are the index labels, like the ones of the membership tables, not the positions of the values
+        return cls(values.index.to_numpy(), pd.Categorical(values), len(values))
+
+    @classmethod
+    def from_membership(cls, membership: JiraDataMembership, row_count: int) -> 'JiraDataFacet':
+        frame = membership.to_frame()
+        return cls(frame['row'].to_numpy(), frame['value'].array, row_count)
+
+    def __get_codes(self, values: list[str]) -> np.ndarray:
+        codes = self.__categories.get_indexer(values)
+        return np.unique(codes[codes >= 0])
+
+    def get_count(self, values: list[str]) -> int:
+        """Number of (row id, value) pairs with the given values."""
+        codes = self.__get_codes(values)
+        return int((self.__value_offsets[codes + 1] - self.__value_offsets[codes]).sum())
+
+    def get_rows(self, values: list[str]) -> np.ndarray:
+        """Sorted row ids that have any of the given values."""
+        codes = self.__get_codes(values)
+        rows = self.__value_rows[_get_slices(self.__value_offsets[codes], self.__value_offsets[codes + 1])]
+        return rows if len(codes) <= 1 else np.unique(rows)
+
+    def __get_row_codes(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        starts = self.__row_offsets[rows]
+        ends = self.__row_offsets[rows + 1]
+        return self.__row_codes[_get_slices(starts, ends)], ends - starts
+
+    def has_values(self, rows: np.ndarray, values: list[str]) -> np.ndarray:
+        """Whether each of the given row ids has any of the given values."""
+        selected = np.zeros(len(self.__categories), dtype=bool)
+        selected[self.__get_codes(values)] = True
+        row_codes, lengths = self.__get_row_codes(rows)
+
+        has_values = np.zeros(len(rows), dtype=bool)
+        has_values[np.repeat(np.arange(len(rows)), lengths)[selected[row_codes]]] = True
+        return has_values
+
+    def get_values(self, rows: np.ndarray) -> list[str]:
+        """Sorted distinct values of the given row ids."""
+        row_codes, _ = self.__get_row_codes(rows)
+        return self.__categories[np.unique(row_codes)].tolist()
+
+class JiraDataFacetIndex:
+    """
+    Facets of the dataset tickets by the names of the JiraDataFilter fields, e.g. projects or sprints.
+    Row ids are the index labels of the tickets, their positions in any order such as a default RangeIndex.
+
+    A facet can span several columns, a ticket has a squad when it is in either squad column. Filtering
+    starts from the rows of the most selective facet and only checks the values of those rows for the
+    other facets, and facet values are read for the selected rows only, so the cost of filtering and
+    listing facets grows with the number of selected tickets rather than with the dataset.
+    """
+    COLUMN_FACETS = {
+        'projects': [COLUMN_NAME_PROJECT],
+        'squads': [COLUMN_NAME_SQUAD, COLUMN_NAME_SQUAD2],
+        'ticket_types': [COLUMN_NAME_TYPE],
+        'ticketIds': [COLUMN_NAME_ID],
+        'assignees': [COLUMN_NAME_ASSIGNEE_NAME]
+    }
+
+    def __init__(self, tickets: pd.DataFrame, sprint_memberships: JiraDataMembership, component_memberships: JiraDataMembership):
+        self.__row_count = len(tickets)
+        self.__facets = {
+            name: [JiraDataFacet.from_column(tickets[column_name]) for column_name in column_names if column_name in tickets.columns]
+            for name, column_names in self.COLUMN_FACETS.items()
+        }
+        self.__facets['sprints'] = [JiraDataFacet.from_membership(sprint_memberships, self.__row_count)]
+        self.__facets['components'] = [JiraDataFacet.from_membership(component_memberships, self.__row_count)]
+
+    def get_rows(self, selections: dict[str, list[str]]) -> np.ndarray:
+        """
+        Sorted row ids of the tickets that have any of the selected values of every selected facet.
+
+        Args:
+            selections (dict[str, list[str]]): Selected values by facet name, facets without columns are ignored
+        """
+        selections = {name: values for name, values in selections.items() if self.__facets[name]}
+        if not selections:
+            return np.arange(self.__row_count)
+
+        # Start from the facet with the fewest selected rows
+        counts = {name: sum(facet.get_count(values) for facet in self.__facets[name]) for name, values in selections.items()}
+        first_name = min(counts, key=counts.get)
+        rows = np.unique(np.concatenate([facet.get_rows(selections[first_name]) for facet in self.__facets[first_name]]))
+
+        for name, values in selections.items():
+            if name != first_name:
+                has_values = np.zeros(len(rows), dtype=bool)
+                for facet in self.__facets[name]:
+                    has_values |= facet.has_values(rows, values)
+                rows = rows[has_values]
+
+        return rows
+
+    def get_values(self, name: str, rows: np.ndarray) -> list[str]:
+        """Distinct values of the facet for the given row ids, sorted per column of the facet."""
+        return [value for facet in self.__facets[name] for value in facet.get_values(rows)]
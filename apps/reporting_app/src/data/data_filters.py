@@ -1,9 +1,13 @@
 from src.config.constants import (COLUMN_NAME_PROJECT, COLUMN_NAME_SQUAD, COLUMN_NAME_SQUAD2,
-    COLUMN_NAME_SPRINT, COLUMN_NAME_TYPE, COLUMN_NAME_ID, COLUMN_NAME_CALCULATED_COMPONENTS, COLUMN_NAME_CALCULATED_SPRINT, COLUMN_NAME_ASSIGNEE_NAME)
-from src.utils.sprint_utils import get_sprint_date_range
-from src.utils.string_utils import split_string_array
+    COLUMN_NAME_TYPE, COLUMN_NAME_ID, COLUMN_NAME_CALCULATED_COMPONENTS, COLUMN_NAME_CALCULATED_SPRINT, COLUMN_NAME_ASSIGNEE_NAME)
+from src.data.data_loaders import JiraData
+from src.data.data_sprints import JiraDataSprintIndex
+from src.data.data_memberships import JiraDataMembership
+from src.utils.cache_utils import create_result_cache
+from src.utils.metrics_utils import METRICS_REGISTRY
+from src.config.app_settings import AppSettings
+import numpy as np
 import pandas as pd
-import warnings
 
 class JiraDataFilter:
     projects: list[str]
@@ -23,6 +27,24 @@ class JiraDataFilter:
         self.components = components
         self.assignees = assignees
 
+    def get_cache_key(self) -> tuple:
+        """Hashable, normalized form of the filter, filters that select the same tickets share the same key."""
+        def normalize(values: list[str]) -> tuple:
+            # empty filters and filters containing None are not applied
+            if not values or None in values:
+                return None
+            return tuple(sorted(set(values)))
+
+        return (
+            normalize(self.projects),
+            normalize(self.squads),
+            normalize(self.sprints),
+            normalize(self.ticket_types),
+            normalize(self.ticketIds),
+            normalize(self.components),
+            normalize(self.assignees)
+        )
+
 class JiraDataFilterResult:
     @property
     def tickets(self) -> pd.DataFrame:
@@ -67,6 +89,49 @@ class JiraDataFilterResult:
         self._assignees = assignees
 
 class JiraDataFilterService:
+    # Facets of the filtered tickets that filter_tickets can list
+    FACET_NAMES = ['squads', 'sprints', 'ticket_types', 'components', 'assignees']
+
+    # Filter results shared by every service instance, and by the workers of the server on a shared backend,
+    # keyed by dataset version and normalized filter
+    __cache = create_result_cache('filter', max_size=AppSettings().FILTER_CACHE_MAX_SIZE)
+
+    def __init__(self, jira_data: JiraData = None):
+        self.__jira_data = jira_data
+
+    @classmethod
+    def get_cache_stats(cls) -> dict:
+        return cls.__cache.get_stats()
+
+    @classmethod
+    def clear_cache(cls):
+        cls.__cache.clear()
+
+    def __get_cache_key(self, tickets: pd.DataFrame, filter: JiraDataFilter) -> tuple:
+        # Only the tickets of the dataset itself can be cached, other DataFrames have no version
+        if self.__jira_data is None or tickets is not self.__jira_data.get_tickets():
+            return None
+
+        # Results of previous versions are evicted as the ones of newer versions come in, requests still running
+        # on a previous version after a reload keep their results without clearing the ones of the newer version
+        return (self.__jira_data.version, filter.get_cache_key())
+
+    def __get_sprint_index(self, tickets: pd.DataFrame) -> JiraDataSprintIndex:
+        # Use the sprint index precomputed at load time, otherwise build one from the tickets given
+        if self.__jira_data is not None:
+            return self.__jira_data.get_sprint_index()
+        return JiraDataSprintIndex(tickets)
+
+    def __get_sprint_memberships(self, tickets: pd.DataFrame) -> JiraDataMembership:
+        if self.__jira_data is not None:
+            return self.__jira_data.get_sprint_memberships()
+        return JiraDataMembership(tickets, COLUMN_NAME_CALCULATED_SPRINT)
+
+    def __get_component_memberships(self, tickets: pd.DataFrame) -> JiraDataMembership:
+        if self.__jira_data is not None:
+            return self.__jira_data.get_component_memberships()
+        return JiraDataMembership(tickets, COLUMN_NAME_CALCULATED_COMPONENTS)
+
     def __get_squads(self, tickets: pd.DataFrame) -> list[str]:
         squads = []
         if COLUMN_NAME_SQUAD in tickets.columns:
@@ -78,61 +143,101 @@ class JiraDataFilterService:
 
         return sorted(squads)
 
-    def __get_sprints(self, tickets: pd.DataFrame) -> list[str]:
+    def __get_sprints(self, tickets: pd.DataFrame, sprint_index: JiraDataSprintIndex, sprint_memberships: JiraDataMembership) -> list[str]:
         # Get unique sprints
-        sprint_set = set()
-        for sprint_str in tickets[COLUMN_NAME_SPRINT].dropna().unique():
-            sprints = split_string_array(sprint_str, '"-"')
-            sprint_set.update(sprint.strip() for sprint in sprints)
-
-        # Get sprint end dates and sort sprints by end date descending
-        sprint_dates = {}
-        for sprint in sprint_set:
-            # Get one ticket from this sprint to get its dates
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", UserWarning)
-                sprint_tickets = tickets[tickets[COLUMN_NAME_SPRINT].str.contains(sprint, na=False)]
-            if not sprint_tickets.empty:
-                sprint_ticket = sprint_tickets.iloc[0]
-                # Convert the Series to a DataFrame with a single row
-                sprint_ticket_df = sprint_ticket.to_frame().T
-                start_date, _ = get_sprint_date_range(sprint_ticket_df, sprint)
-                if start_date and not pd.isna(start_date):
-                    # Ensure timezone-naive comparison by converting to UTC and removing timezone
-                    sprint_dates[sprint] = start_date.tz_localize(None) if start_date.tz else start_date
-                else:
-                    # Use timezone-naive minimum timestamp
-                    sprint_dates[sprint] = pd.Timestamp.min.tz_localize(None)
-            else:
-                # If no tickets found for this sprint, use minimum timestamp
-                sprint_dates[sprint] = pd.Timestamp.min.tz_localize(None)
+        sprints = sprint_memberships.get_values(tickets.index.to_numpy())
 
         # Sort sprints by start date descending
-        return sorted(sprint_dates.keys(), key=lambda x: sprint_dates[x], reverse=True)
+        return sprint_index.sort_sprints_by_start_date(sprints)
 
     def __get_ticket_types(self, tickets: pd.DataFrame) -> list[str]:
         return sorted(tickets[COLUMN_NAME_TYPE].unique())
 
-    def __get_components(self, tickets: pd.DataFrame) -> list[str]:
-        # Get all components from the calculated components column
+    def __split_components(self, components: list[str]) -> list[str]:
         all_components = []
-        for components_str in tickets[COLUMN_NAME_CALCULATED_COMPONENTS].dropna():
-            if isinstance(components_str, list):
-                for comp in components_str:
-                    if pd.notna(comp):
-                        # Handle potential hyphenated values in array elements
-                        subparts = str(comp).split('-')
-                        all_components.extend(part.strip('"').strip("'").strip() for part in subparts if part.strip())
+        for comp in components:
+            # Handle potential hyphenated values in array elements
+            subparts = comp.split('-')
+            all_components.extend(part.strip('"').strip("'").strip() for part in subparts if part.strip())
 
         # Remove duplicates and sort
         return sorted(list(set(all_components)))
 
+    def __get_components(self, tickets: pd.DataFrame, component_memberships: JiraDataMembership) -> list[str]:
+        # Get all components of the tickets from the component memberships
+        return self.__split_components(component_memberships.get_values(tickets.index.to_numpy()))
+
     def __get_assignees(self, tickets: pd.DataFrame) -> list[str]:
         # Filter out NaN values and convert to list before sorting
         assignees = [assignee for assignee in tickets[COLUMN_NAME_ASSIGNEE_NAME].unique() if pd.notna(assignee)]
         return sorted(assignees)
 
-    def filter_tickets(self, tickets: pd.DataFrame, filter: JiraDataFilter) -> JiraDataFilterResult:
+    @METRICS_REGISTRY.timed('reporting_filter_tickets_seconds')
+    def filter_tickets(self, tickets: pd.DataFrame, filter: JiraDataFilter, facets: list[str] = None) -> JiraDataFilterResult:
+        """
+        Tickets selected by the filter and the values of the selected tickets for every facet.
+
+        Args:
+            tickets (pd.DataFrame): Tickets to filter, the dataset tickets are filtered through its facet index
+            filter (JiraDataFilter): Values to select by field, empty fields and fields containing None select all tickets
+            facets (list[str]): Facets to list among FACET_NAMES, all of them when not set, the others are None in the result
+
+        Returns:
+            JiraDataFilterResult: Selected tickets in dataset order and the values of the facets
+        """
+        facet_names = self.FACET_NAMES if facets is None else facets
+        cache_key = self.__get_cache_key(tickets, filter)
+        if cache_key is None:
+            return self.__filter_tickets(tickets, filter, facet_names)
+
+        # Only the row ids and facets are kept, the filtered tickets are taken from the dataset again on a hit
+        cached_result = JiraDataFilterService.__cache.get(cache_key)
+        if cached_result is None:
+            ticket_rows = self.__jira_data.get_facet_index().get_rows(self.__get_selections(filter))
+            facet_values = {}
+        else:
+            ticket_rows, facet_values = cached_result
+
+        # Facets that an earlier caller with the same filter didn't need are listed and added to the cached result
+        missing_facet_names = [facet_name for facet_name in facet_names if facet_name not in facet_values]
+        if cached_result is None or missing_facet_names:
+            facet_values = {**facet_values, **self.__get_facet_values(ticket_rows, missing_facet_names)}
+            JiraDataFilterService.__cache.set(cache_key, (ticket_rows, facet_values))
+
+        return JiraDataFilterResult(
+            tickets=tickets.loc[ticket_rows],
+            **{facet_name: facet_values[facet_name] for facet_name in facet_names}
+        )
+
+    def __get_selections(self, filter: JiraDataFilter) -> dict[str, list[str]]:
+        # Fields of the filter that are applied
+        selections = {}
+        for name in ['projects', 'squads', 'sprints', 'ticket_types', 'components', 'ticketIds', 'assignees']:
+            values = getattr(filter, name)
+            if values and None not in values:
+                selections[name] = values
+        return selections
+
+    def __get_facet_values(self, ticket_rows: np.ndarray, facet_names: list[str]) -> dict[str, list[str]]:
+        facet_index = self.__jira_data.get_facet_index()
+        facet_values = {}
+        for facet_name in facet_names:
+            values = facet_index.get_values(facet_name, ticket_rows)
+            if facet_name == 'sprints':
+                # Sort sprints by start date descending
+                values = self.__jira_data.get_sprint_index().sort_sprints_by_start_date(values)
+            elif facet_name == 'components':
+                values = self.__split_components(values)
+            elif facet_name == 'squads':
+                values = sorted(values)
+            facet_values[facet_name] = values
+        return facet_values
+
+    def __filter_tickets(self, tickets: pd.DataFrame, filter: JiraDataFilter, facet_names: list[str]) -> JiraDataFilterResult:
+        sprint_index = self.__get_sprint_index(tickets)
+        sprint_memberships = self.__get_sprint_memberships(tickets)
+        component_memberships = self.__get_component_memberships(tickets)
+
         # filter by project
         if filter.projects and None not in filter.projects:
             tickets = tickets[tickets[COLUMN_NAME_PROJECT].isin(filter.projects)]
@@ -148,9 +253,7 @@ class JiraDataFilterService:
 
         # filter by sprint
         if filter.sprints and None not in filter.sprints:
-            tickets = tickets[tickets[COLUMN_NAME_CALCULATED_SPRINT].apply(
-                lambda x: any(sprint in x for sprint in filter.sprints) if isinstance(x, list) else False
-            )]
+            tickets = tickets[sprint_memberships.has_values(tickets.index.to_numpy(), filter.sprints)]
 
         # filter by types
         if filter.ticket_types and None not in filter.ticket_types:
@@ -158,9 +261,7 @@ class JiraDataFilterService:
 
         # filter by components
         if filter.components and None not in filter.components:
-            tickets = tickets[tickets[COLUMN_NAME_CALCULATED_COMPONENTS].apply(
-                lambda x: any(comp in x for comp in filter.components) if isinstance(x, list) else False
-            )]
+            tickets = tickets[component_memberships.has_values(tickets.index.to_numpy(), filter.components)]
 
         # filter by ticketId
         if filter.ticketIds and None not in filter.ticketIds:
@@ -170,11 +271,11 @@ class JiraDataFilterService:
         if filter.assignees and None not in filter.assignees:
             tickets = tickets[tickets[COLUMN_NAME_ASSIGNEE_NAME].isin(filter.assignees)]
 
-        squads = self.__get_squads(tickets)
-        sprints = self.__get_sprints(tickets)
-        ticket_types = self.__get_ticket_types(tickets)
-        components = self.__get_components(tickets)
-        assignees = self.__get_assignees(tickets)
+        squads = self.__get_squads(tickets) if 'squads' in facet_names else None
+        sprints = self.__get_sprints(tickets, sprint_index, sprint_memberships) if 'sprints' in facet_names else None
+        ticket_types = self.__get_ticket_types(tickets) if 'ticket_types' in facet_names else None
+        components = self.__get_components(tickets, component_memberships) if 'components' in facet_names else None
+        assignees = self.__get_assignees(tickets) if 'assignees' in facet_names else None
 
         return JiraDataFilterResult(
             tickets=tickets,
@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
 import os
+import threading
+import uuid
+from contextlib import nullcontext
 from src.config.constants import (
     ALL_STAGE_COLUMNS_DURATIONS_IN_DAYS,
     COLUMN_NAME_CREATED_DATE,
@@ -10,30 +14,161 @@ from src.config.constants import (
     COLUMN_NAME_CALCULATED_SPRINT,
     COLUMN_NAME_NAME,
     COLUMN_NAME_PROJECT,
-    COLUMN_NAME_ID
+    COLUMN_NAME_ID,
+    COLUMN_NAME_SPRINT_START_DATE,
+    COLUMN_NAME_SPRINT_END_DATE,
+    COLUMN_NAME_SPRINT_GOALS,
+    CSV_STRING_COLUMNS,
+    CSV_CATEGORICAL_COLUMNS,
+    CSV_NUMERIC_COLUMNS,
+    CSV_DATE_COLUMNS,
+    COLUMN_NAME_PRIORITY,
+    COLUMN_NAME_TYPE,
+    COLUMN_NAME_PRIORITY_SORT,
+    COLUMN_NAME_TYPE_SORT,
+    PRIORITY_ORDER,
+    TYPE_ORDER
 )
 from src.utils.stage_utils import StageUtils
 from src.utils.jira_utils import JiraTicketHelpers
-from src.utils.string_utils import split_string_array
+from src.utils.string_utils import split_string_arrays
+from src.utils.metrics_utils import METRICS_REGISTRY
 from src.config.app_settings import AppSettings
+from src.data.data_sprints import JiraDataSprintIndex
+from src.data.data_memberships import JiraDataMembership
+from src.data.data_snapshots import JiraDataSnapshot
+from src.data.data_dora_cube import JiraDataDoraCube
+from src.data.data_facets import JiraDataFacetIndex
+class JiraDataChanges:
+    """Tickets a merged JiraData carried over from the dataset version it was merged into."""
+    __previous_version: str
+    __row_mapping: np.ndarray
+    __changed_sprint_names: set[str]
+
+    def __init__(self, previous_version: str, row_mapping: np.ndarray, changed_sprint_names: set[str]):
+        self.__previous_version = previous_version
+        # Row id in the merged tickets of every previous row id, -1 for tickets that were removed or changed
+        self.__row_mapping = row_mapping
+        self.__changed_sprint_names = changed_sprint_names
+
+    @property
+    def previous_version(self) -> str:
+        return self.__previous_version
+
+    @property
+    def row_mapping(self) -> np.ndarray:
+        return self.__row_mapping
+
+    def is_sprint_changed(self, sprint_name: str) -> bool:
+        """Whether any ticket of the sprint was added, removed or changed in any column."""
+        return sprint_name in self.__changed_sprint_names
+
 class JiraData:
     __tickets: pd.DataFrame
+    __sprint_index: JiraDataSprintIndex
+    __sprint_memberships: JiraDataMembership
+    __component_memberships: JiraDataMembership
+    __version: str
+    __changes: JiraDataChanges
+    __dora_cube: JiraDataDoraCube
+    __facet_index: JiraDataFacetIndex
 
-    def __init__(self, tickets: pd.DataFrame):
+    def __init__(self, tickets: pd.DataFrame, sprint_index: JiraDataSprintIndex = None,
+                 sprint_memberships: JiraDataMembership = None, component_memberships: JiraDataMembership = None,
+                 version: str = None, changes: JiraDataChanges = None, dora_cube: JiraDataDoraCube = None):
         self.__tickets = tickets
+        self.__changes = changes
+        self.__dora_cube = dora_cube
+        self.__dora_cube_lock = threading.Lock()
+        self.__facet_index = None
+        self.__facet_index_lock = threading.Lock()
+        # Identifies this dataset in caches, the loader derives it from the CSV so every process loading
+        # the same CSV shares its cache entries. Data built otherwise gets a version of its own
+        self.__version = version if version is not None else uuid.uuid4().hex
+        self.__sprint_index = sprint_index if sprint_index is not None else JiraDataSprintIndex(tickets)
+        self.__sprint_memberships = sprint_memberships if sprint_memberships is not None else JiraDataMembership(tickets, COLUMN_NAME_CALCULATED_SPRINT)
+        self.__component_memberships = component_memberships if component_memberships is not None else JiraDataMembership(tickets, COLUMN_NAME_CALCULATED_COMPONENTS)
+
+    @property
+    def version(self) -> str:
+        return self.__version
 
     def get_tickets(self) -> pd.DataFrame:
         return self.__tickets
 
+    def get_changes(self) -> JiraDataChanges:
+        """Changes since the previous version when this dataset was merged into it, otherwise None."""
+        return self.__changes
+
+    def get_sprint_index(self) -> JiraDataSprintIndex:
+        return self.__sprint_index
+
+    def get_sprint_memberships(self) -> JiraDataMembership:
+        return self.__sprint_memberships
+
+    def get_component_memberships(self) -> JiraDataMembership:
+        return self.__component_memberships
+
+    def get_dora_cube(self, build: bool = True) -> JiraDataDoraCube:
+        """DORA measures pre-aggregated by project, squad and week, built on first use unless build is False."""
+        if self.__dora_cube is None and build:
+            with self.__dora_cube_lock:
+                if self.__dora_cube is None:
+                    self.__dora_cube = JiraDataDoraCube(self.__tickets, self.__sprint_index, self.__sprint_memberships)
+
+        return self.__dora_cube
+
+    def get_facet_index(self) -> JiraDataFacetIndex:
+        """Row ids of every filter value and filter values of every row id, built on first use."""
+        if self.__facet_index is None:
+            with self.__facet_index_lock:
+                if self.__facet_index is None:
+                    self.__facet_index = JiraDataFacetIndex(self.__tickets, self.__sprint_memberships, self.__component_memberships)
+
+        return self.__facet_index
+
     def get_projects(self) -> list[str]:
         return sorted(self.__tickets[COLUMN_NAME_PROJECT].unique())
 
 class CsvDataLoader:
+    def __init__(self, use_schema: bool = False, engine: str = None):
+        # use_schema reads only the columns declared in constants.py with their dtypes instead of inferring them
+        self.use_schema = use_schema
+        self.engine = engine
+
+    def get_ingestion_mode(self) -> str:
+        return f"{'schema' if self.use_schema else 'inferred'}-{self.engine or 'c'}"
+
+    def __get_schema(self, csv_filepath: str) -> tuple[list[str], dict[str, str]]:
+        dtypes = {}
+        dtypes.update({column_name: 'object' for column_name in CSV_STRING_COLUMNS})
+        dtypes.update({column_name: 'category' for column_name in CSV_CATEGORICAL_COLUMNS})
+        dtypes.update({column_name: 'float64' for column_name in CSV_NUMERIC_COLUMNS})
+        # Stage start dates are read as strings, converting them afterwards with pd.to_datetime
+        # is an order of magnitude faster than read_csv's parse_dates
+        dtypes.update({column_name: 'object' for column_name in CSV_DATE_COLUMNS})
+
+        # Only the header is read, exports don't have a column for every known stage
+        csv_columns = pd.read_csv(csv_filepath, delimiter=",", nrows=0).columns
+        usecols = [column_name for column_name in csv_columns if column_name in dtypes]
+
+        return usecols, {column_name: dtypes[column_name] for column_name in usecols}
+
+    @METRICS_REGISTRY.timed('reporting_load_phase_seconds', phase='read csv')
     def load_data(self, csv_filepath: str) -> pd.DataFrame:
         print(f"Loading data from {csv_filepath}")
         print(f"Directory containing CSV file: {os.path.dirname(csv_filepath)}")
         print(f"Files in directory: {os.listdir(os.path.dirname(csv_filepath))}")
-        jira_tickets = pd.read_csv(csv_filepath, delimiter=",")
+        if self.use_schema:
+            usecols, dtypes = self.__get_schema(csv_filepath)
+            jira_tickets = pd.read_csv(csv_filepath, delimiter=",", usecols=usecols, dtype=dtypes, engine=self.engine)
+        else:
+            jira_tickets = pd.read_csv(csv_filepath, delimiter=",", engine=self.engine)
+
+        if self.engine == 'pyarrow':
+            # The pyarrow engine gives None for missing strings where the default engine gives NaN
+            object_columns = jira_tickets.select_dtypes(include='object').columns
+            jira_tickets[object_columns] = jira_tickets[object_columns].where(jira_tickets[object_columns].notna(), np.nan)
 
         return jira_tickets
 
@@ -52,8 +187,17 @@ class JiraDataLoader:
         'CONTENTHUB': 'Content Hub'
     }
 
-    def __init__(self, csv_data_loader: CsvDataLoader):
+    def __init__(self, csv_data_loader: CsvDataLoader, use_snapshot: bool = False):
         self.csv_data_loader = csv_data_loader
+        self.use_snapshot = use_snapshot
+
+    @classmethod
+    def from_settings(cls) -> 'JiraDataLoader':
+        """Loader configured with the CSV schema, engine and snapshot app settings."""
+        app_settings = AppSettings()
+        csv_data_loader = CsvDataLoader(use_schema=app_settings.REPORTING_CSV_SCHEMA_ENABLED,
+                                        engine=app_settings.REPORTING_CSV_ENGINE or None)
+        return cls(csv_data_loader, use_snapshot=app_settings.REPORTING_SNAPSHOT_ENABLED)
 
     def __process_jiratickets_dates(self, jira_tickets: pd.DataFrame)->pd.DataFrame:
         jira_tickets[COLUMN_NAME_CREATED_DATE] = pd.to_datetime(jira_tickets[COLUMN_NAME_CREATED_DATE], utc=True)
@@ -65,7 +209,8 @@ class JiraDataLoader:
             if start_col in jira_tickets.columns:
                 jira_tickets[start_col] = pd.to_datetime(jira_tickets[start_col], utc=True, errors='coerce')
             else:
-                jira_tickets[start_col] = pd.NaT
+                # UTC like the parsed columns, the stage end dates of missing stages are compared with sprint dates
+                jira_tickets[start_col] = pd.Series(pd.NaT, index=jira_tickets.index, dtype='datetime64[ns, UTC]')
 
             # Handle duration columns
             if days_col not in jira_tickets.columns:
@@ -73,63 +218,269 @@ class JiraDataLoader:
 
         return jira_tickets
 
-    # Function to extract components from title prefix
-    def __extract_components_from_title(self, title: str)-> list[str]:
-        components = JiraTicketHelpers.get_components_from_summary(title)
+    def __to_lists(self, values: pd.Series, row_count: int) -> list[list]:
+        # Values of the long Series are indexed and ordered by row position, rows without values get an empty list
+        counts = np.bincount(values.index.to_numpy(dtype=np.int64), minlength=row_count)
+        ends = np.cumsum(counts)
+        values = values.tolist()
+        return [values[start:end] for start, end in zip((ends - counts).tolist(), ends.tolist())]
 
-        # Only keep valid components and map them to their standardized names
-        valid_components = [self.VALID_COMPONENTS[comp] for comp in components
-                        if comp in self.VALID_COMPONENTS]
+    def __process_jiratickets_components(self, jira_tickets: pd.DataFrame)->pd.DataFrame:
+        # Components of every ticket as one long Series by row position, the index of merged tickets isn't a range
+        positions = pd.RangeIndex(len(jira_tickets))
+        components = split_string_arrays(jira_tickets[COLUMN_NAME_COMPONENTS].set_axis(positions), '"-"')
 
-        return valid_components
+        # Components from title prefix, only keep valid components and map them to their standardized names
+        components_from_title = JiraTicketHelpers.get_components_from_summaries(jira_tickets[COLUMN_NAME_NAME].set_axis(positions))
+        components_from_title = components_from_title.map(self.VALID_COMPONENTS).dropna()
 
-    # Add SFCC components based on COM- ticket prefix
-    def __extract_sfcc_component(self, ticket_id: str)-> list[str]:
-        if pd.isna(ticket_id):
-            return []
-        if str(ticket_id).startswith('COM-'):
-            return ['SFCC']
-        return []
+        # Add SFCC components based on COM- ticket prefix
+        ticket_ids = jira_tickets[COLUMN_NAME_ID].astype(object)
+        is_sfcc = ticket_ids.notna().to_numpy() & ticket_ids.astype(str).str.startswith('COM-').to_numpy(dtype=bool)
+        components_sfcc = pd.Series('SFCC', index=positions[is_sfcc], dtype=object)
 
-    def __process_jiratickets_components(self, jira_tickets: pd.DataFrame)->pd.DataFrame:
-        # Convert components to lists instead of sets
-        components = jira_tickets[COLUMN_NAME_COMPONENTS].apply(lambda x: list(split_string_array(x, '"-"')))
-        components_from_title = jira_tickets[COLUMN_NAME_NAME].apply(lambda x: list(self.__extract_components_from_title(x)))
-        components_sfcc = jira_tickets[COLUMN_NAME_ID].apply(lambda x: list(self.__extract_sfcc_component(x)))
-
-        # Combine components from title into existing components list for each row
-        components = components.combine(components_from_title, lambda x, y: list(set(x + y)))
-        components = components.combine(components_sfcc, lambda x, y: list(set(x + y)))
-        jira_tickets[COLUMN_NAME_CALCULATED_COMPONENTS] = components
+        # Combine the components of each ticket without duplicates, in order of first occurrence
+        components = pd.concat([components, components_from_title, components_sfcc]).sort_index(kind='stable')
+        duplicated = pd.DataFrame({'row': components.index, 'component': components.to_numpy()}).duplicated().to_numpy()
+        components = components[~duplicated]
+        jira_tickets[COLUMN_NAME_CALCULATED_COMPONENTS] = pd.Series(self.__to_lists(components, len(jira_tickets)),
+                                                                    index=jira_tickets.index, dtype=object)
 
         return jira_tickets
 
     def __process_jiratickets_sprint(self, jira_tickets: pd.DataFrame)->pd.DataFrame:
-        jira_tickets[COLUMN_NAME_CALCULATED_SPRINT] = jira_tickets[COLUMN_NAME_SPRINT].apply(lambda x: list(split_string_array(x, '"-"')))
+        sprints = split_string_arrays(jira_tickets[COLUMN_NAME_SPRINT].set_axis(pd.RangeIndex(len(jira_tickets))), '"-"')
+        jira_tickets[COLUMN_NAME_CALCULATED_SPRINT] = pd.Series(self.__to_lists(sprints, len(jira_tickets)),
+                                                                index=jira_tickets.index, dtype=object)
 
         return jira_tickets
 
-    def load_data(self, csv_filepath: str) -> JiraData:
-        jira_tickets = self.csv_data_loader.load_data(csv_filepath)
+    def __process_jiratickets_sort_keys(self, jira_tickets: pd.DataFrame) -> pd.DataFrame:
+        # Unknown priorities and types sort last, a categorical column would map to categories
+        priorities = jira_tickets[COLUMN_NAME_PRIORITY].astype(object) if COLUMN_NAME_PRIORITY in jira_tickets.columns else pd.Series(np.nan, index=jira_tickets.index)
+        jira_tickets[COLUMN_NAME_PRIORITY_SORT] = priorities.map(PRIORITY_ORDER).fillna(PRIORITY_ORDER['N/A']).astype(int)
+        jira_tickets[COLUMN_NAME_TYPE_SORT] = jira_tickets[COLUMN_NAME_TYPE].astype(object).map(TYPE_ORDER).fillna(999).astype(int)
+
+        return jira_tickets
+
+    @METRICS_REGISTRY.timed('reporting_load_phase_seconds', phase='process tickets')
+    def __process_jiratickets(self, jira_tickets: pd.DataFrame) -> pd.DataFrame:
         jira_tickets = self.__process_jiratickets_dates(jira_tickets)
         jira_tickets = self.__process_jiratickets_components(jira_tickets)
         jira_tickets = self.__process_jiratickets_sprint(jira_tickets)
-        jira_data = JiraData(jira_tickets)
+        jira_tickets = self.__process_jiratickets_sort_keys(jira_tickets)
+
+        return jira_tickets
+
+    def __get_processed_column_names(self, jira_tickets: pd.DataFrame, column_names: pd.Index) -> list[str]:
+        # Columns the processing converts or adds, every other column is kept as read from the CSV
+        start_date_column_names = [StageUtils.to_stage_start_date_column_name(days_col) for days_col in ALL_STAGE_COLUMNS_DURATIONS_IN_DAYS]
+        converted_column_names = [COLUMN_NAME_CREATED_DATE, COLUMN_NAME_UPDATED_DATE] + start_date_column_names
+        return [column_name for column_name in column_names
+                if column_name in converted_column_names or column_name not in jira_tickets.columns]
+
+    def __get_snapshot(self, csv_filepath: str) -> JiraDataSnapshot:
+        return JiraDataSnapshot(csv_filepath, self.csv_data_loader.get_ingestion_mode()) if self.use_snapshot else None
+
+    def __get_version(self, csv_filepath: str, snapshot: JiraDataSnapshot) -> str:
+        # Taken before the CSV is read like the snapshot fingerprint, the same version with or without the snapshot
+        if snapshot is not None:
+            return snapshot.fingerprint
+        try:
+            return JiraDataSnapshot.get_fingerprint(csv_filepath, self.csv_data_loader.get_ingestion_mode())
+        except OSError:
+            return None
+
+    @METRICS_REGISTRY.timed('reporting_load_phase_seconds', phase='load snapshot')
+    def __load_snapshot(self, snapshot: JiraDataSnapshot) -> JiraData:
+        snapshot_tables = snapshot.load() if snapshot is not None else None
+        if snapshot_tables is None:
+            return None
+
+        jira_tickets, sprint_index, sprint_memberships, component_memberships = snapshot_tables
+        return JiraData(
+            jira_tickets,
+            sprint_index=sprint_index,
+            sprint_memberships=sprint_memberships,
+            component_memberships=component_memberships,
+            version=snapshot.fingerprint
+        )
+
+    @METRICS_REGISTRY.timed('reporting_load_phase_seconds', phase='save snapshot')
+    def __save_snapshot(self, snapshot: JiraDataSnapshot, jira_data: JiraData):
+        # Later loads of the same CSV read the processed tables back instead
+        if snapshot is not None:
+            snapshot.save(jira_data.get_tickets(), jira_data.get_sprint_index(),
+                          jira_data.get_sprint_memberships(), jira_data.get_component_memberships())
+
+    def __build_jira_data(self, jira_tickets: pd.DataFrame, snapshot: JiraDataSnapshot, version: str) -> JiraData:
+        jira_tickets = self.__process_jiratickets(jira_tickets)
+        with METRICS_REGISTRY.time('reporting_load_phase_seconds', phase='build indexes'):
+            jira_data = JiraData(
+                jira_tickets,
+                sprint_index=JiraDataSprintIndex(jira_tickets),
+                sprint_memberships=JiraDataMembership(jira_tickets, COLUMN_NAME_CALCULATED_SPRINT),
+                component_memberships=JiraDataMembership(jira_tickets, COLUMN_NAME_CALCULATED_COMPONENTS),
+                version=version
+            )
+        self.__save_snapshot(snapshot, jira_data)
 
         return jira_data
 
+    def __lock_snapshot(self, snapshot: JiraDataSnapshot):
+        # Processes loading the same CSV wait for the one writing its snapshot instead of also parsing the CSV
+        return snapshot.lock() if snapshot is not None else nullcontext()
+
+    def load_data(self, csv_filepath: str) -> JiraData:
+        snapshot = self.__get_snapshot(csv_filepath)
+        version = self.__get_version(csv_filepath, snapshot)
+        with self.__lock_snapshot(snapshot):
+            jira_data = self.__load_snapshot(snapshot)
+            if jira_data is not None:
+                return jira_data
+
+            jira_tickets = self.csv_data_loader.load_data(csv_filepath)
+            return self.__build_jira_data(jira_tickets, snapshot, version)
+
+    def __get_unchanged_tickets(self, previous_tickets: pd.DataFrame, jira_tickets: pd.DataFrame, previous_rows: np.ndarray) -> np.ndarray:
+        unchanged = previous_rows >= 0
+        matched_rows = np.flatnonzero(unchanged)
+        matched_previous_rows = previous_rows[matched_rows]
+
+        updated_dates = pd.to_datetime(jira_tickets[COLUMN_NAME_UPDATED_DATE].iloc[matched_rows], utc=True).values
+        unchanged[matched_rows] = updated_dates == previous_tickets[COLUMN_NAME_UPDATED_DATE].values[matched_previous_rows]
+
+        # Sprint dates and goals change without updating the tickets of the sprint
+        for column_name in [COLUMN_NAME_SPRINT, COLUMN_NAME_SPRINT_START_DATE, COLUMN_NAME_SPRINT_END_DATE, COLUMN_NAME_SPRINT_GOALS]:
+            if column_name in jira_tickets.columns:
+                values = jira_tickets[column_name].to_numpy()[matched_rows]
+                previous_values = previous_tickets[column_name].to_numpy()[matched_previous_rows]
+                unchanged[matched_rows] &= (values == previous_values) | (pd.isna(values) & pd.isna(previous_values))
+
+        return unchanged
+
+    def merge_data(self, jira_data: JiraData, csv_filepath: str) -> JiraData:
+        """
+        Loads the CSV again, only processing the tickets that are new or have been updated since jira_data was loaded.
+
+        Tickets are matched by ID and compared by UpdatedDate. Unchanged tickets keep their processed columns and
+        their sprint index and membership entries, the columns that aren't processed are taken from the CSV for every ticket.
+
+        Args:
+            jira_data (JiraData): Previously loaded data of the CSV
+            csv_filepath (str): Path of the CSV
+
+        Returns:
+            JiraData: Same data as load_data, with the changes since jira_data
+        """
+        snapshot = self.__get_snapshot(csv_filepath)
+        version = self.__get_version(csv_filepath, snapshot)
+        with self.__lock_snapshot(snapshot):
+            snapshot_jira_data = self.__load_snapshot(snapshot)
+            if snapshot_jira_data is not None:
+                return snapshot_jira_data
+
+            return self.__merge_data(jira_data, csv_filepath, snapshot, version)
+
+    def __merge_data(self, jira_data: JiraData, csv_filepath: str, snapshot: JiraDataSnapshot, version: str) -> JiraData:
+        jira_tickets = self.csv_data_loader.load_data(csv_filepath)
+        previous_tickets = jira_data.get_tickets()
+        # Processing no tickets gives the columns of the processed tickets
+        column_names = self.__process_jiratickets(jira_tickets.iloc[:0].copy()).columns
+        if (not previous_tickets[COLUMN_NAME_ID].is_unique or not jira_tickets[COLUMN_NAME_ID].is_unique or
+            not previous_tickets.index.equals(pd.RangeIndex(len(previous_tickets))) or
+            not previous_tickets.columns.equals(column_names)):
+            print("Tickets can't be merged, processing all tickets")
+            return self.__build_jira_data(jira_tickets, snapshot, version)
+
+        previous_rows = pd.Index(previous_tickets[COLUMN_NAME_ID]).get_indexer(jira_tickets[COLUMN_NAME_ID])
+        unchanged = self.__get_unchanged_tickets(previous_tickets, jira_tickets, previous_rows)
+        unchanged_rows = np.flatnonzero(unchanged)
+        changed_rows = np.flatnonzero(~unchanged)
+        if len(unchanged_rows) == 0:
+            return self.__build_jira_data(jira_tickets, snapshot, version)
+        print(f"Merging {len(changed_rows)} new or updated tickets into {len(unchanged_rows)} unchanged tickets")
+
+        # Unchanged tickets keep their processed columns, the other columns come from the CSV for every ticket
+        # as they can change without updating the ticket, e.g. the days in the current stage
+        processed_column_names = self.__get_processed_column_names(jira_tickets, column_names)
+        changed_tickets = self.__process_jiratickets(jira_tickets.iloc[changed_rows].copy())
+        merged_rows = np.where(unchanged, previous_rows, 0)
+        merged_columns = {}
+        for column_name in column_names:
+            if column_name in processed_column_names:
+                values = previous_tickets[column_name].array.take(merged_rows)
+                values[changed_rows] = changed_tickets[column_name].array
+                merged_columns[column_name] = values
+            else:
+                merged_columns[column_name] = jira_tickets[column_name]
+        merged_tickets = pd.DataFrame(merged_columns)
+
+        row_mapping = np.full(len(previous_tickets), -1, dtype=np.int64)
+        row_mapping[previous_rows[unchanged_rows]] = unchanged_rows
+        with METRICS_REGISTRY.time('reporting_load_phase_seconds', phase='merge indexes'):
+            sprint_index = jira_data.get_sprint_index().merge(merged_tickets, row_mapping, JiraDataSprintIndex(changed_tickets))
+            sprint_memberships = jira_data.get_sprint_memberships().merge(
+                row_mapping, JiraDataMembership(changed_tickets, COLUMN_NAME_CALCULATED_SPRINT))
+            component_memberships = jira_data.get_component_memberships().merge(
+                row_mapping, JiraDataMembership(changed_tickets, COLUMN_NAME_CALCULATED_COMPONENTS))
+            # A DORA cube the previous data already built only aggregates the cells of the changed tickets again
+            dora_cube = jira_data.get_dora_cube(build=False)
+            if dora_cube is not None:
+                dora_cube = dora_cube.merge(merged_tickets, sprint_index, sprint_memberships, row_mapping)
+
+        merged_jira_data = JiraData(
+            merged_tickets,
+            sprint_index=sprint_index,
+            sprint_memberships=sprint_memberships,
+            component_memberships=component_memberships,
+            version=version,
+            dora_cube=dora_cube,
+            changes=JiraDataChanges(
+                jira_data.version,
+                row_mapping,
+                self.__get_changed_sprint_names(jira_data, merged_tickets, previous_tickets, previous_rows, unchanged_rows,
+                                                sprint_index, processed_column_names)
+            )
+        )
+        self.__save_snapshot(snapshot, merged_jira_data)
+
+        return merged_jira_data
+
+    def __get_changed_sprint_names(self, jira_data: JiraData, merged_tickets: pd.DataFrame, previous_tickets: pd.DataFrame,
+                                   previous_rows: np.ndarray, unchanged_rows: np.ndarray, sprint_index: JiraDataSprintIndex,
+                                   processed_column_names: list[str]) -> set[str]:
+        # Unchanged tickets can still differ in the columns that aren't processed, in practice the stage days
+        # that the extractor counts up to the export time
+        column_names = [column_name for column_name in merged_tickets.select_dtypes(include='number').columns
+                        if column_name not in processed_column_names]
+        values = merged_tickets[column_names].to_numpy()[unchanged_rows]
+        previous_values = previous_tickets[column_names].to_numpy()[previous_rows[unchanged_rows]]
+        identical = np.zeros(len(merged_tickets), dtype=bool)
+        identical[unchanged_rows] = ((values == previous_values) | (np.isnan(values) & np.isnan(previous_values))).all(axis=1)
+
+        previous_sprint_index = jira_data.get_sprint_index()
+        changed_sprint_names = set()
+        for sprint_name in set(previous_sprint_index.get_sprint_names()) | set(sprint_index.get_sprint_names()):
+            previous_rows_of_sprint = previous_sprint_index.get_ticket_rows([sprint_name])
+            rows_of_sprint = sprint_index.get_ticket_rows([sprint_name])
+            if len(previous_rows_of_sprint) != len(rows_of_sprint) or not identical[rows_of_sprint].all():
+                changed_sprint_names.add(sprint_name)
+
+        return changed_sprint_names
+
 class JiraDataSingleton:
     _instance = None
     _initialized = False
 
     def __init__(self, jira_data_loader: JiraDataLoader = None):
         if not self._initialized:
-            if jira_data_loader is None:
-                csv_data_loader = CsvDataLoader()
-                jira_data_loader = JiraDataLoader(csv_data_loader)
-            self.jira_data_loader = jira_data_loader
+            self.jira_data_loader = jira_data_loader if jira_data_loader is not None else JiraDataLoader.from_settings()
             self.cached_data = None
             self.last_modified_time = None
+            self.__reload_lock = threading.Lock()
+            self.__watcher = None
+            self.__watcher_stop_event = None
             self._initialized = True
 
     def __new__(cls, jira_data_loader: JiraDataLoader = None):
@@ -142,18 +493,69 @@ class JiraDataSingleton:
         return app_settings.REPORTING_CSV_PATH
 
     def get_jira_data(self) -> JiraData:
-        # Check if file has been modified since last load
-        current_modified_time = os.path.getmtime(self.get_csv_filepath())
+        # Only one caller loads a new version, the others wait for it instead of loading it again
+        with self.__reload_lock:
+            # Check if file has been modified since last load
+            current_modified_time = os.path.getmtime(self.get_csv_filepath())
+
+            # Return cached data if file hasn't changed
+            if (self.cached_data is not None and
+                self.last_modified_time is not None and
+                current_modified_time <= self.last_modified_time):
+
+                return self.cached_data
 
-        # Return cached data if file hasn't changed
-        if (self.cached_data is not None and
-            self.last_modified_time is not None and
-            current_modified_time <= self.last_modified_time):
+            # Load fresh data if cache invalid, merging the changes into it when incremental reloads are enabled.
+            # The new version is swapped in with a single assignment once it is complete
+            if self.cached_data is not None and AppSettings().REPORTING_INCREMENTAL_RELOAD_ENABLED:
+                self.cached_data = self.jira_data_loader.merge_data(self.cached_data, self.get_csv_filepath())
+            else:
+                self.cached_data = self.jira_data_loader.load_data(self.get_csv_filepath())
+            self.last_modified_time = current_modified_time
 
             return self.cached_data
 
-        # Load fresh data if cache invalid
-        self.cached_data = self.jira_data_loader.load_data(self.get_csv_filepath())
-        self.last_modified_time = current_modified_time
+    def get_current_jira_data(self) -> JiraData:
+        """
+        Current version of the data without checking the CSV file, for use on the request path.
+
+        Callbacks resolve the data once per request and keep working on that version, while the watcher
+        swaps newer versions in for the requests that come after.
+        """
+        jira_data = self.cached_data
+        if jira_data is None:
+            jira_data = self.get_jira_data()
+
+        return jira_data
+
+    def get_loaded_jira_data(self) -> JiraData:
+        """Current version of the data, or None while the first version is still loading."""
+        return self.cached_data
+
+    def start_watcher(self, interval_seconds: float):
+        """Check the CSV file for changes every interval_seconds in a background thread and load new versions."""
+        if self.__watcher is not None or interval_seconds <= 0:
+            return
+
+        self.__watcher_stop_event = threading.Event()
+        self.__watcher = threading.Thread(target=self.__watch, args=(interval_seconds, self.__watcher_stop_event),
+                                          name='jira-data-watcher', daemon=True)
+        self.__watcher.start()
+        print(f"Watching {self.get_csv_filepath()} for changes every {interval_seconds}s")
+
+    def stop_watcher(self):
+        if self.__watcher is None:
+            return
+
+        self.__watcher_stop_event.set()
+        self.__watcher.join()
+        self.__watcher = None
+        self.__watcher_stop_event = None
 
-        return self.cached_data
\ No newline at end of file
+    def __watch(self, interval_seconds: float, stop_event: threading.Event):
+        while not stop_event.wait(interval_seconds):
+            try:
+                self.get_jira_data()
+            except Exception as e:
+                # Keep serving the current version, a CSV that was still being written is loaded on the next check
+                print(f"Error reloading {self.get_csv_filepath()}: {e}")
\ No newline at end of file
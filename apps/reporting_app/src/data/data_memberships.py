@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+class JiraDataMembership:
+    """
+    Long-form (ticket row, value) membership table for a list column such as the calculated sprints or components.
+
+    Values are stored as categorical codes next to the row ids (index labels) of their tickets, so membership
+    filtering and facet listing are numpy operations instead of a Python loop over the lists of every ticket.
+    Columns with few distinct values, such as the components, also get a bitset of values per row id on first
+    use, which turns filtering and facet listing into bitwise reductions.
+    """
+    # Most distinct values that fit the bitset of a row id, sprints have too many
+    BITSET_MAX_VALUES = 64
+
+    __rows: np.ndarray
+    __codes: np.ndarray
+    __categories: pd.Index
+    __bitsets: np.ndarray = None
+
+    def __init__(self, tickets: pd.DataFrame, column_name: str):
+        values = tickets[column_name].explode()
+        values = values[values.notna()].astype(str).str.strip()
+        values = values[values != '']
+
+        categorical = pd.Categorical(values)
+        self.__rows = values.index.to_numpy()
+        self.__codes = categorical.codes
+        self.__categories = categorical.categories
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long-form (row, value) table, the value column is categorical."""
+        return pd.DataFrame({
+            'row': self.__rows,
+            'value': pd.Categorical.from_codes(self.__codes, self.__categories)
+        })
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> 'JiraDataMembership':
+        """Restore a membership table from the (row, value) table returned by to_frame."""
+        categorical = pd.Categorical(frame['value'])
+        membership = cls.__new__(cls)
+        membership.__rows = frame['row'].to_numpy()
+        membership.__codes = categorical.codes
+        membership.__categories = categorical.categories
+        return membership
+
+    def merge(self, row_mapping: np.ndarray, changed_membership: 'JiraDataMembership') -> 'JiraDataMembership':
+        """
+        Membership table of merged tickets.
+
+        Args:
+            row_mapping (np.ndarray): Row id in the merged tickets of every row id of this table, -1 for tickets that were removed or changed
+            changed_membership (JiraDataMembership): Membership table of the changed and new tickets, by their row id in the merged tickets
+        """
+        rows = row_mapping[self.__rows]
+        kept = rows >= 0
+        categorical = union_categoricals([
+            pd.Categorical.from_codes(self.__codes[kept], self.__categories),
+            pd.Categorical.from_codes(changed_membership.__codes, changed_membership.__categories)
+        ], sort_categories=True).remove_unused_categories()
+
+        membership = JiraDataMembership.__new__(JiraDataMembership)
+        membership.__rows = np.concatenate([rows[kept], changed_membership.__rows])
+        membership.__codes = categorical.codes
+        membership.__categories = categorical.categories
+        return membership
+
+    def get_bitsets(self) -> np.ndarray:
+        """
+        Bitset of the values of every row id, bit i is set when the row id has the i-th sorted value.
+
+        Built on first use, row ids after the last row id with a value have no bitset.
+        """
+        if self.__bitsets is None:
+            bitsets = np.zeros(self.__rows.max() + 1 if len(self.__rows) else 0, dtype=np.uint64)
+            np.bitwise_or.at(bitsets, self.__rows, np.left_shift(np.uint64(1), self.__codes.astype(np.uint64)))
+            self.__bitsets = bitsets
+        return self.__bitsets
+
+    def __use_bitsets(self) -> bool:
+        return len(self.__categories) <= self.BITSET_MAX_VALUES
+
+    def __get_codes(self, values: list[str]) -> np.ndarray:
+        codes = self.__categories.get_indexer(values)
+        return codes[codes >= 0]
+
+    def __get_bitset(self, values: list[str]) -> np.uint64:
+        return np.bitwise_or.reduce(np.left_shift(np.uint64(1), self.__get_codes(values).astype(np.uint64)), initial=np.uint64(0))
+
+    def __get_row_bitsets(self, rows: np.ndarray) -> np.ndarray:
+        bitsets = self.get_bitsets()
+        rows = rows.astype(np.int64, copy=False)
+        if len(rows) == 0 or rows.max() < len(bitsets):
+            return bitsets[rows]
+
+        # Row ids after the last row id with a value have no values
+        row_bitsets = np.zeros(len(rows), dtype=np.uint64)
+        in_bitsets = rows < len(bitsets)
+        row_bitsets[in_bitsets] = bitsets[rows[in_bitsets]]
+        return row_bitsets
+
+    def get_rows(self, values: list[str]) -> np.ndarray:
+        """Row ids of the tickets that have any of the given values."""
+        if self.__use_bitsets():
+            return np.flatnonzero(self.get_bitsets() & self.__get_bitset(values))
+        return np.unique(self.__rows[np.isin(self.__codes, self.__get_codes(values))])
+
+    def has_values(self, rows: np.ndarray, values: list[str]) -> np.ndarray:
+        """Whether each of the given row ids has any of the given values."""
+        if self.__use_bitsets():
+            return (self.__get_row_bitsets(rows) & self.__get_bitset(values)) != 0
+        return np.isin(rows, self.get_rows(values))
+
+    def get_values(self, rows: np.ndarray = None) -> list[str]:
+        """Sorted distinct values of the given row ids, or of all rows when no row ids are given."""
+        if rows is not None and self.__use_bitsets():
+            bitset = int(np.bitwise_or.reduce(self.__get_row_bitsets(rows), initial=np.uint64(0)))
+            return [value for code, value in enumerate(self.__categories) if bitset >> code & 1]
+
+        codes = self.__codes if rows is None else self.__codes[np.isin(self.__rows, rows)]
+        return self.__categories[np.unique(codes)].tolist()
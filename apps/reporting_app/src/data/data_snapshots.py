@@ -0,0 +1,155 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from src.config.constants import COLUMN_NAME_CALCULATED_COMPONENTS, COLUMN_NAME_CALCULATED_SPRINT
+from src.data.data_sprints import JiraDataSprintIndex
+from src.data.data_memberships import JiraDataMembership
+from src.utils.file_utils import get_file_fingerprint
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class JiraDataSnapshot:
+    """
+    Processed columnar snapshot of a Jira CSV export, stored as uncompressed Feather files next to the CSV.
+
+    Holds the typed tickets, the sprint table and the exploded membership tables. While the CSV fingerprint
+    matches the one the snapshot was written for, the tables are read back instead of parsing and processing
+    the CSV again. Reading them is a fast columnar reload, not a memory map: the columns are copied into
+    pandas and the list columns are rebuilt row by row.
+    """
+    # Bump when the processed tickets or the snapshot tables change, so older snapshots get rebuilt
+    FORMAT_VERSION = 3
+    LIST_COLUMNS = [COLUMN_NAME_CALCULATED_COMPONENTS, COLUMN_NAME_CALCULATED_SPRINT]
+
+    def __init__(self, csv_filepath: str, ingestion_mode: str = None):
+        self.__snapshot_dirpath = f"{os.path.splitext(csv_filepath)[0]}.snapshot"
+        # Taken before the CSV is read, a CSV changing during the load won't match the snapshot written for it
+        self.__fingerprint = self.get_fingerprint(csv_filepath, ingestion_mode)
+
+    @property
+    def fingerprint(self) -> str:
+        return self.__fingerprint
+
+    @classmethod
+    def get_fingerprint(cls, csv_filepath: str, ingestion_mode: str = None) -> str:
+        """
+        Identifies the processed tickets of a CSV by its size and modification time, without reading it.
+        The ingestion mode is part of it as the columns and dtypes of the tickets depend on it.
+        """
+        return f"v{cls.FORMAT_VERSION}-{ingestion_mode or 'default'}-{get_file_fingerprint(csv_filepath)}"
+
+    @staticmethod
+    def is_available() -> bool:
+        return feather is not None
+
+    def __get_filepath(self, filename: str) -> str:
+        return os.path.join(self.__snapshot_dirpath, filename)
+
+    @contextmanager
+    def lock(self):
+        """
+        Exclusive lock on the snapshot across processes, e.g. the workers of a server reloading the same CSV.
+        The first one to take it writes the snapshot and the others load it instead of parsing the CSV.
+        Doesn't lock where fcntl isn't available.
+        """
+        if fcntl is None:
+            yield
+            return
+
+        with open(f"{self.__snapshot_dirpath}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def is_valid(self) -> bool:
+        try:
+            with open(self.__get_filepath('fingerprint.json')) as f:
+                return json.load(f).get('fingerprint') == self.__fingerprint
+        except (OSError, ValueError):
+            return False
+
+    def __read_table(self, name: str) -> pd.DataFrame:
+        return feather.read_table(self.__get_filepath(f"{name}.feather"), memory_map=True).to_pandas()
+
+    def __write_table(self, name: str, table: pd.DataFrame):
+        filepath = self.__get_filepath(f"{name}.feather")
+        # Uncompressed, reading the buffers back doesn't decompress them
+        feather.write_feather(table, f"{filepath}.tmp", compression='uncompressed')
+        os.replace(f"{filepath}.tmp", filepath)
+
+    def load(self) -> tuple[pd.DataFrame, JiraDataSprintIndex, JiraDataMembership, JiraDataMembership]:
+        """
+        Returns:
+            tuple: Tickets, sprint index, sprint memberships and component memberships,
+                or None when the snapshot is missing or was written for another version of the CSV
+        """
+        if not self.is_available() or not self.is_valid():
+            return None
+
+        start_time = time.perf_counter()
+        try:
+            tickets = self.__read_table('tickets')
+            # Arrow restores missing strings as None where read_csv gives NaN
+            object_columns = [column_name for column_name in tickets.columns
+                              if tickets[column_name].dtype == object and column_name not in self.LIST_COLUMNS]
+            tickets[object_columns] = tickets[object_columns].where(tickets[object_columns].notna(), np.nan)
+            # Arrow list columns come back as arrays
+            for column_name in self.LIST_COLUMNS:
+                if column_name in tickets.columns:
+                    tickets[column_name] = [list(values) if values is not None else [] for values in tickets[column_name]]
+
+            sprint_index = JiraDataSprintIndex.from_frames(self.__read_table('sprints'), self.__read_table('sprint_tickets'))
+            sprint_memberships = JiraDataMembership.from_frame(self.__read_table('sprint_memberships'))
+            component_memberships = JiraDataMembership.from_frame(self.__read_table('component_memberships'))
+        except (OSError, pa.ArrowException) as e:
+            print(f"Error reading snapshot {self.__snapshot_dirpath}: {str(e)}")
+            return None
+
+        print(f"Loaded snapshot {self.__snapshot_dirpath} in {time.perf_counter() - start_time:.3f}s")
+        return tickets, sprint_index, sprint_memberships, component_memberships
+
+    def save(self, tickets: pd.DataFrame, sprint_index: JiraDataSprintIndex,
+             sprint_memberships: JiraDataMembership, component_memberships: JiraDataMembership) -> bool:
+        if not self.is_available():
+            print("pyarrow is not installed, skipping snapshot")
+            return False
+
+        start_time = time.perf_counter()
+        fingerprint_filepath = self.__get_filepath('fingerprint.json')
+        try:
+            os.makedirs(self.__snapshot_dirpath, exist_ok=True)
+            # Invalidate the current snapshot before its tables get replaced
+            if os.path.exists(fingerprint_filepath):
+                os.remove(fingerprint_filepath)
+
+            self.__write_table('tickets', tickets)
+            sprints, sprint_tickets = sprint_index.to_frames()
+            self.__write_table('sprints', sprints)
+            self.__write_table('sprint_tickets', sprint_tickets)
+            self.__write_table('sprint_memberships', sprint_memberships.to_frame())
+            self.__write_table('component_memberships', component_memberships.to_frame())
+
+            with open(f"{fingerprint_filepath}.tmp", 'w') as f:
+                json.dump({'fingerprint': self.__fingerprint}, f)
+            os.replace(f"{fingerprint_filepath}.tmp", fingerprint_filepath)
+        except (OSError, pa.ArrowException) as e:
+            print(f"Error writing snapshot {self.__snapshot_dirpath}: {str(e)}")
+            return False
+
+        print(f"Saved snapshot {self.__snapshot_dirpath} in {time.perf_counter() - start_time:.3f}s")
+        return True
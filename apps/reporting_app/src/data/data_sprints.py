@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+from src.config.constants import (
+    COLUMN_NAME_SPRINT,
+    COLUMN_NAME_SPRINT_START_DATE,
+    COLUMN_NAME_SPRINT_END_DATE,
+    COLUMN_NAME_SPRINT_GOALS
+)
+from src.utils.string_utils import split_string_array, is_in_array
+
+class JiraDataSprint:
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def start_date(self) -> pd.Timestamp:
+        return self._start_date
+
+    @property
+    def end_date(self) -> pd.Timestamp:
+        return self._end_date
+
+    @property
+    def goals(self) -> str:
+        return self._goals
+
+    @property
+    def ticket_rows(self) -> np.ndarray:
+        return self._ticket_rows
+
+    def __init__(self, name: str, start_date: pd.Timestamp = None, end_date: pd.Timestamp = None, goals: str = None, ticket_rows: np.ndarray = None):
+        self._name = name
+        self._start_date = start_date
+        self._end_date = end_date
+        self._goals = goals
+        self._ticket_rows = ticket_rows if ticket_rows is not None else np.array([], dtype=np.int64)
+
+class JiraDataSprintIndex:
+    """
+    Normalized sprint table built once from the tickets DataFrame.
+
+    Maps every sprint name to its start date, end date, goals and the row ids (index labels)
+    of its member tickets, so sprint lookups don't need to scan the tickets again.
+    """
+    __sprints: dict[str, JiraDataSprint]
+
+    def __init__(self, tickets: pd.DataFrame):
+        self.__sprints = {}
+        if tickets.empty or COLUMN_NAME_SPRINT not in tickets.columns:
+            return
+
+        # Sprint details come from the first ticket of each sprint, tickets sharing the same
+        # sprint value are grouped so each distinct value is only split once
+        ticket_rows_by_sprint_value = tickets.groupby(COLUMN_NAME_SPRINT, sort=False).indices
+        row_ids = tickets.index.to_numpy()
+        detail_columns = [column_name for column_name in (COLUMN_NAME_SPRINT_START_DATE, COLUMN_NAME_SPRINT_END_DATE, COLUMN_NAME_SPRINT_GOALS)
+                          if column_name in tickets.columns]
+        sprint_details_tickets = tickets[detail_columns]
+        sprint_details = {}
+        ticket_rows = {}
+
+        for sprint_value, positions in ticket_rows_by_sprint_value.items():
+            first_ticket = sprint_details_tickets.iloc[positions[0]]
+            sprint_names = self.__split_sprint_value(sprint_value)
+
+            for sprint_index, sprint_name in enumerate(sprint_names):
+                ticket_rows.setdefault(sprint_name, []).append(row_ids[positions])
+                if sprint_name not in sprint_details:
+                    sprint_details[sprint_name] = self.__get_sprint_details(first_ticket, sprint_value, sprint_index)
+
+        for sprint_name, (start_date, end_date, goals) in sprint_details.items():
+            self.__sprints[sprint_name] = JiraDataSprint(
+                name=sprint_name,
+                start_date=start_date,
+                end_date=end_date,
+                goals=goals,
+                ticket_rows=np.unique(np.concatenate(ticket_rows[sprint_name]))
+            )
+
+    def to_frames(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Sprint table (name, start date, end date, goals) and long-form (row, sprint) ticket table."""
+        sprints = pd.DataFrame({
+            'name': [sprint.name for sprint in self.__sprints.values()],
+            'start_date': [sprint.start_date for sprint in self.__sprints.values()],
+            'end_date': [sprint.end_date for sprint in self.__sprints.values()],
+            'goals': [sprint.goals for sprint in self.__sprints.values()]
+        })
+        sprint_names = list(self.__sprints.keys())
+        ticket_rows = [sprint.ticket_rows for sprint in self.__sprints.values()]
+        sprint_tickets = pd.DataFrame({
+            'row': np.concatenate(ticket_rows) if ticket_rows else np.array([], dtype=np.int64),
+            'sprint': pd.Categorical.from_codes(
+                np.repeat(np.arange(len(sprint_names)), [len(rows) for rows in ticket_rows]).astype(np.int64),
+                categories=sprint_names)
+        })
+        return sprints, sprint_tickets
+
+    @classmethod
+    def from_frames(cls, sprints: pd.DataFrame, sprint_tickets: pd.DataFrame) -> 'JiraDataSprintIndex':
+        """Restore a sprint index from the tables returned by to_frames."""
+        sprint_index = cls.__new__(cls)
+        sprint_index.__sprints = {}
+        rows = sprint_tickets['row'].to_numpy()
+        ticket_rows_by_sprint = {sprint_name: rows[positions]
+                                 for sprint_name, positions in sprint_tickets.groupby('sprint', observed=True).indices.items()}
+
+        for name, start_date, end_date, goals in sprints[['name', 'start_date', 'end_date', 'goals']].itertuples(index=False):
+            sprint_index.__sprints[name] = JiraDataSprint(
+                name=name,
+                start_date=start_date if pd.notna(start_date) else None,
+                end_date=end_date if pd.notna(end_date) else None,
+                goals=goals if pd.notna(goals) else None,
+                ticket_rows=ticket_rows_by_sprint.get(name)
+            )
+
+        return sprint_index
+
+    def __split_sprint_value(self, sprint_value: str) -> list[str]:
+        return [sprint_name.strip() for sprint_name in split_string_array(sprint_value, '"-"')]
+
+    def __get_sprint_details(self, ticket: pd.Series, sprint_value: str, sprint_index: int) -> tuple[pd.Timestamp, pd.Timestamp, str]:
+        return (
+            self.__parse_date(self.__get_value(ticket, COLUMN_NAME_SPRINT_START_DATE, sprint_value, sprint_index)),
+            self.__parse_date(self.__get_value(ticket, COLUMN_NAME_SPRINT_END_DATE, sprint_value, sprint_index)),
+            self.__get_value(ticket, COLUMN_NAME_SPRINT_GOALS, sprint_value, sprint_index)
+        )
+
+    def merge(self, tickets: pd.DataFrame, row_mapping: np.ndarray, changed_sprint_index: 'JiraDataSprintIndex') -> 'JiraDataSprintIndex':
+        """
+        Sprint index of merged tickets, without going through the tickets that didn't change.
+
+        Args:
+            tickets (pd.DataFrame): Merged tickets
+            row_mapping (np.ndarray): Row id in the merged tickets of every row id of this index, -1 for tickets that were removed or changed
+            changed_sprint_index (JiraDataSprintIndex): Sprint index of the changed and new tickets, by their row id in the merged tickets
+
+        Returns:
+            JiraDataSprintIndex: Same sprint index as building one from the merged tickets
+        """
+        ticket_rows = {}
+        for sprint_name, sprint in self.__sprints.items():
+            rows = row_mapping[sprint.ticket_rows]
+            ticket_rows.setdefault(sprint_name, []).append(rows[rows >= 0])
+        for sprint_name, sprint in changed_sprint_index.__sprints.items():
+            ticket_rows.setdefault(sprint_name, []).append(sprint.ticket_rows)
+
+        # Like a full build, sprint details come from the first ticket of the sprint
+        first_tickets = {}
+        for sprint_name, rows in ticket_rows.items():
+            rows = np.unique(np.concatenate(rows))
+            if len(rows) > 0:
+                sprint_value = tickets.at[rows[0], COLUMN_NAME_SPRINT]
+                first_tickets[sprint_name] = (rows[0], self.__split_sprint_value(sprint_value).index(sprint_name), sprint_value, rows)
+
+        detail_columns = [column_name for column_name in (COLUMN_NAME_SPRINT_START_DATE, COLUMN_NAME_SPRINT_END_DATE, COLUMN_NAME_SPRINT_GOALS)
+                          if column_name in tickets.columns]
+        sprint_details_tickets = tickets[detail_columns]
+        sprint_index = JiraDataSprintIndex.__new__(JiraDataSprintIndex)
+        sprint_index.__sprints = {}
+        for sprint_name, (first_row, sprint_position, sprint_value, rows) in sorted(first_tickets.items(), key=lambda item: item[1][:2]):
+            start_date, end_date, goals = self.__get_sprint_details(sprint_details_tickets.loc[first_row], sprint_value, sprint_position)
+            sprint_index.__sprints[sprint_name] = JiraDataSprint(
+                name=sprint_name,
+                start_date=start_date,
+                end_date=end_date,
+                goals=goals,
+                ticket_rows=rows
+            )
+
+        return sprint_index
+
+    def __get_value(self, ticket: pd.Series, column_name: str, sprint_value: str, sprint_index: int):
+        # example value: ["2025-01-21T23:31:33.421Z"-"2025-02-04T23:59:43.560Z"]
+        if column_name not in ticket.index:
+            return None
+
+        value = ticket[column_name]
+        if is_in_array(sprint_value) and is_in_array(value):
+            values = split_string_array(value, '"-"')
+            return values[sprint_index] if sprint_index < len(values) else None
+
+        return value if pd.notna(value) else None
+
+    def __parse_date(self, value) -> pd.Timestamp:
+        if value is None or pd.isna(value):
+            return None
+
+        if isinstance(value, str):
+            if value.lower() == 'null' or value.strip() == '':
+                return None
+            try:
+                return pd.Timestamp(value)
+            except Exception:
+                return None
+
+        return value
+
+    def get_sprint(self, sprint_name: str) -> JiraDataSprint:
+        return self.__sprints.get(sprint_name)
+
+    def get_sprint_names(self) -> list[str]:
+        return list(self.__sprints.keys())
+
+    def get_sprint_date_range(self, sprint_name: str) -> tuple[pd.Timestamp, pd.Timestamp]:
+        sprint = self.get_sprint(sprint_name)
+        if sprint is None:
+            return None, None
+
+        return sprint.start_date, sprint.end_date
+
+    def get_ticket_rows(self, sprint_names: list[str]) -> np.ndarray:
+        ticket_rows = [self.__sprints[sprint_name].ticket_rows for sprint_name in sprint_names if sprint_name in self.__sprints]
+        if not ticket_rows:
+            return np.array([], dtype=np.int64)
+
+        return np.unique(np.concatenate(ticket_rows))
+
+    def sort_sprints_by_start_date(self, sprint_names: list[str]) -> list[str]:
+        def get_sort_key(sprint_name: str) -> pd.Timestamp:
+            start_date, _ = self.get_sprint_date_range(sprint_name)
+            if start_date is None:
+                # Use timezone-naive minimum timestamp
+                return pd.Timestamp.min.tz_localize(None)
+            # Ensure timezone-naive comparison by removing timezone
+            return start_date.tz_localize(None) if start_date.tz else start_date
+
+        # Sort sprints by start date descending
+        return sorted(sprint_names, key=get_sort_key, reverse=True)
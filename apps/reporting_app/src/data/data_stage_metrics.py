@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+from src.config.constants import (
+    STAGE_THRESHOLDS,
+    PRIORITY_ORDER,
+    STAGE_NAME_GROUPINGS,
+    STAGE_NAME_IGNORE,
+    ALL_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS,
+    THRESHOLD_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS,
+    COLUMN_NAME_ID,
+    COLUMN_NAME_PRIORITY,
+    COLUMN_NAME_PRIORITY_SORT
+)
+from src.data.data_loaders import JiraData
+from src.data.data_filters import JiraDataFilter, JiraDataFilterService
+from src.data.data_durations import JiraDataSprintDurationService
+from src.utils.stage_utils import StageUtils
+from src.utils.cache_utils import create_result_cache
+from src.config.app_settings import AppSettings
+
+class JiraDataStageMetricsService:
+    """Average days in every stage and threshold violations of the tickets of a sprint, shared by the sprint dashboard and the batch metrics."""
+
+    # Stage averages shared by every service instance, and by the workers of the server on a shared backend,
+    # keyed by dataset version, sprint and normalized filter
+    __cache = create_result_cache('avg_days', max_size=AppSettings().AVG_DAYS_CACHE_MAX_SIZE)
+
+    def __init__(self, jira_data: JiraData):
+        self.__jira_data = jira_data
+
+    @classmethod
+    def get_cache_stats(cls) -> dict:
+        return cls.__cache.get_stats()
+
+    @classmethod
+    def clear_cache(cls):
+        cls.__cache.clear()
+
+    def get_avg_days(self, sprint_name: str, filter: JiraDataFilter) -> pd.DataFrame:
+        """
+        Average days in sprint of the tickets that spent time in each stage, related stages are grouped.
+
+        Args:
+            sprint_name (str): Name of the sprint
+            filter (JiraDataFilter): Filter of the tickets of the sprint
+
+        Returns:
+            pd.DataFrame: Stage, Days, Ticket IDs and Grouped Stages of every stage with days
+        """
+        # Averages of previous versions are evicted as the ones of newer versions come in
+        cache_key = (self.__jira_data.version, sprint_name, filter.get_cache_key())
+        avg_days = JiraDataStageMetricsService.__cache.get(cache_key)
+        if avg_days is None:
+            avg_days = self.__get_avg_days(sprint_name, filter)
+            JiraDataStageMetricsService.__cache.set(cache_key, avg_days)
+
+        # Callers get their own copy of the cached frame
+        return avg_days.copy()
+
+    def __get_avg_days(self, sprint_name: str, filter: JiraDataFilter) -> pd.DataFrame:
+        jira_data_filter_result = JiraDataFilterService(self.__jira_data).filter_tickets(self.__jira_data.get_tickets(), filter, facets=[])
+        sprint_data = JiraDataSprintDurationService(self.__jira_data).get_tickets_duration_in_sprint(jira_data_filter_result.tickets, sprint_name)
+        # Only the ids and days in sprint are needed, selecting tickets of the narrow frame doesn't copy every column
+        sprint_data = sprint_data[[COLUMN_NAME_ID] + [col for col in ALL_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS if col in sprint_data.columns]]
+
+        # Calculate stage mean using stage_mappings
+        stage_sums = {}
+        stage_ticket_ids = {}  # New dictionary to store ticket IDs for each stage
+
+        for merged_stage, related_stages in STAGE_NAME_GROUPINGS.items():
+            # Calculate the mean for each group of related stages
+            related_stage_columns = [StageUtils.to_stage_in_sprint_duration_days_column_name(stage) for stage in related_stages]
+
+            # Filter out columns that don't exist in the DataFrame
+            existing_columns = [col for col in related_stage_columns if col in sprint_data.columns]
+
+            if not existing_columns:
+                stage_sums[merged_stage] = 0
+                stage_ticket_ids[merged_stage] = []
+                continue
+
+            # Get tickets with non-zero days in any of the related stages
+            tickets_in_stage = sprint_data[sprint_data[existing_columns].gt(0).any(axis=1)]
+
+            if not tickets_in_stage.empty:
+                total_days = tickets_in_stage[existing_columns].sum().sum()
+                num_tickets = len(tickets_in_stage)
+                stage_avg = total_days / num_tickets if num_tickets > 0 else 0
+                stage_sums[merged_stage] = round(stage_avg, 2)
+                stage_ticket_ids[merged_stage] = tickets_in_stage[COLUMN_NAME_ID].tolist()  # Store ticket IDs
+            else:
+                stage_sums[merged_stage] = 0
+                stage_ticket_ids[merged_stage] = []  # Empty list if no tickets
+
+        # Process remaining stages from ALL_STAGE_COLUMNS_DURATIONS_IN_DAYS
+        for stage_column in ALL_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS:
+            if stage_column not in sprint_data.columns:
+                continue  # Skip this column if it doesn't exist
+
+            stage_name = StageUtils.to_stage_name(stage_column)
+
+            # Skip if stage is already processed in STAGE_NAME_GROUPINGS
+            if any(stage_name in related_stages for related_stages in STAGE_NAME_GROUPINGS.values()):
+                continue
+
+            # Get tickets with non-zero days in this stage
+            tickets_in_stage = sprint_data[sprint_data[stage_column] > 0]
+
+            if not tickets_in_stage.empty:
+                total_days = tickets_in_stage[stage_column].sum()
+                num_tickets = len(tickets_in_stage)
+                stage_avg = total_days / num_tickets if num_tickets > 0 else 0
+                stage_sums[stage_name] = round(stage_avg, 2)
+                stage_ticket_ids[stage_name] = tickets_in_stage[COLUMN_NAME_ID].tolist()  # Store ticket IDs
+            else:
+                stage_ticket_ids[stage_name] = []  # Empty list if no tickets
+
+        # Remove ignored stages
+        stage_sums = {stage: value for stage, value in stage_sums.items()
+                     if stage not in STAGE_NAME_IGNORE}
+        stage_ticket_ids = {stage: ids for stage, ids in stage_ticket_ids.items()
+                            if stage not in STAGE_NAME_IGNORE}
+
+        # Filter out zero values
+        stage_sums = {k: v for k, v in stage_sums.items() if v > 0}
+        stage_ticket_ids = {k: v for k, v in stage_ticket_ids.items() if k in stage_sums}
+
+        return pd.DataFrame({
+            'Stage': list(stage_sums.keys()),
+            'Days': list(stage_sums.values()),
+            'Ticket IDs': [', '.join(map(str, ids)) for ids in stage_ticket_ids.values()],
+            'Grouped Stages': [', '.join(STAGE_NAME_GROUPINGS.get(stage, [stage])) for stage in stage_sums.keys()]
+        })
+
+    def __get_stage_days(self, tickets: pd.DataFrame, sprint_name: str) -> tuple[pd.DataFrame, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Days in sprint of every threshold stage as a matrix, with the warning and critical thresholds aligned to its columns
+        sprint_data = JiraDataSprintDurationService(self.__jira_data).get_tickets_duration_in_sprint(tickets, sprint_name)
+        # Sprints without dates have no days in sprint
+        stage_columns = [stage_col for stage_col in THRESHOLD_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS if stage_col in sprint_data.columns]
+        stage_names = np.array([StageUtils.to_stage_name(stage_col) for stage_col in stage_columns], dtype=object)
+        thresholds = [STAGE_THRESHOLDS.get(stage_name, STAGE_THRESHOLDS['default']) for stage_name in stage_names]
+
+        days = sprint_data[stage_columns].to_numpy(dtype=float)
+        warnings = np.array([stage_thresholds['warning'] for stage_thresholds in thresholds], dtype=float)
+        criticals = np.array([stage_thresholds['critical'] for stage_thresholds in thresholds], dtype=float)
+        return sprint_data, stage_names, days, warnings, criticals
+
+    def get_threshold_violations(self, tickets: pd.DataFrame, sprint_name: str) -> pd.DataFrame:
+        """
+        Tickets of the sprint with days in sprint over the warning threshold of any stage.
+
+        Args:
+            tickets (pd.DataFrame): Tickets of the sprint, a subset of the dataset tickets
+            sprint_name (str): Name of the sprint
+
+        Returns:
+            pd.DataFrame: In-sprint durations of the tickets with violations, with the exceeding_stages and threshold_ratio
+            (highest days over warning threshold) columns, sorted by priority then threshold ratio descending
+        """
+        sprint_data, stage_names, days, warnings, _ = self.__get_stage_days(tickets, sprint_name)
+
+        # Days missing in a stage never exceed its threshold
+        exceeding = days >= warnings
+        is_violation = exceeding.any(axis=1)
+        exceeding = exceeding[is_violation]
+        violation_days = days[is_violation]
+        # How many times over the warning threshold the worst stage is
+        threshold_ratios = np.where(exceeding, violation_days / warnings, 0).max(axis=1, initial=0)
+
+        # Only the exceeding stages of the violations are formatted, in the order of the stage columns of each row
+        rows, columns = np.nonzero(exceeding)
+        labels = stage_names[columns] + ' (' + np.char.mod('%.1f', violation_days[rows, columns]).astype(object) + 'd)'
+        row_offsets = np.cumsum(np.bincount(rows, minlength=len(exceeding)))[:-1]
+        exceeding_stages = [', '.join(row_labels) for row_labels in np.split(labels, row_offsets)] if len(exceeding) else []
+
+        # Sort by priority first, then threshold ratio, tickets not loaded through JiraDataLoader have no sort key yet
+        if COLUMN_NAME_PRIORITY_SORT in sprint_data.columns:
+            priority_sort = sprint_data[COLUMN_NAME_PRIORITY_SORT]
+        elif COLUMN_NAME_PRIORITY in sprint_data.columns:
+            priority_sort = sprint_data[COLUMN_NAME_PRIORITY].astype(object).map(PRIORITY_ORDER).fillna(PRIORITY_ORDER['N/A'])
+        else:
+            priority_sort = pd.Series(PRIORITY_ORDER['N/A'], index=sprint_data.index)
+        order = np.lexsort((-threshold_ratios, priority_sort.to_numpy()[is_violation]))
+
+        # The wide durations frame is only copied once, for the sorted violations
+        return sprint_data.iloc[np.flatnonzero(is_violation)[order]].assign(
+            exceeding_stages=np.array(exceeding_stages, dtype=object)[order],
+            threshold_ratio=threshold_ratios[order]
+        )
+
+    def get_threshold_violation_counts(self, tickets: pd.DataFrame, sprint_name: str) -> pd.DataFrame:
+        """
+        Number of tickets of the sprint at or over the warning and the critical threshold of each stage.
+
+        Args:
+            tickets (pd.DataFrame): Tickets of the sprint, a subset of the dataset tickets
+            sprint_name (str): Name of the sprint
+
+        Returns:
+            pd.DataFrame: Stage, Warning, Critical and the Warning Threshold and Critical Threshold of every threshold stage
+        """
+        _, stage_names, days, warnings, criticals = self.__get_stage_days(tickets, sprint_name)
+
+        return pd.DataFrame({
+            'Stage': stage_names.tolist(),
+            'Warning': (days >= warnings).sum(axis=0),
+            'Critical': (days >= criticals).sum(axis=0),
+            'Warning Threshold': warnings,
+            'Critical Threshold': criticals
+        })
@@ -0,0 +1,178 @@
+import json
+from typing import Callable
+import numpy as np
+import pandas as pd
+from src.config.constants import (
+    COLUMN_NAME_ID,
+    COLUMN_NAME_LINK,
+    COLUMN_NAME_PRIORITY,
+    COLUMN_NAME_TYPE,
+    COLUMN_NAME_PRIORITY_SORT,
+    COLUMN_NAME_TYPE_SORT
+)
+from src.data.data_loaders import JiraData
+from src.utils.cache_utils import LRUCache, SqliteCache
+from src.config.app_settings import AppSettings
+
+class JiraDataTicketTable:
+    """
+    Rows of an AG Grid ticket table kept on the server, the grid's infinite row model requests them page by page.
+
+    The rows are filtered and sorted with the filter and sort models of the request, the ID column is only
+    rendered as a markdown link to the ticket for the rows of the page.
+    """
+    # Columns sorted by the precomputed order of their values rather than alphabetically
+    SORT_KEY_COLUMNS = {COLUMN_NAME_PRIORITY: COLUMN_NAME_PRIORITY_SORT, COLUMN_NAME_TYPE: COLUMN_NAME_TYPE_SORT}
+
+    def __init__(self, rows: pd.DataFrame, column_names: list[str]):
+        """
+        Args:
+            rows (pd.DataFrame): Rows in their default order, with the table columns, the ticket link and the sort keys
+            column_names (list[str]): Columns sent to the grid
+        """
+        # Only the columns the pages and their sorting need are kept
+        kept_column_names = list(dict.fromkeys(column_names + [COLUMN_NAME_LINK] + list(self.SORT_KEY_COLUMNS.values())))
+        self.__rows = rows[[column_name for column_name in kept_column_names if column_name in rows.columns]].reset_index(drop=True)
+        self.__column_names = column_names
+        # Row positions of the last filter and sort models, the pages of a grid are requested with the same ones
+        self.__last_positions = (None, None)
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def __get_text_mask(self, values: pd.Series, condition: dict) -> np.ndarray:
+        text = values.astype(object).where(values.notna(), '').astype(str).str.lower()
+        value = str(condition.get('filter') or '').lower()
+        masks = {
+            'contains': lambda: text.str.contains(value, regex=False),
+            'notContains': lambda: ~text.str.contains(value, regex=False),
+            'equals': lambda: text == value,
+            'notEqual': lambda: text != value,
+            'startsWith': lambda: text.str.startswith(value),
+            'endsWith': lambda: text.str.endswith(value),
+            'blank': lambda: text.str.strip() == '',
+            'notBlank': lambda: text.str.strip() != ''
+        }
+        return masks.get(condition.get('type'), masks['contains'])().to_numpy(dtype=bool)
+
+    def __get_number_mask(self, values: pd.Series, condition: dict) -> np.ndarray:
+        numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+        value = condition.get('filter')
+        value_to = condition.get('filterTo')
+        with np.errstate(invalid='ignore'):
+            masks = {
+                'equals': lambda: numbers == value,
+                'notEqual': lambda: numbers != value,
+                'lessThan': lambda: numbers < value,
+                'lessThanOrEqual': lambda: numbers <= value,
+                'greaterThan': lambda: numbers > value,
+                'greaterThanOrEqual': lambda: numbers >= value,
+                'inRange': lambda: (numbers >= value) & (numbers <= value_to),
+                'blank': lambda: np.isnan(numbers),
+                'notBlank': lambda: ~np.isnan(numbers)
+            }
+            if condition.get('type') not in ('blank', 'notBlank') and value is None:
+                return np.ones(len(numbers), dtype=bool)
+            return masks.get(condition.get('type'), masks['equals'])()
+
+    def __get_filter_mask(self, values: pd.Series, column_filter: dict) -> np.ndarray:
+        # Combined filters have a list of conditions, older grids send condition1 and condition2
+        conditions = column_filter.get('conditions') or [column_filter[name] for name in ('condition1', 'condition2') if name in column_filter]
+        if conditions:
+            masks = [self.__get_filter_mask(values, {'filterType': column_filter.get('filterType'), **condition}) for condition in conditions]
+            return np.logical_or.reduce(masks) if column_filter.get('operator') == 'OR' else np.logical_and.reduce(masks)
+
+        if column_filter.get('filterType') == 'number':
+            return self.__get_number_mask(values, column_filter)
+        return self.__get_text_mask(values, column_filter)
+
+    def __get_positions(self, sort_model: list[dict], filter_model: dict) -> np.ndarray:
+        key = json.dumps([sort_model, filter_model], sort_keys=True, default=str)
+        last_key, last_positions = self.__last_positions
+        if key == last_key:
+            return last_positions
+
+        rows = self.__rows
+        mask = np.ones(len(rows), dtype=bool)
+        for column_name, column_filter in filter_model.items():
+            if column_name in rows.columns:
+                mask &= self.__get_filter_mask(rows[column_name], column_filter)
+        rows = rows[mask]
+
+        sort_columns = [(self.SORT_KEY_COLUMNS.get(sort['colId'], sort['colId']), sort.get('sort') != 'desc') for sort in sort_model]
+        sort_columns = [(column_name, ascending) for column_name, ascending in sort_columns if column_name in rows.columns]
+        if sort_columns:
+            rows = rows.sort_values([column_name for column_name, _ in sort_columns],
+                                    ascending=[ascending for _, ascending in sort_columns], kind='stable', na_position='last')
+
+        positions = rows.index.to_numpy()
+        self.__last_positions = (key, positions)
+        return positions
+
+    def get_rows(self, request: dict) -> dict:
+        """
+        Page of rows for a getRowsRequest of the grid.
+
+        Args:
+            request (dict): startRow, endRow, sortModel and filterModel of the page
+
+        Returns:
+            dict: getRowsResponse with the rowData of the page and the rowCount of all filtered rows
+        """
+        positions = self.__get_positions(request.get('sortModel') or [], request.get('filterModel') or {})
+        start_row = request.get('startRow') or 0
+        end_row = request.get('endRow')
+        page = self.__rows.iloc[positions[start_row:end_row]]
+
+        page_rows = page[self.__column_names].copy()
+        if COLUMN_NAME_ID in page_rows.columns and COLUMN_NAME_LINK in page.columns:
+            page_rows[COLUMN_NAME_ID] = '[' + page[COLUMN_NAME_ID].astype(str) + '](' + page[COLUMN_NAME_LINK].astype(str) + ')'
+
+        return {'rowData': page_rows.to_dict('records'), 'rowCount': len(positions)}
+
+class JiraDataTicketTableService:
+    """
+    Ticket tables of the grids, built once per dataset version and selection and shared by the page requests.
+
+    With a shared cache, tables built in other processes, e.g. by background callbacks, are read from it once
+    and then served from the memory of the process.
+    """
+    __cache = LRUCache(max_size=AppSettings().TICKET_TABLE_CACHE_MAX_SIZE)
+    __shared_cache = None
+
+    def __init__(self, jira_data: JiraData):
+        self.__jira_data = jira_data
+
+    @classmethod
+    def set_shared_cache(cls, shared_cache: SqliteCache):
+        cls.__shared_cache = shared_cache
+
+    @classmethod
+    def get_cache_stats(cls) -> dict:
+        return cls.__cache.get_stats()
+
+    @classmethod
+    def clear_cache(cls):
+        cls.__cache.clear()
+
+    def get_table(self, key: tuple, build_table: Callable[[], JiraDataTicketTable]) -> JiraDataTicketTable:
+        """
+        Args:
+            key (tuple): Hashable name and selections of the table, e.g. the grid id and the dropdown values
+            build_table (Callable[[], JiraDataTicketTable]): Builds the table when it isn't cached for the dataset version
+        """
+        # Tables of previous versions are evicted as the ones of newer versions are built, requests still running
+        # on a previous version after a reload don't clear the tables of the newer version
+        key = (self.__jira_data.version, key)
+        table = JiraDataTicketTableService.__cache.get(key)
+        if table is not None:
+            return table
+
+        shared_cache = JiraDataTicketTableService.__shared_cache
+        table = shared_cache.get(key) if shared_cache is not None else None
+        if table is None:
+            table = build_table()
+            if shared_cache is not None:
+                shared_cache.set(key, table)
+        JiraDataTicketTableService.__cache.set(key, table)
+        return table
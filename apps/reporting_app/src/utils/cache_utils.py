@@ -0,0 +1,264 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from src.config.app_settings import AppSettings
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+class LRUCache:
+    """Thread-safe, size-bounded least recently used cache with hit/miss counters, entries expire after ttl_seconds when set."""
+
+    def __init__(self, max_size: int = 128, ttl_seconds: float = None):
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__entries = OrderedDict()
+        self.__expiry_times = {}
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __is_expired(self, key) -> bool:
+        return self.__ttl_seconds is not None and self.__expiry_times[key] <= time.monotonic()
+
+    def __remove(self, key):
+        del self.__entries[key]
+        self.__expiry_times.pop(key, None)
+
+    def get(self, key, default=None):
+        with self.__lock:
+            if key in self.__entries and self.__is_expired(key):
+                self.__remove(key)
+
+            if key not in self.__entries:
+                self.__misses += 1
+                return default
+
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+    def set(self, key, value):
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            if self.__ttl_seconds is not None:
+                self.__expiry_times[key] = time.monotonic() + self.__ttl_seconds
+            while len(self.__entries) > self.__max_size:
+                self.__remove(next(iter(self.__entries)))
+
+    def __contains__(self, key) -> bool:
+        with self.__lock:
+            return key in self.__entries and not self.__is_expired(key)
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+    def clear(self):
+        """Remove all entries and reset the hit/miss counters."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__expiry_times.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            return {
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'size': len(self.__entries),
+                'max_size': self.__max_size
+            }
+
+def _get_storage_key(key) -> str:
+    # Keys are tuples of strings and numbers, their repr is the same in every process unlike their hash
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+class SqliteCache:
+    """
+    Cache shared by the processes of a host through a SQLite file, surviving their restarts. Values are pickled.
+
+    Entries expire ttl_seconds after they were set and the oldest entries beyond max_size are evicted. Dataset
+    versions are part of the keys, the entries of other versions are left to the processes still on them.
+    Errors of the file are printed and treated as misses, the caller calculates the result instead.
+    """
+
+    def __init__(self, filepath: str, name: str, max_size: int = 128, ttl_seconds: float = 3600):
+        self.__filepath = filepath
+        self.__name = name
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__connections = threading.local()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __get_connection(self) -> sqlite3.Connection:
+        # Connections can't be used by other threads, nor by the processes forked after they were opened
+        connection = getattr(self.__connections, 'connection', None)
+        if connection is None or self.__connections.pid != os.getpid():
+            if os.path.dirname(self.__filepath):
+                os.makedirs(os.path.dirname(self.__filepath), exist_ok=True)
+            connection = sqlite3.connect(self.__filepath, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS entries (name TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                               "set_time REAL NOT NULL, PRIMARY KEY (name, key))")
+            self.__connections.connection = connection
+            self.__connections.pid = os.getpid()
+        return connection
+
+    def __count(self, hit: bool):
+        with self.__lock:
+            if hit:
+                self.__hits += 1
+            else:
+                self.__misses += 1
+
+    def get(self, key, default=None):
+        try:
+            row = self.__get_connection().execute("SELECT value FROM entries WHERE name = ? AND key = ? AND set_time > ?",
+                                                  (self.__name, _get_storage_key(key), time.time() - self.__ttl_seconds)).fetchone()
+            value = pickle.loads(row[0]) if row is not None else None
+        except (sqlite3.Error, pickle.UnpicklingError) as e:
+            print(f"Error reading cache {self.__filepath}: {str(e)}")
+            row = None
+
+        self.__count(row is not None)
+        return value if row is not None else default
+
+    def set(self, key, value):
+        now = time.time()
+        try:
+            connection = self.__get_connection()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute("INSERT OR REPLACE INTO entries (name, key, value, set_time) VALUES (?, ?, ?, ?)",
+                                   (self.__name, _get_storage_key(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now))
+                connection.execute("DELETE FROM entries WHERE name = ? AND set_time <= ?", (self.__name, now - self.__ttl_seconds))
+                connection.execute("DELETE FROM entries WHERE name = ? AND key IN (SELECT key FROM entries WHERE name = ? "
+                                   "ORDER BY set_time DESC LIMIT -1 OFFSET ?)", (self.__name, self.__name, self.__max_size))
+        except sqlite3.Error as e:
+            print(f"Error writing cache {self.__filepath}: {str(e)}")
+
+    def __len__(self) -> int:
+        try:
+            return self.__get_connection().execute("SELECT COUNT(*) FROM entries WHERE name = ? AND set_time > ?",
+                                                   (self.__name, time.time() - self.__ttl_seconds)).fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def clear(self):
+        """Remove all entries of every process and reset the hit/miss counters of this one."""
+        try:
+            self.__get_connection().execute("DELETE FROM entries WHERE name = ?", (self.__name,))
+        except sqlite3.Error as e:
+            print(f"Error clearing cache {self.__filepath}: {str(e)}")
+        with self.__lock:
+            self.__hits = 0
+            self.__misses = 0
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            hits, misses = self.__hits, self.__misses
+        return {'hits': hits, 'misses': misses, 'size': len(self), 'max_size': self.__max_size}
+
+class RedisCache:
+    """
+    Cache shared by the processes of every host through a Redis-compatible server, needs the redis package. Values are pickled.
+
+    Entries expire ttl_seconds after they were set and the oldest entries beyond max_size are evicted. Dataset
+    versions are part of the keys, the entries of other versions are left to the processes still on them.
+    Errors of the server are printed and treated as misses, the caller calculates the result instead.
+    """
+
+    def __init__(self, url: str, name: str, max_size: int = 128, ttl_seconds: float = 3600):
+        # Connects on the first command, the connection pool opens new connections in forked processes
+        self.__client = redis.Redis.from_url(url)
+        self.__url = url
+        self.__prefix = f"reporting:{name}:"
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __count(self, hit: bool):
+        with self.__lock:
+            if hit:
+                self.__hits += 1
+            else:
+                self.__misses += 1
+
+    def get(self, key, default=None):
+        try:
+            value = self.__client.get(self.__prefix + _get_storage_key(key))
+            value = pickle.loads(value) if value is not None else None
+        except (redis.RedisError, pickle.UnpicklingError) as e:
+            print(f"Error reading cache {self.__url}: {str(e)}")
+            value = None
+
+        self.__count(value is not None)
+        return value if value is not None else default
+
+    def set(self, key, value):
+        storage_key = self.__prefix + _get_storage_key(key)
+        now = time.time()
+        try:
+            # Keys by set time, for evicting the oldest entries beyond max_size
+            pipeline = self.__client.pipeline()
+            pipeline.set(storage_key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=int(self.__ttl_seconds * 1000))
+            pipeline.zadd(f"{self.__prefix}keys", {storage_key: now})
+            pipeline.zremrangebyscore(f"{self.__prefix}keys", '-inf', now - self.__ttl_seconds)
+            pipeline.zrange(f"{self.__prefix}keys", 0, -self.__max_size - 1)
+            evicted_keys = pipeline.execute()[-1]
+            if evicted_keys:
+                self.__client.delete(*evicted_keys)
+                self.__client.zrem(f"{self.__prefix}keys", *evicted_keys)
+        except redis.RedisError as e:
+            print(f"Error writing cache {self.__url}: {str(e)}")
+
+    def __len__(self) -> int:
+        try:
+            return self.__client.zcount(f"{self.__prefix}keys", time.time() - self.__ttl_seconds, '+inf')
+        except redis.RedisError:
+            return 0
+
+    def clear(self):
+        """Remove all entries of every process and reset the hit/miss counters of this one."""
+        try:
+            keys = self.__client.zrange(f"{self.__prefix}keys", 0, -1)
+            self.__client.delete(f"{self.__prefix}keys", *keys)
+        except redis.RedisError as e:
+            print(f"Error clearing cache {self.__url}: {str(e)}")
+        with self.__lock:
+            self.__hits = 0
+            self.__misses = 0
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            hits, misses = self.__hits, self.__misses
+        return {'hits': hits, 'misses': misses, 'size': len(self), 'max_size': self.__max_size}
+
+def create_result_cache(name: str, max_size: int) -> 'LRUCache | SqliteCache | RedisCache':
+    """
+    Cache of the results named name on the backend of the app settings: in the memory of the process by default,
+    or shared by the workers of the server through a SQLite file or a Redis-compatible server.
+    """
+    app_settings = AppSettings()
+    backend = app_settings.REPORTING_RESULT_CACHE_BACKEND
+    ttl_seconds = app_settings.REPORTING_RESULT_CACHE_TTL_SECONDS
+    if backend == 'sqlite':
+        return SqliteCache(app_settings.REPORTING_RESULT_CACHE_PATH, name, max_size=max_size, ttl_seconds=ttl_seconds)
+    if backend == 'redis':
+        if redis is not None:
+            return RedisCache(app_settings.REPORTING_RESULT_CACHE_REDIS_URL, name, max_size=max_size, ttl_seconds=ttl_seconds)
+        print("redis is not installed, caching results in memory")
+    return LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
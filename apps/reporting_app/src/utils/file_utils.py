@@ -0,0 +1,6 @@
+import os
+
+def get_file_fingerprint(filepath: str) -> str:
+    """Identifies the content of a file by its size and modification time, without reading it."""
+    stat = os.stat(filepath)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
@@ -1,4 +1,8 @@
 import re
+import pandas as pd
+
+# Components are listed between square brackets at the start of the summary, e.g. [BFF|BFFWeb] - Update product catalog
+COMPONENTS_IN_SUMMARY_PATTERN = r'\[(.*?)\]'
 
 class JiraTicketHelpers:
     @staticmethod
@@ -7,7 +11,7 @@ class JiraTicketHelpers:
             return []
 
         # Extract content between square brackets if present
-        matches = re.findall(r'\[(.*?)\]', summary)
+        matches = re.findall(COMPONENTS_IN_SUMMARY_PATTERN, summary)
 
         if not matches:
                 return []
@@ -16,4 +20,10 @@ class JiraTicketHelpers:
         components = matches[0].split('|')
 
         # Clean and return components
-        return [comp.strip() for comp in components]
\ No newline at end of file
+        return [comp.strip() for comp in components]
+
+    @staticmethod
+    def get_components_from_summaries(summaries: pd.Series) -> pd.Series:
+        """get_components_from_summary of every summary as one long Series, every component has the index label of its summary."""
+        components = summaries.astype(object).str.extract(COMPONENTS_IN_SUMMARY_PATTERN, expand=False).dropna()
+        return components.str.split('|', regex=False).explode().str.strip()
@@ -0,0 +1,139 @@
+import bisect
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# Upper bounds of the latency histogram buckets in seconds, from cached lookups to full reloads
+LATENCY_BUCKETS_SECONDS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    escaped_labels = [(name, str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')) for name, value in labels]
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped_labels) + '}'
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class MetricsRegistry:
+    """
+    Thread-safe latency histograms and gauges rendered in the Prometheus text format.
+
+    Observing a latency is a bucket search and a few additions under a lock, cheap enough to leave on for every
+    request. Values that other objects already keep, e.g. cache counters, are read by collectors when rendering.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS_SECONDS):
+        self.__buckets = tuple(buckets)
+        self.__lock = threading.Lock()
+        self.__histograms = {}
+        self.__gauges = {}
+        self.__descriptions = {}
+        self.__collectors = []
+
+    def describe(self, name: str, description: str):
+        self.__descriptions[name] = description
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Add a latency to the histogram of the name and labels."""
+        key = (name, tuple(sorted(labels.items())))
+        bucket = bisect.bisect_left(self.__buckets, seconds)
+        with self.__lock:
+            histogram = self.__histograms.get(key)
+            if histogram is None:
+                histogram = self.__histograms[key] = [[0] * (len(self.__buckets) + 1), 0.0, 0]
+            histogram[0][bucket] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self.__lock:
+            self.__gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def add_collector(self, collect: Callable[[], list[tuple[str, str, dict, float]]]):
+        """
+        Args:
+            collect (Callable): Returns (name, type, labels, value) samples when the metrics are rendered, e.g. cache counters
+        """
+        self.__collectors.append(collect)
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    def timed(self, name: str, **labels):
+        """Decorator observing the latency of every call of the function."""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                start_time = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start_time, **labels)
+            return wrapper
+        return decorator
+
+    def get_histogram(self, name: str, **labels) -> dict:
+        """Cumulative bucket counts, sum and count of a histogram, None when nothing was observed."""
+        with self.__lock:
+            histogram = self.__histograms.get((name, tuple(sorted(labels.items()))))
+            if histogram is None:
+                return None
+            bucket_counts, total, count = list(histogram[0]), histogram[1], histogram[2]
+
+        cumulative_counts = [sum(bucket_counts[:index + 1]) for index in range(len(bucket_counts))]
+        return {'buckets': dict(zip(self.__buckets + (math.inf,), cumulative_counts)), 'sum': total, 'count': count}
+
+    def clear(self):
+        with self.__lock:
+            self.__histograms.clear()
+            self.__gauges.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self.__lock:
+            histograms = {key: (list(bucket_counts), total, count) for key, (bucket_counts, total, count) in self.__histograms.items()}
+            samples = [(name, 'gauge', labels, value) for (name, labels), value in self.__gauges.items()]
+
+        for collect in self.__collectors:
+            try:
+                samples.extend((name, metric_type, tuple(sorted(labels.items())), value) for name, metric_type, labels, value in collect())
+            except Exception as e:
+                print(f"Error collecting metrics: {str(e)}")
+
+        lines = []
+        written_names = set()
+        def write_header(name: str, metric_type: str):
+            if name not in written_names:
+                written_names.add(name)
+                if name in self.__descriptions:
+                    lines.append(f"# HELP {name} {self.__descriptions[name]}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+        for (name, labels), (bucket_counts, total, count) in sorted(histograms.items()):
+            write_header(name, 'histogram')
+            cumulative_count = 0
+            for upper_bound, bucket_count in zip(self.__buckets + (math.inf,), bucket_counts):
+                cumulative_count += bucket_count
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_value(upper_bound)),))} {cumulative_count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        for name, metric_type, labels, value in sorted(samples, key=lambda sample: (sample[0], sample[2])):
+            write_header(name, metric_type)
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
+
+# Shared by the data layer and the server, rendered on the /metrics route
+METRICS_REGISTRY = MetricsRegistry()
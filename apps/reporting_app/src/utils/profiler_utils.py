@@ -0,0 +1,72 @@
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+
+class CallbackProfiler:
+    """
+    Profiles requests with cProfile and keeps the profiles of the requests slower than a latency budget.
+
+    Every kept profile is a pstats dump with a JSON file of the same name holding the callback name, its inputs
+    and its latency, in a directory holding at most max_profiles of them; the oldest ones are removed first.
+    Open a dump with `python -m pstats <file>` or a viewer like snakeviz.
+    """
+
+    def __init__(self, directory: str, budget_seconds: float, max_profiles: int):
+        self.__directory = directory
+        self.__budget_seconds = budget_seconds
+        self.__max_profiles = max_profiles
+        self.__lock = threading.Lock()
+
+    def start(self) -> cProfile.Profile:
+        """Profile of the current thread, None when another profiler is already active (Python 3.12 allows only one)."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return None
+        return profile
+
+    def stop(self, profile: cProfile.Profile, elapsed_seconds: float, name: str, details: dict) -> str:
+        """
+        Args:
+            profile (cProfile.Profile): Profile returned by start
+            elapsed_seconds (float): Latency of the profiled request
+            name (str): Name of the profiled callback
+            details (dict): Inputs and other values of the request, saved next to the profile
+
+        Returns:
+            str: Filepath of the saved profile, None when the request was within the budget
+        """
+        profile.disable()
+        if elapsed_seconds < self.__budget_seconds:
+            return None
+
+        # Names start with the time so the oldest profiles sort first
+        file_name = f"{time.time_ns()}_{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)[:100]}"
+        filepath = os.path.join(self.__directory, f"{file_name}.pstats")
+        with self.__lock:
+            os.makedirs(self.__directory, exist_ok=True)
+            profile.dump_stats(filepath)
+            with open(os.path.join(self.__directory, f"{file_name}.json"), 'w') as file:
+                json.dump({'name': name, 'elapsed_seconds': elapsed_seconds, 'budget_seconds': self.__budget_seconds, **details},
+                          file, indent=2, default=str)
+            self.__remove_oldest_profiles()
+
+        print(f"Saved profile of {name} taking {elapsed_seconds:.2f}s to {filepath}")
+        return filepath
+
+    def get_profiles(self) -> list[str]:
+        """Filepaths of the kept profiles, oldest first."""
+        if not os.path.isdir(self.__directory):
+            return []
+        return [os.path.join(self.__directory, file_name) for file_name in sorted(os.listdir(self.__directory)) if file_name.endswith('.pstats')]
+
+    def __remove_oldest_profiles(self):
+        profiles = self.get_profiles()
+        for filepath in profiles[:max(len(profiles) - self.__max_profiles, 0)]:
+            for removed_filepath in (filepath, filepath[:-len('.pstats')] + '.json'):
+                if os.path.exists(removed_filepath):
+                    os.remove(removed_filepath)
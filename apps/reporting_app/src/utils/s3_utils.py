@@ -1,35 +1,200 @@
 import boto3
+import gzip
+import json
 import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
 from src.config.app_settings import AppSettings
+from src.utils.file_utils import get_file_fingerprint
 
-def download_csv_from_s3():
-    """Downloads the CSV file from S3 if bucket name is set."""
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+S3_COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+class S3DownloadResult:
+    STATUS_DOWNLOADED = 'downloaded'
+    STATUS_NOT_MODIFIED = 'not_modified'
+    STATUS_SKIPPED = 'skipped'
+    STATUS_FAILED = 'failed'
+
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def bytes_transferred(self) -> int:
+        return self._bytes_transferred
+
+    @property
+    def seconds(self) -> float:
+        return self._seconds
+
+    def __init__(self, status: str, key: str = None, bytes_transferred: int = 0, seconds: float = 0):
+        self._status = status
+        self._key = key
+        self._bytes_transferred = bytes_transferred
+        self._seconds = seconds
+
+def get_s3_key(csv_path: str, compression: str = '') -> str:
+    """S3 key of the CSV file, the filename with the extension of the compression if the object is compressed."""
+    return os.path.basename(csv_path) + S3_COMPRESSION_EXTENSIONS.get(compression, '')
+
+def _get_metadata_filepath(csv_path: str) -> str:
+    return f"{csv_path}.s3.json"
+
+def _read_download_metadata(csv_path: str, key: str) -> dict:
+    # Only valid while the local file is the one that was downloaded for the same key
+    try:
+        with open(_get_metadata_filepath(csv_path)) as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if metadata.get('key') != key or not os.path.exists(csv_path) or metadata.get('fingerprint') != get_file_fingerprint(csv_path):
+        return None
+
+    return metadata
+
+def _write_download_metadata(csv_path: str, key: str, head: dict):
+    metadata_filepath = _get_metadata_filepath(csv_path)
+    with open(f"{metadata_filepath}.tmp", 'w') as f:
+        json.dump({
+            'key': key,
+            'etag': head.get('ETag'),
+            'last_modified': head['LastModified'].isoformat() if head.get('LastModified') else None,
+            'fingerprint': get_file_fingerprint(csv_path)
+        }, f)
+    os.replace(f"{metadata_filepath}.tmp", metadata_filepath)
+
+def _head_object_if_modified(s3_client, bucket_name: str, key: str, metadata: dict) -> dict:
+    """Object metadata, or None when the object didn't change since the local file was downloaded."""
+    conditions = {}
+    if metadata is not None and metadata.get('etag'):
+        conditions['IfNoneMatch'] = metadata['etag']
+    elif metadata is not None and metadata.get('last_modified'):
+        conditions['IfModifiedSince'] = datetime.fromisoformat(metadata['last_modified'])
+
+    try:
+        return s3_client.head_object(Bucket=bucket_name, Key=key, **conditions)
+    except ClientError as e:
+        if e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304:
+            return None
+        raise
+
+def _open_compressed_file(filepath: str, compression: str):
+    if compression == 'gzip':
+        return gzip.open(filepath, 'rb')
+
+    return zstandard.ZstdDecompressor().stream_reader(open(filepath, 'rb'), closefd=True)
+
+def _decompress_file(compressed_filepath: str, csv_path: str, compression: str):
+    # Decompressed next to the CSV file and renamed over it, so readers never see a partial file
+    fd, tmp_filepath = tempfile.mkstemp(dir=os.path.dirname(csv_path) or '.', prefix=f".{os.path.basename(csv_path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as csv_file, _open_compressed_file(compressed_filepath, compression) as compressed_file:
+            shutil.copyfileobj(compressed_file, csv_file, length=1024 * 1024)
+        os.replace(tmp_filepath, csv_path)
+    except Exception:
+        os.remove(tmp_filepath)
+        raise
+
+def _download_object(s3_client, bucket_name: str, key: str, csv_path: str, compression: str) -> int:
+    app_settings = AppSettings()
+    # Objects over the threshold are downloaded as concurrent ranged GETs into a temporary file that is renamed
+    # once complete, the ranges are pinned to the ETag of the object so a concurrent upload fails the download
+    transfer_config = TransferConfig(
+        multipart_threshold=app_settings.S3_MULTIPART_THRESHOLD_MB * 1024 * 1024,
+        multipart_chunksize=app_settings.S3_MULTIPART_CHUNKSIZE_MB * 1024 * 1024,
+        max_concurrency=app_settings.S3_MAX_CONCURRENCY
+    )
+    bytes_transferred = [0]
+    bytes_transferred_lock = threading.Lock()
+
+    def on_progress(byte_count: int):
+        with bytes_transferred_lock:
+            bytes_transferred[0] += byte_count
+
+    if not compression:
+        s3_client.download_file(bucket_name, key, csv_path, Config=transfer_config, Callback=on_progress)
+        return bytes_transferred[0]
+
+    fd, compressed_filepath = tempfile.mkstemp(dir=os.path.dirname(csv_path) or '.', prefix=f".{os.path.basename(csv_path)}.",
+                                               suffix=S3_COMPRESSION_EXTENSIONS[compression])
+    os.close(fd)
+    try:
+        s3_client.download_file(bucket_name, key, compressed_filepath, Config=transfer_config, Callback=on_progress)
+        _decompress_file(compressed_filepath, csv_path, compression)
+    finally:
+        if os.path.exists(compressed_filepath):
+            os.remove(compressed_filepath)
+
+    return bytes_transferred[0]
+
+def download_csv_from_s3(s3_client=None) -> S3DownloadResult:
+    """
+    Downloads the CSV file from S3 if bucket name is set.
+
+    The download is skipped when the object has the same ETag (or, without one, Last-Modified) as when the
+    local file was downloaded. With S3_CSV_COMPRESSION set to gzip or zstd, the compressed object
+    (filename.gz or filename.zst) is downloaded and decompressed into the CSV file.
+    """
     app_settings = AppSettings()
     bucket_name = app_settings.S3_BUCKET_NAME
     csv_path = app_settings.REPORTING_CSV_PATH
+    compression = app_settings.S3_CSV_COMPRESSION
 
     if not bucket_name:
         print("S3 bucket name not set, skipping S3 download")
-        return
+        return S3DownloadResult(S3DownloadResult.STATUS_SKIPPED)
 
     if not csv_path:
         print("CSV path not set, skipping S3 download")
-        return
+        return S3DownloadResult(S3DownloadResult.STATUS_SKIPPED)
+
+    if compression and compression not in S3_COMPRESSION_EXTENSIONS:
+        print(f"Unsupported S3 compression {compression}, skipping S3 download")
+        return S3DownloadResult(S3DownloadResult.STATUS_SKIPPED)
 
+    if compression == 'zstd' and zstandard is None:
+        print("zstandard is not installed, skipping S3 download of the zstd compressed CSV")
+        return S3DownloadResult(S3DownloadResult.STATUS_SKIPPED)
+
+    key = get_s3_key(csv_path, compression)
+    start_time = time.perf_counter()
     try:
-        s3_client = boto3.client('s3')
+        if s3_client is None:
+            s3_client = boto3.client('s3')
 
         # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+        os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
+
+        head = _head_object_if_modified(s3_client, bucket_name, key, _read_download_metadata(csv_path, key))
+        if head is None:
+            seconds = time.perf_counter() - start_time
+            print(f"CSV in S3 bucket {bucket_name} is unchanged, keeping {csv_path} ({seconds:.2f}s)")
+            return S3DownloadResult(S3DownloadResult.STATUS_NOT_MODIFIED, key, 0, seconds)
 
         # Download the file
-        print(f"Downloading CSV from S3 bucket {bucket_name} to {csv_path}")
-        s3_client.download_file(
-            bucket_name,
-            os.path.basename(csv_path),  # Use filename as S3 key
-            csv_path
-        )
-        print("Successfully downloaded CSV from S3")
+        print(f"Downloading {key} ({head['ContentLength']:,} bytes) from S3 bucket {bucket_name} to {csv_path}")
+        bytes_transferred = _download_object(s3_client, bucket_name, key, csv_path, compression)
+        _write_download_metadata(csv_path, key, head)
+        seconds = time.perf_counter() - start_time
+        print(f"Successfully downloaded CSV from S3, {bytes_transferred:,} bytes in {seconds:.2f}s "
+              f"({bytes_transferred / 1024 / 1024 / max(seconds, 1e-6):.1f} MB/s)")
+        return S3DownloadResult(S3DownloadResult.STATUS_DOWNLOADED, key, bytes_transferred, seconds)
 
     except Exception as e:
-        print(f"Error downloading from S3: {str(e)}")
\ No newline at end of file
+        print(f"Error downloading from S3: {str(e)}")
+        return S3DownloadResult(S3DownloadResult.STATUS_FAILED, key, 0, time.perf_counter() - start_time)
@@ -1,27 +1,32 @@
+import numpy as np
 import pandas as pd
+from datetime import datetime
 from src.config.constants import (
     THRESHOLD_STAGE_COLUMNS_DURATION_IN_DAYS,
     ALL_STAGE_COLUMNS_DURATIONS_IN_DAYS,
     COLUMN_NAME_CREATED_DATE
 )
 from src.utils.sprint_utils import get_sprint_date_range
+from src.data.data_sprints import JiraDataSprintIndex
+from src.utils.metrics_utils import METRICS_REGISTRY
 
 class StageUtils:
     @staticmethod
-    def calculate_tickets_duration_in_sprint(df: pd.DataFrame, sprint_name: str) -> pd.DataFrame:
+    @METRICS_REGISTRY.timed('reporting_calculate_tickets_duration_in_sprint_seconds')
+    def calculate_tickets_duration_in_sprint(df: pd.DataFrame, sprint_name: str, sprint_index: JiraDataSprintIndex = None) -> pd.DataFrame:
         """
         Calculate stage metrics for tickets within a sprint's date range.
 
         Args:
             df (pd.DataFrame): DataFrame containing ticket data
-            sprint_start_date (datetime): Start date of the sprint
-            sprint_end_date (datetime): End date of the sprint
+            sprint_name (str): Name of the sprint
+            sprint_index (JiraDataSprintIndex): Precomputed sprint index to look up the sprint dates from
 
         Returns:
             pd.DataFrame: DataFrame with stage metrics for the sprint period
         """
 
-        sprint_start_date, sprint_end_date = get_sprint_date_range(df, sprint_name)
+        sprint_start_date, sprint_end_date = get_sprint_date_range(df, sprint_name, sprint_index)
 
         if sprint_start_date is None or sprint_end_date is None:
             return df  # Return original dataframe if no sprint dates
@@ -29,23 +34,20 @@ class StageUtils:
         # Filter tickets that were active before the sprint ended
         sprint_tickets = df[
             (df[COLUMN_NAME_CREATED_DATE] <= sprint_end_date)
-        ].copy()
+        ]
 
-        # Calculate stage end dates based on start dates and durations
+        # Calculate stage end dates based on start dates and durations, one column per stage
+        stage_end_dates = {}
         for stage in ALL_STAGE_COLUMNS_DURATIONS_IN_DAYS:
             start_col = StageUtils.to_stage_start_date_column_name(stage)
             end_col = StageUtils.to_stage_end_date_column_name(stage)
             days_col = StageUtils.to_stage_duration_days_column_name(stage)
 
-            # Calculate end date by adding days to start date, handling null values
-            mask = sprint_tickets[start_col].notna()  # Only calculate for non-null start dates
+            # Null start dates or durations produce a null end date
+            days_numeric = pd.to_numeric(sprint_tickets[days_col], errors='coerce')
+            stage_end_dates[end_col] = sprint_tickets[start_col] + pd.to_timedelta(days_numeric, unit='D')
 
-            # Convert days to numeric and create timedelta
-            days_numeric = pd.to_numeric(sprint_tickets.loc[mask, days_col], errors='coerce')
-            delta = pd.to_timedelta(days_numeric, unit='D')
-
-            # Add the timedelta to start dates
-            sprint_tickets.loc[mask, end_col] = sprint_tickets.loc[mask, start_col] + delta
+        sprint_tickets = StageUtils.__assign_columns(sprint_tickets, pd.DataFrame(stage_end_dates, index=sprint_tickets.index))
 
         # Filter tickets that were active during the sprint
         active_mask = pd.Series(True, index=sprint_tickets.index)
@@ -55,24 +57,74 @@ class StageUtils:
 
         sprint_tickets = sprint_tickets[active_mask]
 
-        # Calculate days spent in each stage during the sprint period
-        for stage in THRESHOLD_STAGE_COLUMNS_DURATION_IN_DAYS:
-            start_col = StageUtils.to_stage_start_date_column_name(stage)
-            end_col = StageUtils.to_stage_end_date_column_name(stage)
-            sprint_days_col = StageUtils.to_stage_in_sprint_duration_days_column_name(stage)
-
-            # Calculate overlapping days between stage period and sprint period, excluding weekends
-            sprint_tickets[sprint_days_col] = sprint_tickets.apply(
-                lambda row: len([
-                    d for d in pd.date_range(
-                        max(sprint_start_date, row[start_col]),
-                        min(sprint_end_date, row[end_col]),
-                        freq='D'
-                    ) if d.weekday() < 5  # 0-4 are Monday-Friday
-                ]) if pd.notna(row[start_col]) and pd.notna(row[end_col]) else 0,
-                axis=1
-            )
-        return sprint_tickets
+        # Calculate days spent in each stage during the sprint period, all stages in one batched pass
+        start_cols = [StageUtils.to_stage_start_date_column_name(stage) for stage in THRESHOLD_STAGE_COLUMNS_DURATION_IN_DAYS]
+        end_cols = [StageUtils.to_stage_end_date_column_name(stage) for stage in THRESHOLD_STAGE_COLUMNS_DURATION_IN_DAYS]
+        sprint_days_cols = [StageUtils.to_stage_in_sprint_duration_days_column_name(stage) for stage in THRESHOLD_STAGE_COLUMNS_DURATION_IN_DAYS]
+
+        days_in_sprint = StageUtils.count_business_days_overlap(
+            StageUtils.__to_utc_datetime64(sprint_tickets[start_cols]),
+            StageUtils.__to_utc_datetime64(sprint_tickets[end_cols]),
+            sprint_start_date,
+            sprint_end_date
+        )
+
+        return StageUtils.__assign_columns(sprint_tickets, pd.DataFrame(days_in_sprint, columns=sprint_days_cols, index=sprint_tickets.index))
+
+    @staticmethod
+    def count_business_days_overlap(starts: np.ndarray, ends: np.ndarray, window_start: datetime, window_end: datetime) -> np.ndarray:
+        """
+        Count the weekdays between each start/end pair once clipped to a window.
+
+        Matches counting the Monday-Friday days of pd.date_range(max(window_start, start), min(window_end, end), freq='D'),
+        for whole arrays at once. Pairs with a missing start or end count as 0 days.
+
+        Args:
+            starts (np.ndarray): datetime64 array of period start dates in UTC
+            ends (np.ndarray): datetime64 array of period end dates in UTC, same shape as starts
+            window_start (datetime): Start of the window, e.g. the sprint start date
+            window_end (datetime): End of the window, e.g. the sprint end date
+
+        Returns:
+            np.ndarray: Integer array of weekday counts with the same shape as starts
+        """
+        starts = np.asarray(starts, dtype='datetime64[ns]')
+        ends = np.asarray(ends, dtype='datetime64[ns]')
+        window_start = StageUtils.__to_utc_datetime64(window_start)
+        window_end = StageUtils.__to_utc_datetime64(window_end)
+
+        valid = ~(np.isnat(starts) | np.isnat(ends))
+        overlap_start = np.where(valid, np.maximum(starts, window_start), window_start)
+        overlap_end = np.where(valid, np.minimum(ends, window_end), window_start)
+
+        # date_range steps in whole days from the overlap start, so the last day included is
+        # the overlap start date plus the number of whole days until the overlap end
+        whole_days = (overlap_end - overlap_start) // np.timedelta64(1, 'D')
+        valid &= whole_days >= 0
+        first_day = overlap_start.astype('datetime64[D]')
+        last_day = first_day + np.where(valid, whole_days, 0).astype('timedelta64[D]')
+
+        return np.where(valid, np.busday_count(first_day, last_day + 1), 0)
+
+    @staticmethod
+    def __to_utc_datetime64(value):
+        """Convert a timestamp or a DataFrame of timestamps to timezone-naive UTC datetime64 values."""
+        if isinstance(value, pd.DataFrame):
+            if value.empty:
+                return np.empty(value.shape, dtype='datetime64[ns]')
+            return np.column_stack([StageUtils.__to_utc_datetime64(value[col]) for col in value.columns])
+        if isinstance(value, pd.Series):
+            return pd.to_datetime(value, utc=True).dt.tz_localize(None).to_numpy(dtype='datetime64[ns]')
+
+        timestamp = pd.Timestamp(value)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+        return timestamp.to_datetime64().astype('datetime64[ns]')
+
+    @staticmethod
+    def __assign_columns(df: pd.DataFrame, columns: pd.DataFrame) -> pd.DataFrame:
+        """Add or replace several columns at once, avoiding a fragmented DataFrame."""
+        return pd.concat([df.drop(columns=columns.columns, errors='ignore'), columns], axis=1)
 
     @staticmethod
     def to_stage_name(stage_series):
@@ -0,0 +1,25 @@
+import time
+from contextlib import contextmanager
+
+class StartupTimer:
+    """Times the startup phases of the app and prints each one as it completes."""
+
+    def __init__(self):
+        self.__start_time = time.perf_counter()
+        self.__phases = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start_time
+            self.__phases[name] = seconds
+            print(f"Startup phase '{name}' took {seconds:.2f}s ({self.get_elapsed_seconds():.2f}s since startup)")
+
+    def get_phases(self) -> dict[str, float]:
+        return dict(self.__phases)
+
+    def get_elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.__start_time
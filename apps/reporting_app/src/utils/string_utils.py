@@ -14,4 +14,18 @@ def is_in_array(value:str)->bool:
 
     if isinstance(value, str) and '[' in value:
         return True
-    return False
\ No newline at end of file
+    return False
+
+def split_string_arrays(values: pd.Series, separator: str) -> pd.Series:
+    """
+    split_string_array of every value as one long Series, every part has the index label of its value.
+
+    Parts of the same value keep their order, values are ordered by index label.
+    """
+    values = values.astype(object)
+    is_array = values.str.contains('[', regex=False, na=False).to_numpy(dtype=bool)
+    parts = (values[is_array].str.strip('[]').str.replace('null', '"null"', regex=False)
+             .str.split(separator, regex=False).explode()
+             .str.replace('"', '', regex=False).str.strip())
+
+    return pd.concat([parts, values[~is_array]]).sort_index(kind='stable')
@@ -0,0 +1,34 @@
+import pandas as pd
+from benchmarks.synthetic_jira_data import generate_jira_csv, get_stage_names
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from src.data.data_stage_metrics import JiraDataStageMetricsService
+from src.data.data_filters import JiraDataFilter
+from src.config.constants import COLUMN_NAME_CALCULATED_SPRINT, COLUMN_NAME_STAGE
+from tests.test_helpers import TestHelpers
+
+def test_generate_jira_csv(tmp_path):
+    csv_filepath = generate_jira_csv(str(tmp_path / 'jira_metrics_synthetic.csv'), ticket_count=2000, sprint_count=12,
+                                     stage_column_count=12, multi_sprint_ratio=0.3, seed=1)
+
+    # Same columns as the mock export for the generated stages
+    columns = pd.read_csv(csv_filepath, nrows=0).columns.tolist()
+    mock_columns = pd.read_csv(TestHelpers.get_jira_data_csv_filepath(), nrows=0).columns.tolist()
+    stage_names = get_stage_names(12)
+    assert len(stage_names) == 12
+    assert set(columns) == {column for column in mock_columns if not column.startswith('Stage ') or
+                            any(column in (f"Stage {stage_name} days", f"Stage {stage_name} start", f"Stage {stage_name} recurrence") for stage_name in stage_names)}
+
+    jira_data = JiraDataLoader(CsvDataLoader(use_schema=True)).load_data(csv_filepath)
+    jira_tickets = jira_data.get_tickets()
+    sprint_counts = jira_tickets[COLUMN_NAME_CALCULATED_SPRINT].map(len)
+    assert len(jira_tickets) == 2000
+    assert sprint_counts.isin([1, 2]).all()
+    assert 0.15 < (sprint_counts == 2).mean() < 0.3
+    assert set(jira_tickets[COLUMN_NAME_STAGE].dropna()) <= set(stage_names)
+
+    sprint_name = jira_tickets[COLUMN_NAME_CALCULATED_SPRINT].iloc[0][0]
+    assert not JiraDataStageMetricsService(jira_data).get_avg_days(sprint_name, JiraDataFilter(sprints=[sprint_name])).empty
+
+    # The same arguments generate the same tickets
+    pd.testing.assert_frame_equal(pd.read_csv(csv_filepath), pd.read_csv(generate_jira_csv(
+        str(tmp_path / 'jira_metrics_synthetic_2.csv'), ticket_count=2000, sprint_count=12, stage_column_count=12, multi_sprint_ratio=0.3, seed=1)))
@@ -0,0 +1,94 @@
+import json
+import shutil
+import subprocess
+import dash
+import dash._callback
+import pytest
+from src.components.tabs.sprint_dashboard.callbacks import avg_cycletime_callbacks, sprint_tickets_with_options_callbacks
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from src.data.data_tables import JiraDataTicketTableService
+from tests.test_helpers import TestHelpers
+
+@pytest.fixture(params=[False, True], ids=['foreground', 'background'])
+def registered_callbacks(request, monkeypatch):
+    # Registers the callbacks of a fresh app without adding them to the ones of the other tests
+    monkeypatch.setattr(dash._callback, 'GLOBAL_CALLBACK_LIST', [])
+    monkeypatch.setattr(dash._callback, 'GLOBAL_CALLBACK_MAP', {})
+    monkeypatch.setattr(dash._callback, 'GLOBAL_INLINE_SCRIPTS', [])
+    jira_data = JiraDataLoader(CsvDataLoader()).load_data(TestHelpers.get_jira_data_csv_filepath())
+    app = dash.Dash(__name__)
+    avg_cycletime_callbacks.init_callbacks(app, lambda: jira_data, background=request.param)
+    sprint_tickets_with_options_callbacks.init_callbacks(app, lambda: jira_data, background=request.param)
+    return jira_data, request.param
+
+def get_callback(output: str) -> dict:
+    return next(callback for callback in dash._callback.GLOBAL_CALLBACK_LIST if callback['output'] == output)
+
+def get_purge_callback(grid_id: str) -> tuple[dict, str]:
+    for callback in dash._callback.GLOBAL_CALLBACK_LIST:
+        function_name = (callback.get('clientside_function') or {}).get('function_name')
+        inline_script = next((script for script in dash._callback.GLOBAL_INLINE_SCRIPTS if function_name and function_name in script), None)
+        if inline_script is not None and f"'{grid_id}'" in inline_script:
+            return callback, inline_script
+    return None, None
+
+def run_purge_callback(callback: dict, inline_script: str) -> list[str]:
+    # Runs the clientside function in node against a grid API recording the grids it purges
+    clientside_function = callback['clientside_function']
+    script = f"""
+    globalThis.window = globalThis;
+    const purged = [];
+    globalThis.dash_ag_grid = {{getApiAsync: id => Promise.resolve({{purgeInfiniteCache: () => purged.push(id)}})}};
+    {inline_script}
+    window.dash_clientside['{clientside_function['namespace']}']['{clientside_function['function_name']}']();
+    setTimeout(() => console.log(JSON.stringify(purged)), 0);
+    """
+    result = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+@pytest.mark.parametrize('grid_id, selection_inputs', [
+    ('sprint-tickets-with-options-table', ['sprint-dropdown', 'type-dropdown', 'ticket-dropdown', 'squad-dropdown',
+                                           'components-dropdown', 'sprint-tickets-with-options-radio']),
+    ('tickets-in-stage-table', ['tickets-in-stage-bar-chart', 'sprint-dropdown', 'type-dropdown', 'ticket-dropdown',
+                                'squad-dropdown', 'components-dropdown', 'assignee-dropdown'])
+])
+def test_selection_change_purges_grid_pages(registered_callbacks, grid_id, selection_inputs):
+    _, background = registered_callbacks
+    build_callback = get_callback(f'{grid_id}-built.data')
+    callback, inline_script = get_purge_callback(grid_id)
+
+    # every input of the rows builds the table, in a worker process with background callbacks
+    assert [input['id'] for input in build_callback['inputs']] == selection_inputs
+    assert (build_callback['background'] is not None) == background
+    # the pages are only sliced from the built table in the request thread
+    assert get_callback(f'{grid_id}.getRowsResponse')['background'] is None
+
+    # the grid only requests rows again once its pages are purged, after the table is built
+    assert callback is not None
+    assert [input['id'] for input in callback['inputs']] == [f'{grid_id}-built']
+    assert callback['prevent_initial_call']
+    if shutil.which('node') is not None:
+        assert run_purge_callback(callback, inline_script) == [grid_id]
+
+def test_getrowsrequest_after_selection_change_returns_new_selection(registered_callbacks, mocker):
+    jira_data, _ = registered_callbacks
+    build_tickets_in_sprint_table = dash._callback.GLOBAL_CALLBACK_MAP['sprint-tickets-with-options-table-built.data']['callback'].__wrapped__
+    update_tickets_in_sprint_table = dash._callback.GLOBAL_CALLBACK_MAP['sprint-tickets-with-options-table.getRowsResponse']['callback'].__wrapped__
+    sprint_names = jira_data.get_sprint_index().get_sprint_names()
+    request = {'startRow': 0, 'endRow': 100}
+
+    first_built = build_tickets_in_sprint_table(sprint_names[0], [], None, None, [], 'all')
+    first_response = update_tickets_in_sprint_table(request, sprint_names[0], [], None, None, [], 'all', first_built)
+
+    # until the table of the next selection is built, its pages are neither built nor taken from the previous table
+    get_table = mocker.spy(JiraDataTicketTableService, 'get_table')
+    pending_response = update_tickets_in_sprint_table(request, sprint_names[1], [], None, None, [], 'all', first_built)
+    assert pending_response == {'rowData': [], 'rowCount': 0}
+    assert get_table.call_count == 0
+
+    # the same page of the next selection is sliced from its own table once it is built
+    built = build_tickets_in_sprint_table(sprint_names[1], [], None, None, [], 'all')
+    second_response = update_tickets_in_sprint_table(request, sprint_names[1], [], None, None, [], 'all', built)
+    assert built['version'] == jira_data.version
+    assert second_response['rowCount'] == built['rowCount'] == len(jira_data.get_sprint_index().get_ticket_rows([sprint_names[1]]))
+    assert second_response['rowData'] != first_response['rowData']
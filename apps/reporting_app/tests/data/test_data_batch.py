@@ -0,0 +1,47 @@
+import pandas as pd
+from src.data.data_batch import JiraDataBatchMetrics, get_batch_metrics
+from src.data.data_filters import JiraDataFilter
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from src.data.data_stage_metrics import JiraDataStageMetricsService
+from tests.test_helpers import TestHelpers
+
+def test_jiradatabatchmetrics_getsprintmetrics(mocker):
+    mock_csv_data_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_data_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data = JiraDataLoader(mock_csv_data_loader).load_data("jira_metrics.csv")
+    sprint_name = 'Dory Sprint 7.2.25'
+
+    batch_metrics_results = JiraDataBatchMetrics(jira_data).get_sprint_metrics(sprint_name)
+
+    dora_metrics = batch_metrics_results.dora_metrics
+    assert (dora_metrics['sprint'] == sprint_name).all()
+    assert dora_metrics[['project', 'squad']].values.tolist()[0] == ['Dory Squad', None]
+    # Every project once for all its squads, then for each of its squads
+    assert (dora_metrics.groupby('project')['squad'].apply(lambda squads: squads.isna().sum()) == 1).all()
+
+    # Same stage averages as the sprint dashboard for the project and squad
+    stage_averages = batch_metrics_results.stage_averages
+    for project, squad in dora_metrics[['project', 'squad']].values.tolist():
+        expected_stage_averages = JiraDataStageMetricsService(jira_data).get_avg_days(
+            sprint_name, JiraDataFilter(projects=[project], squads=[squad], sprints=[sprint_name]))
+        combination_stage_averages = stage_averages[(stage_averages['project'] == project) &
+                                                    (stage_averages['squad'].isna() if squad is None else stage_averages['squad'] == squad)]
+        assert combination_stage_averages['Stage'].tolist() == expected_stage_averages['Stage'].tolist()
+        assert combination_stage_averages['Days'].tolist() == expected_stage_averages['Days'].tolist()
+
+    threshold_violations = batch_metrics_results.threshold_violations
+    assert not threshold_violations.empty
+    assert (threshold_violations['threshold_ratio'] >= 1).all()
+
+def test_getbatchmetrics_process_pool(tmp_path, monkeypatch):
+    monkeypatch.setenv('REPORTING_SNAPSHOT_ENABLED', 'false')
+    csv_filepath = TestHelpers.copy_jira_data_csv(tmp_path)
+
+    batch_metrics_results = get_batch_metrics(csv_filepath, projects=['Sitecore'], max_workers=2)
+    expected_batch_metrics_results = get_batch_metrics(csv_filepath, projects=['Sitecore'], max_workers=1)
+
+    assert batch_metrics_results.dora_metrics['project'].unique().tolist() == ['Sitecore']
+    assert batch_metrics_results.dora_metrics['sprint'].nunique() == 4
+    pd.testing.assert_frame_equal(batch_metrics_results.stage_averages, expected_batch_metrics_results.stage_averages)
+    pd.testing.assert_frame_equal(batch_metrics_results.threshold_violations, expected_batch_metrics_results.threshold_violations)
+    pd.testing.assert_frame_equal(batch_metrics_results.dora_metrics, expected_batch_metrics_results.dora_metrics)
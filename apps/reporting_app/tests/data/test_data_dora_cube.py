@@ -0,0 +1,68 @@
+import pytest
+from src.data.data_dora import JiraDataDoraMetrics, JiraDataDoraMetricsFilter, JiraDataDoraMetricsResults
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from tests.test_helpers import TestHelpers
+from datetime import datetime, timezone
+
+FILTERS = [
+    JiraDataDoraMetricsFilter(projects=None, squads=None, start_date=None, end_date=None),
+    JiraDataDoraMetricsFilter(projects=['Digital MECCA App'], squads=None,
+                              start_date=datetime(2025, 1, 1, tzinfo=timezone.utc), end_date=datetime(2025, 3, 31, 23, 59, 59, 999999, tzinfo=timezone.utc)),
+    JiraDataDoraMetricsFilter(projects=None, squads=['LFApp'], start_date=datetime(2025, 2, 5, 13, tzinfo=timezone.utc), end_date=None),
+    JiraDataDoraMetricsFilter(projects=None, squads=None, start_date=None, end_date=datetime(2025, 2, 5, tzinfo=timezone.utc)),
+    # Within a single week
+    JiraDataDoraMetricsFilter(projects=None, squads=None, start_date=datetime(2025, 3, 4, tzinfo=timezone.utc), end_date=datetime(2025, 3, 6, tzinfo=timezone.utc))
+]
+
+def get_values(result: JiraDataDoraMetricsResults) -> list[float]:
+    return [result.lead_time_for_changes.value, result.deployment_frequency.value,
+            result.change_failure_rate.value, result.mean_time_to_recovery.value]
+
+def test_jiradatadoracube_getmetrics(mocker):
+    mock_csv_data_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_data_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data = JiraDataLoader(mock_csv_data_loader).load_data("jira_metrics.csv")
+    jira_data_dora_metrics = JiraDataDoraMetrics(jira_data.get_tickets(), jira_data.get_sprint_index(), jira_data.get_sprint_memberships())
+
+    assert jira_data.get_dora_cube(build=False) is None
+    dora_cube = jira_data.get_dora_cube()
+    assert jira_data.get_dora_cube(build=False) is dora_cube
+
+    # Same metrics as filtering the tickets, up to the order of the summed lead times
+    for filter in FILTERS:
+        assert get_values(dora_cube.get_metrics(filter)) == pytest.approx(get_values(jira_data_dora_metrics.get_metrics(filter)))
+
+def test_jiradatadoracube_getweeklymetrics(mocker):
+    mock_csv_data_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_data_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data = JiraDataLoader(mock_csv_data_loader).load_data("jira_metrics.csv")
+    filter = JiraDataDoraMetricsFilter(projects=['Digital MECCA App'], squads=None,
+                                       start_date=datetime(2025, 1, 1, tzinfo=timezone.utc), end_date=datetime(2025, 3, 31, 23, 59, 59, 999999, tzinfo=timezone.utc))
+
+    weekly_metrics = jira_data.get_dora_cube().get_weekly_metrics(filter)
+
+    assert list(weekly_metrics.columns) == ['lead_time_for_changes', 'deployments', 'change_failure_rate', 'mean_time_to_recovery']
+    assert weekly_metrics.index.is_monotonic_increasing
+    assert (weekly_metrics.index.weekday == 0).all()
+    assert weekly_metrics.index[0] >= datetime(2024, 12, 30, tzinfo=timezone.utc)
+    assert weekly_metrics.index[-1] <= datetime(2025, 3, 31, tzinfo=timezone.utc)
+    assert weekly_metrics['deployments'].sum() == round(jira_data.get_dora_cube().get_metrics(filter).deployment_frequency.value * 64)
+
+def test_jiradatadoracube_merge(tmp_path):
+    csv_filepath = str(tmp_path / "jira_metrics.csv")
+    TestHelpers.get_updated_jira_data().to_csv(csv_filepath, index=False)
+    jira_data_loader = JiraDataLoader(CsvDataLoader())
+    previous_jira_data = jira_data_loader.load_data(TestHelpers.get_jira_data_csv_filepath())
+    previous_jira_data.get_dora_cube()
+
+    jira_data = jira_data_loader.merge_data(previous_jira_data, csv_filepath)
+    expected_jira_data = jira_data_loader.load_data(csv_filepath)
+
+    # The previous cube is merged rather than left to be built again
+    assert jira_data.get_dora_cube(build=False) is not None
+    for filter in FILTERS:
+        assert get_values(jira_data.get_dora_cube().get_metrics(filter)) == pytest.approx(get_values(expected_jira_data.get_dora_cube().get_metrics(filter)))
+        weekly_metrics = jira_data.get_dora_cube().get_weekly_metrics(filter)
+        expected_weekly_metrics = expected_jira_data.get_dora_cube().get_weekly_metrics(filter)
+        assert weekly_metrics.index.equals(expected_weekly_metrics.index)
+        assert weekly_metrics.to_numpy() == pytest.approx(expected_weekly_metrics.to_numpy())
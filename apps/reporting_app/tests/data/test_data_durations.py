@@ -0,0 +1,51 @@
+import pandas as pd
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from src.data.data_filters import JiraDataFilter, JiraDataFilterService
+from src.data.data_durations import JiraDataSprintDurationService
+from src.utils.stage_utils import StageUtils
+from src.config.constants import COLUMN_NAME_TYPE
+from tests.test_helpers import TestHelpers
+
+def test_jiradatasprintdurationservice_get_tickets_duration_in_sprint(mocker):
+    mock_csv_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data_loader = JiraDataLoader(mock_csv_loader)
+    jira_data = jira_data_loader.load_data("jira_metrics.csv")
+    sprint_name = 'MOB - Sprint 1'
+
+    JiraDataSprintDurationService.clear_cache()
+    sprint_duration_service = JiraDataSprintDurationService(jira_data)
+    sprint_tickets = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), JiraDataFilter(sprints=[sprint_name])).tickets
+    stories = sprint_tickets[sprint_tickets[COLUMN_NAME_TYPE] == 'Story']
+
+    for tickets in (sprint_tickets, stories):
+        result = sprint_duration_service.get_tickets_duration_in_sprint(tickets, sprint_name)
+        expected = StageUtils.calculate_tickets_duration_in_sprint(tickets, sprint_name, jira_data.get_sprint_index())
+        pd.testing.assert_frame_equal(result, expected)
+
+    # The sprint is calculated once, the second subset is selected from the cached frame
+    cache_stats = JiraDataSprintDurationService.get_cache_stats()
+    assert cache_stats['misses'] == 1
+    assert cache_stats['hits'] == 1
+    assert cache_stats['size'] == 1
+
+def test_jiradatasprintdurationservice_carries_over_unchanged_sprints(tmp_path):
+    csv_filepath = str(tmp_path / "jira_metrics.csv")
+    TestHelpers.get_updated_jira_data().to_csv(csv_filepath, index=False)
+    jira_data_loader = JiraDataLoader(CsvDataLoader())
+    previous_jira_data = jira_data_loader.load_data(TestHelpers.get_jira_data_csv_filepath())
+    jira_data = jira_data_loader.merge_data(previous_jira_data, csv_filepath)
+    sprint_name = 'MOB - Sprint 1'
+
+    JiraDataSprintDurationService.clear_cache()
+    previous_sprint_tickets = previous_jira_data.get_tickets().loc[previous_jira_data.get_sprint_index().get_ticket_rows([sprint_name])]
+    JiraDataSprintDurationService(previous_jira_data).get_tickets_duration_in_sprint(previous_sprint_tickets, sprint_name)
+
+    hits = JiraDataSprintDurationService.get_cache_stats()['hits']
+    sprint_tickets = jira_data.get_tickets().loc[jira_data.get_sprint_index().get_ticket_rows([sprint_name])]
+    result = JiraDataSprintDurationService(jira_data).get_tickets_duration_in_sprint(sprint_tickets, sprint_name)
+    expected = StageUtils.calculate_tickets_duration_in_sprint(sprint_tickets, sprint_name, jira_data.get_sprint_index())
+    pd.testing.assert_frame_equal(result, expected)
+
+    # The merged version took the frame of the previous version instead of calculating it again
+    assert JiraDataSprintDurationService.get_cache_stats()['hits'] == hits + 1
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+from src.data.data_facets import JiraDataFacet, JiraDataFacetIndex
+from src.data.data_filters import JiraDataFilter, JiraDataFilterService
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from src.data.data_memberships import JiraDataMembership
+from src.config.constants import COLUMN_NAME_CALCULATED_COMPONENTS, COLUMN_NAME_CALCULATED_SPRINT, COLUMN_NAME_PROJECT
+from tests.test_helpers import TestHelpers
+
+FILTERS = [
+    JiraDataFilter(projects=['Digital MECCA App']),
+    JiraDataFilter(projects=['Digital MECCA App'], squads=['LFApp'], sprints=['MOB - Sprint 1']),
+    JiraDataFilter(projects=['Digital MECCA App'], squads=['LFApp'], sprints=['MOB - Sprint 1'], ticket_types=['Story'], components=['Frontend']),
+    JiraDataFilter(sprints=['Dory Sprint 7.2.25'], assignees=[None], ticket_types=[]),
+    JiraDataFilter(squads=['UFApp', 'LFApp'], ticketIds=['DMA-1462', 'XYZ-1'])
+]
+
+def test_jiradatafacet():
+    tickets = pd.DataFrame({
+        COLUMN_NAME_CALCULATED_COMPONENTS: [['BFF', 'SFCC'], [np.nan], ['FEWeb'], [], ['SFCC'], []]
+    })
+    facet = JiraDataFacet.from_membership(JiraDataMembership(tickets, COLUMN_NAME_CALCULATED_COMPONENTS), len(tickets))
+
+    assert facet.get_count(['SFCC', 'BFF', 'XM']) == 3
+    assert facet.get_rows(['SFCC', 'BFF']).tolist() == [0, 4]
+    assert facet.get_rows(['XM']).tolist() == []
+    assert facet.has_values(np.array([0, 2, 4, 5]), ['SFCC']).tolist() == [True, False, True, False]
+    assert facet.get_values(np.array([0, 1, 2])) == ['BFF', 'FEWeb', 'SFCC']
+    assert facet.get_values(np.array([3, 5])) == []
+
+def test_jiradatafacetindex_non_default_index():
+    tickets = pd.DataFrame({
+        COLUMN_NAME_PROJECT: ['Web', 'App', 'Web', 'App'],
+        COLUMN_NAME_CALCULATED_SPRINT: [['Sprint 2'], ['Sprint 1'], ['Sprint 1'], []],
+        COLUMN_NAME_CALCULATED_COMPONENTS: [['SFCC'], [], ['BFF'], ['SFCC']]
+    }, index=[2, 0, 3, 1])
+    facet_index = JiraDataFacetIndex(tickets,
+                                     JiraDataMembership(tickets, COLUMN_NAME_CALCULATED_SPRINT),
+                                     JiraDataMembership(tickets, COLUMN_NAME_CALCULATED_COMPONENTS))
+
+    # Column and membership facets agree on the row ids, which select the tickets by label
+    rows = facet_index.get_rows({'projects': ['Web'], 'sprints': ['Sprint 1']})
+    assert rows.tolist() == [3]
+    assert tickets.loc[rows, COLUMN_NAME_CALCULATED_COMPONENTS].tolist() == [['BFF']]
+    assert facet_index.get_rows({'projects': ['App'], 'components': ['SFCC']}).tolist() == [1]
+    assert facet_index.get_values('projects', np.array([2, 3])) == ['Web']
+    assert facet_index.get_values('sprints', np.array([0, 1])) == ['Sprint 1']
+
+def test_jiradatafilterservice_filter_tickets_facet_index(mocker):
+    mock_csv_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data = JiraDataLoader(mock_csv_loader).load_data("jira_metrics.csv")
+    JiraDataFilterService.clear_cache()
+
+    for filter in FILTERS:
+        # The dataset tickets are filtered through the facet index, other tickets with boolean masks
+        jira_data_filter_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter)
+        expected_jira_data_filter_result = JiraDataFilterService().filter_tickets(jira_data.get_tickets(), filter)
+
+        pd.testing.assert_frame_equal(jira_data_filter_result.tickets, expected_jira_data_filter_result.tickets)
+        for facet_name in JiraDataFilterService.FACET_NAMES:
+            assert getattr(jira_data_filter_result, facet_name) == getattr(expected_jira_data_filter_result, facet_name)
+
+def test_jiradatafilterservice_filter_tickets_facets(mocker):
+    mock_csv_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data = JiraDataLoader(mock_csv_loader).load_data("jira_metrics.csv")
+    JiraDataFilterService.clear_cache()
+    filter = FILTERS[1]
+
+    jira_data_filter_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter, facets=['sprints'])
+    assert jira_data_filter_result.sprints == ['MOB - Sprint 1', 'LFA - Sprint 31', 'LFA - Sprint 30']
+    assert jira_data_filter_result.squads is None
+    assert jira_data_filter_result.components is None
+
+    # Facets the cached result doesn't have yet are listed on a hit
+    jira_data_filter_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter)
+    assert JiraDataFilterService.get_cache_stats()['hits'] == 1
+    assert jira_data_filter_result.squads == ['LFApp']
+    assert jira_data_filter_result.ticket_types == ['Bug', 'Story', 'Task']
+
+    jira_data_filter_result = JiraDataFilterService().filter_tickets(jira_data.get_tickets(), filter, facets=[])
+    assert not jira_data_filter_result.tickets.empty
+    assert jira_data_filter_result.sprints is None
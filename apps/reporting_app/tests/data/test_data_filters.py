@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 from src.data.data_loaders import JiraDataLoader, CsvDataLoader
 from src.data.data_filters import JiraDataFilter, JiraDataFilterService
@@ -73,4 +74,58 @@ def test_jiradataloader_filter_tickets(mocker):
     assert jira_data_filter_result.sprints == ['MOB - Sprint 1']
     assert jira_data_filter_result.ticket_types == ['Story']
     assert jira_data_filter_result.components == ['Frontend']
-    assert jira_data_filter_result.tickets[COLUMN_NAME_ID].iloc[0] == 'DMA-1462'
\ No newline at end of file
+    assert jira_data_filter_result.tickets[COLUMN_NAME_ID].iloc[0] == 'DMA-1462'
+
+def test_jiradatafilterservice_caches_filter_results(mocker):
+    mock_csv_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data_loader = JiraDataLoader(mock_csv_loader)
+    jira_data = jira_data_loader.load_data("jira_metrics.csv")
+    JiraDataFilterService.clear_cache()
+
+    filter = JiraDataFilter(projects=['Digital MECCA App'], squads=['LFApp'], sprints=['MOB - Sprint 1'], ticketIds=[None])
+    stats = JiraDataFilterService.get_cache_stats()
+    first_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter)
+    assert JiraDataFilterService.get_cache_stats()['misses'] == stats['misses'] + 1
+
+    # the same selection in a different form is answered from the cache
+    filter = JiraDataFilter(projects=['Digital MECCA App'], squads=['LFApp'], sprints=['MOB - Sprint 1'], ticket_types=[], assignees=[None])
+    second_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter)
+    assert JiraDataFilterService.get_cache_stats()['hits'] == stats['hits'] + 1
+    assert second_result.tickets.equals(first_result.tickets)
+    assert second_result.sprints == first_result.sprints
+    assert second_result.components == first_result.components
+
+    # a reloaded dataset without a CSV file to fingerprint gets a new version and does not see the previous results
+    reloaded_jira_data = jira_data_loader.load_data("jira_metrics.csv")
+    JiraDataFilterService(reloaded_jira_data).filter_tickets(reloaded_jira_data.get_tickets(), filter)
+    assert JiraDataFilterService.get_cache_stats()['misses'] == stats['misses'] + 2
+    assert JiraDataFilterService.get_cache_stats()['size'] == 2
+
+    # a request still running on the previous version doesn't clear the results of the reloaded one
+    JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter)
+    JiraDataFilterService(reloaded_jira_data).filter_tickets(reloaded_jira_data.get_tickets(), filter)
+    assert JiraDataFilterService.get_cache_stats()['hits'] == stats['hits'] + 3
+
+def test_jiradatafilterservice_shares_filter_results_of_the_same_csv(tmp_path):
+    csv_filepath = TestHelpers.copy_jira_data_csv(tmp_path)
+    JiraDataFilterService.clear_cache()
+
+    # e.g. two workers of the server loading the CSV, each with its own loader
+    jira_data = JiraDataLoader(CsvDataLoader(), use_snapshot=False).load_data(csv_filepath)
+    other_jira_data = JiraDataLoader(CsvDataLoader(), use_snapshot=False).load_data(csv_filepath)
+    assert other_jira_data is not jira_data
+    assert other_jira_data.version == jira_data.version
+
+    filter = JiraDataFilter(projects=['Digital MECCA App'], squads=['LFApp'], sprints=['MOB - Sprint 1'])
+    stats = JiraDataFilterService.get_cache_stats()
+    first_result = JiraDataFilterService(jira_data).filter_tickets(jira_data.get_tickets(), filter)
+    second_result = JiraDataFilterService(other_jira_data).filter_tickets(other_jira_data.get_tickets(), filter)
+    assert JiraDataFilterService.get_cache_stats()['misses'] == stats['misses'] + 1
+    assert JiraDataFilterService.get_cache_stats()['hits'] == stats['hits'] + 1
+    assert second_result.tickets.equals(first_result.tickets)
+
+    # a changed CSV gets a new version
+    modified_time = os.path.getmtime(csv_filepath) + 1
+    os.utime(csv_filepath, (modified_time, modified_time))
+    assert JiraDataLoader(CsvDataLoader(), use_snapshot=False).load_data(csv_filepath).version != jira_data.version
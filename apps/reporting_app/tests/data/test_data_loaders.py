@@ -1,6 +1,9 @@
+import os
+import time
 import pandas as pd
-from src.data.data_loaders import JiraDataLoader
+from src.data.data_loaders import JiraDataLoader, JiraDataSingleton
 from src.data.data_loaders import CsvDataLoader
+from src.config.constants import CSV_CATEGORICAL_COLUMNS, COLUMN_NAME_CALCULATED_SPRINT, COLUMN_NAME_CALCULATED_COMPONENTS
 from tests.test_helpers import TestHelpers
 
 def test_jiradataloader_load_data(mocker):
@@ -21,3 +24,84 @@ def test_jiradataloader_load_data(mocker):
         'Tieramisu'
         ]
 
+def test_jiradataloader_load_data_components():
+    jira_tickets = JiraDataLoader(CsvDataLoader()).load_data(TestHelpers.get_jira_data_csv_filepath()).get_tickets()
+
+    # COM- tickets get the SFCC component, without duplicates
+    sfcc_components = jira_tickets.loc[jira_tickets['ID'].str.startswith('COM-'), COLUMN_NAME_CALCULATED_COMPONENTS]
+    assert sfcc_components.map(lambda components: 'SFCC' in components).all()
+    assert jira_tickets[COLUMN_NAME_CALCULATED_COMPONENTS].map(lambda components: len(components) == len(set(components))).all()
+
+def test_csvdataloader_load_data_with_schema():
+    csv_filepath = TestHelpers.get_jira_data_csv_filepath()
+    jira_tickets = CsvDataLoader().load_data(csv_filepath)
+    typed_jira_tickets = CsvDataLoader(use_schema=True).load_data(csv_filepath)
+
+    # Only the columns declared in constants.py are read
+    assert 'Labels' not in typed_jira_tickets.columns
+    assert set(typed_jira_tickets.columns) < set(jira_tickets.columns)
+
+    for column_name in CSV_CATEGORICAL_COLUMNS:
+        assert isinstance(typed_jira_tickets[column_name].dtype, pd.CategoricalDtype)
+    for column_name in typed_jira_tickets.columns:
+        pd.testing.assert_series_equal(typed_jira_tickets[column_name].astype(object), jira_tickets[column_name].astype(object))
+
+    jira_data = JiraDataLoader(CsvDataLoader(use_schema=True)).load_data(csv_filepath)
+    assert jira_data.get_projects() == JiraDataLoader(CsvDataLoader()).load_data(csv_filepath).get_projects()
+
+def test_jiradataloader_merge_data(tmp_path):
+    csv_filepath = str(tmp_path / "jira_metrics.csv")
+    TestHelpers.get_updated_jira_data().to_csv(csv_filepath, index=False)
+    jira_data_loader = JiraDataLoader(CsvDataLoader())
+    previous_jira_data = jira_data_loader.load_data(TestHelpers.get_jira_data_csv_filepath())
+
+    jira_data = jira_data_loader.merge_data(previous_jira_data, csv_filepath)
+    expected_jira_data = jira_data_loader.load_data(csv_filepath)
+
+    pd.testing.assert_frame_equal(jira_data.get_tickets(), expected_jira_data.get_tickets())
+    sprint_index = jira_data.get_sprint_index()
+    expected_sprint_index = expected_jira_data.get_sprint_index()
+    assert sprint_index.get_sprint_names() == expected_sprint_index.get_sprint_names()
+    for sprint_name in expected_sprint_index.get_sprint_names():
+        sprint = sprint_index.get_sprint(sprint_name)
+        expected_sprint = expected_sprint_index.get_sprint(sprint_name)
+        assert (sprint.start_date, sprint.end_date, sprint.goals) == (expected_sprint.start_date, expected_sprint.end_date, expected_sprint.goals)
+        assert sprint.ticket_rows.tolist() == expected_sprint.ticket_rows.tolist()
+    for memberships, expected_memberships in [(jira_data.get_sprint_memberships(), expected_jira_data.get_sprint_memberships()),
+                                              (jira_data.get_component_memberships(), expected_jira_data.get_component_memberships())]:
+        assert memberships.get_values() == expected_memberships.get_values()
+        for value in expected_memberships.get_values():
+            assert memberships.get_rows([value]).tolist() == expected_memberships.get_rows([value]).tolist()
+
+    changes = jira_data.get_changes()
+    assert changes.previous_version == previous_jira_data.version
+    assert not changes.is_sprint_changed('MOB - Sprint 1')
+    new_ticket_sprint = jira_data.get_tickets().loc[0, COLUMN_NAME_CALCULATED_SPRINT]
+    assert all(changes.is_sprint_changed(sprint_name) for sprint_name in new_ticket_sprint if sprint_name in sprint_index.get_sprint_names())
+
+def test_jiradatasingleton_watcher_swaps_in_new_version(tmp_path, monkeypatch):
+    csv_filepath = TestHelpers.copy_jira_data_csv(tmp_path)
+    monkeypatch.setenv('REPORTING_CSV_PATH', csv_filepath)
+    monkeypatch.setattr(JiraDataSingleton, '_instance', None)
+    monkeypatch.setattr(JiraDataSingleton, '_initialized', False)
+    jira_data_singleton = JiraDataSingleton(JiraDataLoader(CsvDataLoader()))
+    previous_jira_data = jira_data_singleton.get_current_jira_data()
+    previous_ticket_count = len(previous_jira_data.get_tickets())
+
+    jira_data_singleton.start_watcher(0.05)
+    try:
+        TestHelpers.get_updated_jira_data().to_csv(csv_filepath, index=False)
+        modified_time = os.path.getmtime(csv_filepath) + 1
+        os.utime(csv_filepath, (modified_time, modified_time))
+
+        deadline = time.monotonic() + 30
+        while jira_data_singleton.get_current_jira_data() is previous_jira_data and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        jira_data_singleton.stop_watcher()
+
+    jira_data = jira_data_singleton.get_current_jira_data()
+    assert jira_data.version != previous_jira_data.version
+    assert 'NEW-1' in jira_data.get_tickets()['ID'].values
+    # Requests that resolved the previous version keep working on it
+    assert len(previous_jira_data.get_tickets()) == previous_ticket_count
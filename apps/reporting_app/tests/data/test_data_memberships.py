@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from src.data.data_memberships import JiraDataMembership
+from src.config.constants import COLUMN_NAME_CALCULATED_COMPONENTS
+
+def test_jiradatamembership():
+    tickets = pd.DataFrame({
+        COLUMN_NAME_CALCULATED_COMPONENTS: [['BFF', 'SFCC'], [np.nan], ['FEWeb'], [], ['SFCC ']]
+    })
+    component_memberships = JiraDataMembership(tickets, COLUMN_NAME_CALCULATED_COMPONENTS)
+
+    assert component_memberships.get_values() == ['BFF', 'FEWeb', 'SFCC']
+    assert component_memberships.get_values(np.array([0, 1])) == ['BFF', 'SFCC']
+    assert component_memberships.get_values(np.array([3])) == []
+    assert component_memberships.get_rows(['SFCC']).tolist() == [0, 4]
+    assert component_memberships.get_rows(['BFF', 'FEWeb', 'XM']).tolist() == [0, 2]
+    assert component_memberships.get_rows(['XM']).tolist() == []
+
+def test_jiradatamembership_bitsets(monkeypatch):
+    tickets = pd.DataFrame({
+        COLUMN_NAME_CALCULATED_COMPONENTS: [['BFF', 'SFCC'], [np.nan], ['FEWeb'], [], ['SFCC '], []]
+    })
+    component_memberships = JiraDataMembership(tickets, COLUMN_NAME_CALCULATED_COMPONENTS)
+
+    # Bits of BFF, FEWeb and SFCC
+    assert component_memberships.get_bitsets().tolist() == [0b101, 0, 0b010, 0, 0b100]
+    assert component_memberships.has_values(np.array([0, 2, 3, 4, 5]), ['SFCC', 'XM']).tolist() == [True, False, False, True, False]
+    assert component_memberships.get_values(np.array([2, 5])) == ['FEWeb']
+
+    # Same rows and values without the bitsets, as for columns with too many distinct values
+    monkeypatch.setattr(JiraDataMembership, 'BITSET_MAX_VALUES', 0)
+    assert component_memberships.has_values(np.array([0, 2, 3, 4, 5]), ['SFCC', 'XM']).tolist() == [True, False, False, True, False]
+    assert component_memberships.get_values(np.array([2, 5])) == ['FEWeb']
+    assert component_memberships.get_rows(['BFF', 'FEWeb', 'XM']).tolist() == [0, 2]
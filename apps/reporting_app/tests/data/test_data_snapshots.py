@@ -0,0 +1,64 @@
+import threading
+import pandas as pd
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from src.data.data_snapshots import JiraDataSnapshot
+from src.config.constants import COLUMN_NAME_CALCULATED_SPRINT
+from tests.test_helpers import TestHelpers
+
+def test_jiradataloader_load_data_from_snapshot(tmp_path, mocker):
+    csv_filepath = TestHelpers.copy_jira_data_csv(tmp_path)
+    csv_data_loader = CsvDataLoader()
+    jira_data_loader = JiraDataLoader(csv_data_loader, use_snapshot=True)
+
+    jira_data = jira_data_loader.load_data(csv_filepath)
+    assert JiraDataSnapshot(csv_filepath, csv_data_loader.get_ingestion_mode()).is_valid()
+
+    # The second load must not parse the CSV again
+    load_csv = mocker.spy(csv_data_loader, 'load_data')
+    snapshot_jira_data = jira_data_loader.load_data(csv_filepath)
+    load_csv.assert_not_called()
+
+    assert snapshot_jira_data.version == jira_data.version
+    pd.testing.assert_frame_equal(snapshot_jira_data.get_tickets(), jira_data.get_tickets())
+    assert snapshot_jira_data.get_tickets()[COLUMN_NAME_CALCULATED_SPRINT].map(type).eq(list).all()
+
+    sprint = jira_data.get_sprint_index().get_sprint('MOB - Sprint 1')
+    snapshot_sprint = snapshot_jira_data.get_sprint_index().get_sprint('MOB - Sprint 1')
+    assert (snapshot_sprint.start_date, snapshot_sprint.end_date, snapshot_sprint.goals) == (sprint.start_date, sprint.end_date, sprint.goals)
+    assert snapshot_sprint.ticket_rows.tolist() == sprint.ticket_rows.tolist()
+    assert snapshot_jira_data.get_component_memberships().get_values() == jira_data.get_component_memberships().get_values()
+    assert snapshot_jira_data.get_sprint_memberships().get_rows(['MOB - Sprint 1']).tolist() == \
+        jira_data.get_sprint_memberships().get_rows(['MOB - Sprint 1']).tolist()
+
+def test_jiradatasnapshot_invalid_after_csv_change(tmp_path):
+    csv_filepath = TestHelpers.copy_jira_data_csv(tmp_path)
+    csv_data_loader = CsvDataLoader()
+    JiraDataLoader(csv_data_loader, use_snapshot=True).load_data(csv_filepath)
+    assert JiraDataSnapshot(csv_filepath, csv_data_loader.get_ingestion_mode()).is_valid()
+
+    with open(csv_filepath, 'a') as f:
+        f.write("\n")
+
+    snapshot = JiraDataSnapshot(csv_filepath, csv_data_loader.get_ingestion_mode())
+    assert not snapshot.is_valid()
+    assert snapshot.load() is None
+
+def test_jiradataloader_load_data_waits_for_snapshot(tmp_path, mocker):
+    csv_filepath = TestHelpers.copy_jira_data_csv(tmp_path)
+    csv_data_loader = CsvDataLoader()
+    snapshot = JiraDataSnapshot(csv_filepath, csv_data_loader.get_ingestion_mode())
+    load_csv = mocker.spy(csv_data_loader, 'load_data')
+
+    loaded_jira_data = []
+    with snapshot.lock():
+        thread = threading.Thread(target=lambda: loaded_jira_data.append(JiraDataLoader(csv_data_loader, use_snapshot=True).load_data(csv_filepath)))
+        thread.start()
+        # Another process writes the snapshot while the loader waits for it
+        thread.join(timeout=0.5)
+        assert thread.is_alive()
+        jira_data = JiraDataLoader(CsvDataLoader()).load_data(csv_filepath)
+        snapshot.save(jira_data.get_tickets(), jira_data.get_sprint_index(), jira_data.get_sprint_memberships(), jira_data.get_component_memberships())
+    thread.join()
+
+    load_csv.assert_not_called()
+    pd.testing.assert_frame_equal(loaded_jira_data[0].get_tickets(), jira_data.get_tickets())
@@ -0,0 +1,47 @@
+import pandas as pd
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from src.data.data_sprints import JiraDataSprintIndex
+from src.config.constants import COLUMN_NAME_ID, COLUMN_NAME_SPRINT, COLUMN_NAME_SPRINT_START_DATE, COLUMN_NAME_SPRINT_END_DATE, COLUMN_NAME_SPRINT_GOALS
+from tests.test_helpers import TestHelpers
+
+def test_jiradatasprintindex_get_sprint():
+    tickets = pd.DataFrame({
+        COLUMN_NAME_ID: ['DMA-1', 'DMA-2', 'DMA-3'],
+        COLUMN_NAME_SPRINT: ['["MOB - Sprint 1"-"MOB - Sprint 2"]', 'MOB - Sprint 2', None],
+        COLUMN_NAME_SPRINT_START_DATE: ['["2025-01-06T00:00:00.000Z"-"2025-01-20T00:00:00.000Z"]', '2025-01-20T00:00:00.000Z', None],
+        COLUMN_NAME_SPRINT_END_DATE: ['["2025-01-17T00:00:00.000Z"-null]', 'null', None],
+        COLUMN_NAME_SPRINT_GOALS: ['["Ship login"-"Ship checkout"]', 'Ship checkout', None]
+    })
+    sprint_index = JiraDataSprintIndex(tickets)
+
+    assert sprint_index.get_sprint_names() == ['MOB - Sprint 1', 'MOB - Sprint 2']
+
+    sprint = sprint_index.get_sprint('MOB - Sprint 1')
+    assert sprint.start_date == pd.Timestamp('2025-01-06T00:00:00.000Z')
+    assert sprint.end_date == pd.Timestamp('2025-01-17T00:00:00.000Z')
+    assert sprint.goals == 'Ship login'
+    assert sprint.ticket_rows.tolist() == [0]
+
+    sprint = sprint_index.get_sprint('MOB - Sprint 2')
+    assert sprint.start_date == pd.Timestamp('2025-01-20T00:00:00.000Z')
+    assert sprint.end_date is None
+    assert sprint.goals == 'Ship checkout'
+    assert sprint.ticket_rows.tolist() == [0, 1]
+
+    assert sprint_index.get_sprint('MOB - Sprint 3') is None
+    assert sprint_index.get_sprint_date_range('MOB - Sprint 3') == (None, None)
+    assert sprint_index.get_ticket_rows(['MOB - Sprint 1', 'MOB - Sprint 2']).tolist() == [0, 1]
+    assert sprint_index.sort_sprints_by_start_date(['MOB - Sprint 1', 'MOB - Sprint 2', 'MOB - Sprint 3']) == ['MOB - Sprint 2', 'MOB - Sprint 1', 'MOB - Sprint 3']
+
+def test_jiradataloader_builds_sprint_index(mocker):
+    mock_csv_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data_loader = JiraDataLoader(mock_csv_loader)
+    jira_data = jira_data_loader.load_data("jira_metrics.csv")
+    tickets = jira_data.get_tickets()
+
+    sprint = jira_data.get_sprint_index().get_sprint('MOB - Sprint 1')
+    assert sprint.start_date == pd.Timestamp('2025-04-01T22:28:22.220Z')
+    assert len(sprint.ticket_rows) == 25
+    assert set(tickets.loc[sprint.ticket_rows, COLUMN_NAME_SPRINT]) == set(
+        tickets[tickets[COLUMN_NAME_SPRINT].str.contains('"MOB - Sprint 1"|^MOB - Sprint 1$', na=False)][COLUMN_NAME_SPRINT])
@@ -0,0 +1,63 @@
+from src.data.data_durations import JiraDataSprintDurationService
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from src.data.data_stage_metrics import JiraDataStageMetricsService
+from src.data.data_filters import JiraDataFilter
+from src.config.constants import STAGE_THRESHOLDS, THRESHOLD_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS, COLUMN_NAME_CALCULATED_SPRINT
+from src.utils.stage_utils import StageUtils
+from tests.test_helpers import TestHelpers
+
+def test_jiradatastagemetricsservice_getthresholdviolations(mocker):
+    mock_csv_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data = JiraDataLoader(mock_csv_loader).load_data("jira_metrics.csv")
+    sprint_name = 'Dory Sprint 7.2.25'
+    tickets = jira_data.get_tickets()
+    tickets = tickets[tickets[COLUMN_NAME_CALCULATED_SPRINT].map(lambda sprints: sprint_name in sprints)]
+
+    jira_data_stage_metrics_service = JiraDataStageMetricsService(jira_data)
+    violations = jira_data_stage_metrics_service.get_threshold_violations(tickets, sprint_name)
+    violation_counts = jira_data_stage_metrics_service.get_threshold_violation_counts(tickets, sprint_name)
+
+    # Same violations as checking every stage of every ticket
+    sprint_data = JiraDataSprintDurationService(jira_data).get_tickets_duration_in_sprint(tickets, sprint_name)
+    stage_columns = [stage_col for stage_col in THRESHOLD_STAGE_COLUMNS_IN_SPRINT_DURATION_IN_DAYS if stage_col in sprint_data.columns]
+    expected_violations = {}
+    expected_critical_counts = dict.fromkeys(stage_columns, 0)
+    for row, ticket in sprint_data.iterrows():
+        exceeding_stages = []
+        for stage_col in stage_columns:
+            stage_name = StageUtils.to_stage_name(stage_col)
+            thresholds = STAGE_THRESHOLDS.get(stage_name, STAGE_THRESHOLDS['default'])
+            if ticket[stage_col] >= thresholds['warning']:
+                exceeding_stages.append((f"{stage_name} ({ticket[stage_col]:.1f}d)", ticket[stage_col] / thresholds['warning']))
+            if ticket[stage_col] >= thresholds['critical']:
+                expected_critical_counts[stage_col] += 1
+        if exceeding_stages:
+            expected_violations[row] = (', '.join(label for label, _ in exceeding_stages), max(ratio for _, ratio in exceeding_stages))
+
+    assert not violations.empty
+    assert {row: (ticket['exceeding_stages'], ticket['threshold_ratio']) for row, ticket in violations.iterrows()} == expected_violations
+    sort_keys = list(zip(violations['priority_sort'], -violations['threshold_ratio']))
+    assert sort_keys == sorted(sort_keys)
+
+    assert violation_counts['Stage'].tolist() == [StageUtils.to_stage_name(stage_col) for stage_col in stage_columns]
+    assert violation_counts['Critical'].tolist() == list(expected_critical_counts.values())
+    assert (violation_counts['Warning'] >= violation_counts['Critical']).all()
+    assert violation_counts['Warning'].sum() == violations['exceeding_stages'].str.count(r'd\)').sum()
+
+def test_jiradatastagemetricsservice_getavgdays_keeps_newer_versions(mocker):
+    mock_csv_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_loader.load_data.return_value = TestHelpers.get_jira_data()
+    previous_jira_data = JiraDataLoader(mock_csv_loader).load_data("jira_metrics.csv")
+    jira_data = JiraDataLoader(mock_csv_loader).load_data("jira_metrics.csv")
+    JiraDataStageMetricsService.clear_cache()
+    filter = JiraDataFilter(sprints=['Dory Sprint 7.2.25'])
+
+    avg_days = JiraDataStageMetricsService(jira_data).get_avg_days('Dory Sprint 7.2.25', filter)
+    # a request still running on the previous version after a reload doesn't clear the averages of the new one
+    JiraDataStageMetricsService(previous_jira_data).get_avg_days('Dory Sprint 7.2.25', filter)
+    cached_avg_days = JiraDataStageMetricsService(jira_data).get_avg_days('Dory Sprint 7.2.25', filter)
+
+    assert JiraDataStageMetricsService.get_cache_stats()['hits'] == 1
+    assert JiraDataStageMetricsService.get_cache_stats()['size'] == 2
+    assert cached_avg_days.equals(avg_days)
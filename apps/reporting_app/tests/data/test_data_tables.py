@@ -0,0 +1,84 @@
+import pandas as pd
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from src.data.data_tables import JiraDataTicketTable, JiraDataTicketTableService
+from src.utils.cache_utils import SqliteCache
+from src.config.constants import PRIORITY_ORDER, COLUMN_NAME_PRIORITY, COLUMN_NAME_PRIORITY_SORT, COLUMN_NAME_TYPE_SORT
+from tests.test_helpers import TestHelpers
+
+def test_jiradatatickettable_getrows():
+    tickets = pd.DataFrame({
+        'ID': ['A-1', 'A-2', 'A-3', 'A-4', 'A-5'],
+        'Name': ['Login page', 'Cart', 'Login api', 'Checkout', None],
+        'Priority': ['Low', 'Highest', 'Medium', 'Highest', None],
+        'StoryPoints': [3, 5, 1, 8, None],
+        'Link': [f'https://jira/browse/A-{i}' for i in range(1, 6)],
+        'priority_sort': [6, 0, 4, 0, 8],
+        'type_sort': [1, 1, 1, 1, 1]
+    })
+    table = JiraDataTicketTable(tickets, ['ID', 'Name', 'Priority', 'StoryPoints'])
+
+    # Pages keep the default order and only render the links of their rows
+    rows = table.get_rows({'startRow': 1, 'endRow': 3})
+    assert rows['rowCount'] == 5
+    assert rows['rowData'] == [
+        {'ID': '[A-2](https://jira/browse/A-2)', 'Name': 'Cart', 'Priority': 'Highest', 'StoryPoints': 5.0},
+        {'ID': '[A-3](https://jira/browse/A-3)', 'Name': 'Login api', 'Priority': 'Medium', 'StoryPoints': 1.0}
+    ]
+
+    # Priority is sorted by its order rather than alphabetically
+    rows = table.get_rows({'startRow': 0, 'endRow': 10, 'sortModel': [{'colId': 'Priority', 'sort': 'asc'}, {'colId': 'StoryPoints', 'sort': 'desc'}]})
+    assert [row['Name'] for row in rows['rowData']] == ['Checkout', 'Cart', 'Login api', 'Login page', None]
+
+    rows = table.get_rows({'startRow': 0, 'endRow': 10, 'filterModel': {'Name': {'filterType': 'text', 'type': 'contains', 'filter': 'LOGIN'}}})
+    assert rows['rowCount'] == 2
+    rows = table.get_rows({'startRow': 0, 'endRow': 10, 'filterModel': {
+        'StoryPoints': {'filterType': 'number', 'operator': 'OR', 'conditions': [
+            {'filterType': 'number', 'type': 'lessThan', 'filter': 2},
+            {'filterType': 'number', 'type': 'greaterThanOrEqual', 'filter': 8}
+        ]}
+    }})
+    assert [row['Name'] for row in rows['rowData']] == ['Login api', 'Checkout']
+
+def test_jiradatatickettableservice_gettable(mocker):
+    mock_csv_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data = JiraDataLoader(mock_csv_loader).load_data("jira_metrics.csv")
+    JiraDataTicketTableService.clear_cache()
+
+    # The sort keys are computed when the tickets are loaded
+    tickets = jira_data.get_tickets()
+    assert tickets[COLUMN_NAME_TYPE_SORT].notna().all()
+    expected_priority_sort = tickets[COLUMN_NAME_PRIORITY].astype(object).map(lambda priority: PRIORITY_ORDER.get(priority, 8))
+    assert tickets[COLUMN_NAME_PRIORITY_SORT].tolist() == expected_priority_sort.tolist()
+
+    build_table = mocker.Mock(side_effect=lambda: JiraDataTicketTable(tickets, ['ID']))
+    table = JiraDataTicketTableService(jira_data).get_table(('all', 'Sprint 1'), build_table)
+    assert JiraDataTicketTableService(jira_data).get_table(('all', 'Sprint 1'), build_table) is table
+    assert build_table.call_count == 1
+    assert len(table) == len(tickets)
+
+    # a request still running on a previous version doesn't clear the tables of the current one
+    previous_jira_data = JiraDataLoader(mock_csv_loader).load_data("jira_metrics.csv")
+    JiraDataTicketTableService(previous_jira_data).get_table(('all', 'Sprint 1'), build_table)
+    assert JiraDataTicketTableService(jira_data).get_table(('all', 'Sprint 1'), build_table) is table
+    assert build_table.call_count == 2
+
+def test_jiradatatickettableservice_gettable_from_shared_cache(tmp_path, mocker):
+    mock_csv_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data = JiraDataLoader(mock_csv_loader).load_data("jira_metrics.csv")
+    tickets = jira_data.get_tickets()
+    mocker.patch.object(JiraDataTicketTableService, '_JiraDataTicketTableService__shared_cache',
+                        SqliteCache(str(tmp_path / 'ticket_tables.sqlite'), 'ticket_table'))
+    JiraDataTicketTableService.clear_cache()
+
+    build_table = mocker.Mock(side_effect=lambda: JiraDataTicketTable(tickets, ['ID']))
+    table = JiraDataTicketTableService(jira_data).get_table(('all', 'Sprint 1'), build_table)
+
+    # Another process, e.g. the worker serving the pages of a table a background callback built, reads it from the shared cache
+    JiraDataTicketTableService.clear_cache()
+    shared_table = JiraDataTicketTableService(jira_data).get_table(('all', 'Sprint 1'), build_table)
+    assert build_table.call_count == 1
+    assert shared_table.get_rows({'startRow': 0, 'endRow': 10}) == table.get_rows({'startRow': 0, 'endRow': 10})
+    # and serves the following pages from its memory
+    assert JiraDataTicketTableService(jira_data).get_table(('all', 'Sprint 1'), build_table) is shared_table
@@ -62,4 +62,25 @@ def test_jiradorametrics_meantimetorecovery(mocker):
     assert result.value == 0
 
     result = jira_data_dora_metrics.get_mean_time_to_recovery(JiraDataDoraMetricsFilter(projects=['Digital MECCA App'], squads=None, start_date=None, end_date=None))
-    assert result.value == 0.0
\ No newline at end of file
+    assert result.value == 0.0
+
+def test_jiradorametrics_getmetrics(mocker):
+    mock_csv_data_loader = mocker.Mock(spec=CsvDataLoader)
+    mock_csv_data_loader.load_data.return_value = TestHelpers.get_jira_data()
+    jira_data_loader = JiraDataLoader(mock_csv_data_loader)
+    jira_data = jira_data_loader.load_data("jira_metrics.csv")
+    tickets = jira_data.get_tickets()
+    jira_data_dora_metrics = JiraDataDoraMetrics(tickets, jira_data.get_sprint_index(), jira_data.get_sprint_memberships())
+
+    for filter in [JiraDataDoraMetricsFilter(projects=None, squads=None, start_date=None, end_date=None),
+                   JiraDataDoraMetricsFilter(projects=['Digital MECCA App'], squads=None,
+                                             start_date=datetime(2025, 1, 1, tzinfo=timezone.utc), end_date=datetime(2025, 3, 31, tzinfo=timezone.utc))]:
+        result = jira_data_dora_metrics.get_metrics(filter)
+        assert result.lead_time_for_changes.value == jira_data_dora_metrics.get_lead_time_for_changes(filter).value
+        assert result.deployment_frequency.value == jira_data_dora_metrics.get_deployment_frequency(filter).value
+        assert result.change_failure_rate.value == jira_data_dora_metrics.get_change_failure_rate(filter).value
+        assert result.mean_time_to_recovery.value == jira_data_dora_metrics.get_mean_time_to_recovery(filter).value
+
+    # Filtering leaves the tickets of the engine untouched, later calls see all of them again
+    assert jira_data_dora_metrics.get_metrics(JiraDataDoraMetricsFilter(projects=None, squads=None, start_date=None, end_date=None)).deployment_frequency.value == 0.6116681859617138
+    assert len(tickets) == len(jira_data.get_tickets())
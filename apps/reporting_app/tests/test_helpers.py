@@ -1,9 +1,38 @@
 import pandas as pd
+import shutil
 from pathlib import Path
+from src.utils.string_utils import split_string_array
 class TestHelpers:
     @staticmethod
-    def get_jira_data()->pd.DataFrame:
+    def get_jira_data_csv_filepath()->str:
         # Get the absolute path to the CSV file
         basepath = Path()
         basedir = str(basepath.cwd())
-        return pd.read_csv(f"{basedir}/apps/reporting_app/tests/jira_metrics_mock.csv")
\ No newline at end of file
+        return f"{basedir}/apps/reporting_app/tests/jira_metrics_mock.csv"
+
+    @staticmethod
+    def copy_jira_data_csv(dirpath: Path)->str:
+        # Loads that write a snapshot next to the CSV write it in dirpath instead of the source tree
+        csv_filepath = str(dirpath / "jira_metrics.csv")
+        shutil.copy(TestHelpers.get_jira_data_csv_filepath(), csv_filepath)
+        return csv_filepath
+
+    @staticmethod
+    def get_jira_data()->pd.DataFrame:
+        return pd.read_csv(TestHelpers.get_jira_data_csv_filepath())
+
+    @staticmethod
+    def get_updated_jira_data()->pd.DataFrame:
+        # Next export of the mock data with removed, updated and new tickets and further counted stage days,
+        # none of them in MOB - Sprint 1
+        jira_tickets = pd.read_csv(TestHelpers.get_jira_data_csv_filepath(), dtype=str, keep_default_na=False)
+        in_sprint = jira_tickets['Sprint'].map(lambda value: 'MOB - Sprint 1' in [name.strip() for name in split_string_array(value, '"-"')])
+        rows = jira_tickets.index[~in_sprint]
+
+        jira_tickets.loc[rows[5:15], 'UpdatedDate'] = '2025-05-01T10:00:00.000+1000'
+        jira_tickets.loc[rows[5:10], 'Components'] = 'FEApp'
+        jira_tickets.loc[rows[15:20], 'Stage In Progress days'] = '42'
+        new_tickets = jira_tickets.loc[rows[20:23]].assign(ID=['NEW-1', 'NEW-2', 'NEW-3'])
+        jira_tickets = jira_tickets.drop(index=rows[:5])
+
+        return pd.concat([new_tickets, jira_tickets], ignore_index=True)
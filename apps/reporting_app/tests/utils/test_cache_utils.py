@@ -0,0 +1,58 @@
+import numpy as np
+from src.utils.cache_utils import LRUCache, SqliteCache
+
+def test_lrucache():
+    cache = LRUCache(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+
+    # 'b' is the least recently used entry and gets evicted
+    cache.set('c', 3)
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert cache.get_stats() == {'hits': 2, 'misses': 1, 'size': 2, 'max_size': 2}
+
+    cache.clear()
+    assert len(cache) == 0
+
+def test_lrucache_ttl(mocker):
+    monotonic = mocker.patch('src.utils.cache_utils.time.monotonic', return_value=100.0)
+    cache = LRUCache(max_size=2, ttl_seconds=10)
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+
+    monotonic.return_value = 110.0
+    assert 'a' not in cache
+    assert cache.get('a') is None
+
+def test_sqlitecache(tmp_path, mocker):
+    filepath = str(tmp_path / 'results.sqlite')
+    # Caches of two workers on the same file
+    cache = SqliteCache(filepath, 'filter', max_size=2, ttl_seconds=10)
+    other_cache = SqliteCache(filepath, 'filter', max_size=2, ttl_seconds=10)
+    avg_days_cache = SqliteCache(filepath, 'avg_days', max_size=2, ttl_seconds=10)
+
+    now = mocker.patch('src.utils.cache_utils.time.time', return_value=100.0)
+    cache.set(('v1', ('Sprint 1',)), (np.array([1, 2]), {'squads': ['A']}))
+    ticket_rows, facet_values = other_cache.get(('v1', ('Sprint 1',)))
+    assert ticket_rows.tolist() == [1, 2] and facet_values == {'squads': ['A']}
+    assert avg_days_cache.get(('v1', ('Sprint 1',))) is None
+
+    # The oldest entry beyond max_size is evicted
+    now.return_value = 101.0
+    cache.set(('v1', ('Sprint 2',)), 2)
+    now.return_value = 102.0
+    other_cache.set(('v1', ('Sprint 3',)), 3)
+    assert cache.get(('v1', ('Sprint 1',))) is None
+    assert cache.get(('v1', ('Sprint 2',))) == 2
+    assert cache.get_stats() == {'hits': 1, 'misses': 1, 'size': 2, 'max_size': 2}
+
+    # Entries expire after the TTL
+    now.return_value = 111.5
+    assert cache.get(('v1', ('Sprint 2',))) is None
+    assert cache.get(('v1', ('Sprint 3',))) == 3
+
+    other_cache.clear()
+    assert len(cache) == 0
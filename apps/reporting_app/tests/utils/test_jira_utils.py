@@ -1,3 +1,4 @@
+import pandas as pd
 from src.utils.jira_utils import JiraTicketHelpers
 
 def test_get_components_from_summary():
@@ -7,3 +8,10 @@ def test_get_components_from_summary():
     assert JiraTicketHelpers.get_components_from_summary(None) == []
     assert JiraTicketHelpers.get_components_from_summary("") == []
 
+def test_get_components_from_summaries():
+    summaries = pd.Series(["[BFF|BFFWeb] - Update product catalog", "Update product catalog", None, "[SFCC] - Update product catalog"])
+
+    components = JiraTicketHelpers.get_components_from_summaries(summaries)
+
+    assert components.index.tolist() == [0, 0, 3]
+    assert components.tolist() == ["BFF", "BFFWeb", "SFCC"]
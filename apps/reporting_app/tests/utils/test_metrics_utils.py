@@ -0,0 +1,34 @@
+import pytest
+from src.utils.metrics_utils import MetricsRegistry
+
+def test_metricsregistry_render():
+    metrics_registry = MetricsRegistry(buckets=(0.1, 1.0))
+    metrics_registry.describe('filter_seconds', 'Latency of filtering')
+    metrics_registry.observe('filter_seconds', 0.05, output='a.b')
+    metrics_registry.observe('filter_seconds', 0.5, output='a.b')
+    metrics_registry.observe('filter_seconds', 5, output='a.b')
+
+    @metrics_registry.timed('load_seconds', phase='read "csv"')
+    def load():
+        raise ValueError()
+    with pytest.raises(ValueError):
+        load()
+
+    metrics_registry.add_collector(lambda: [('cache_hits_total', 'counter', {'cache': 'filter'}, 3)])
+    metrics_registry.add_collector(lambda: 1 / 0)
+
+    # Failing calls are observed too, failing collectors are left out
+    assert metrics_registry.get_histogram('load_seconds', phase='read "csv"')['count'] == 1
+    assert metrics_registry.get_histogram('filter_seconds', output='a.b') == {'buckets': {0.1: 1, 1.0: 2, float('inf'): 3}, 'sum': 5.55, 'count': 3}
+    lines = metrics_registry.render().splitlines()
+    assert lines[:7] == [
+        '# HELP filter_seconds Latency of filtering',
+        '# TYPE filter_seconds histogram',
+        'filter_seconds_bucket{output="a.b",le="0.1"} 1',
+        'filter_seconds_bucket{output="a.b",le="1"} 2',
+        'filter_seconds_bucket{output="a.b",le="+Inf"} 3',
+        'filter_seconds_sum{output="a.b"} 5.55',
+        'filter_seconds_count{output="a.b"} 3'
+    ]
+    assert 'load_seconds_count{phase="read \\"csv\\""} 1' in lines
+    assert lines[-2:] == ['# TYPE cache_hits_total counter', 'cache_hits_total{cache="filter"} 3']
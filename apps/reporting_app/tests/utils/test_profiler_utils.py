@@ -0,0 +1,32 @@
+import json
+import pstats
+from src.utils.profiler_utils import CallbackProfiler
+
+def slow_callback():
+    return sum(range(1000))
+
+def test_callbackprofiler_stop(tmp_path):
+    callback_profiler = CallbackProfiler(str(tmp_path), budget_seconds=1.0, max_profiles=2)
+
+    # Requests within the budget are not kept
+    profile = callback_profiler.start()
+    slow_callback()
+    assert callback_profiler.stop(profile, 0.5, 'update_avg_cycletime', {}) is None
+    assert callback_profiler.get_profiles() == []
+
+    filepaths = []
+    for elapsed_seconds in [1.0, 2.0, 3.0]:
+        profile = callback_profiler.start()
+        slow_callback()
+        filepaths.append(callback_profiler.stop(profile, elapsed_seconds, 'update_avg_cycletime', {'inputs': [{'id': 'sprint-dropdown', 'value': 'Sprint 1'}]}))
+
+    # Only the newest profiles are kept, each with its inputs
+    assert callback_profiler.get_profiles() == filepaths[1:]
+    assert sorted(file.name for file in tmp_path.iterdir()) == sorted([name for filepath in filepaths[1:] for name in
+                                                                       [filepath.split('/')[-1], filepath.split('/')[-1].replace('.pstats', '.json')]])
+    assert any(function_name == 'slow_callback' for _, _, function_name in pstats.Stats(filepaths[-1]).stats)
+    with open(filepaths[-1].replace('.pstats', '.json')) as file:
+        details = json.load(file)
+    assert details['name'] == 'update_avg_cycletime'
+    assert details['elapsed_seconds'] == 3.0
+    assert details['inputs'] == [{'id': 'sprint-dropdown', 'value': 'Sprint 1'}]
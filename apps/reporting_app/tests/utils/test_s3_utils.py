@@ -0,0 +1,70 @@
+import gzip
+import boto3
+import pytest
+from moto import mock_aws
+from src.utils.s3_utils import S3DownloadResult, download_csv_from_s3
+
+BUCKET_NAME = 'jira-dashboards'
+
+@pytest.fixture
+def s3_client(tmp_path, monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    monkeypatch.setenv('S3_BUCKET_NAME', BUCKET_NAME)
+    monkeypatch.setenv('REPORTING_CSV_PATH', str(tmp_path / 'data' / 'jira_metrics.csv'))
+    monkeypatch.setenv('S3_MULTIPART_THRESHOLD_MB', '1')
+    monkeypatch.setenv('S3_MULTIPART_CHUNKSIZE_MB', '1')
+    with mock_aws():
+        s3_client = boto3.client('s3')
+        s3_client.create_bucket(Bucket=BUCKET_NAME)
+        yield s3_client
+
+def get_csv_content(ticket_count: int) -> bytes:
+    # Large enough to be downloaded in several ranged parts
+    return b'ID,Name\n' + b''.join(f"DMA-{i},Ticket {i}\n".encode() for i in range(ticket_count))
+
+def test_download_csv_from_s3_skips_unchanged_object(s3_client, tmp_path):
+    csv_content = get_csv_content(300000)
+    s3_client.put_object(Bucket=BUCKET_NAME, Key='jira_metrics.csv', Body=csv_content)
+
+    result = download_csv_from_s3(s3_client)
+    assert result.status == S3DownloadResult.STATUS_DOWNLOADED
+    assert result.bytes_transferred == len(csv_content)
+    assert (tmp_path / 'data' / 'jira_metrics.csv').read_bytes() == csv_content
+
+    result = download_csv_from_s3(s3_client)
+    assert result.status == S3DownloadResult.STATUS_NOT_MODIFIED
+    assert result.bytes_transferred == 0
+
+    csv_content = get_csv_content(10)
+    s3_client.put_object(Bucket=BUCKET_NAME, Key='jira_metrics.csv', Body=csv_content)
+    result = download_csv_from_s3(s3_client)
+    assert result.status == S3DownloadResult.STATUS_DOWNLOADED
+    assert (tmp_path / 'data' / 'jira_metrics.csv').read_bytes() == csv_content
+
+    # A local file that no longer is the downloaded one is downloaded again
+    (tmp_path / 'data' / 'jira_metrics.csv').write_bytes(b'ID,Name\n')
+    assert download_csv_from_s3(s3_client).status == S3DownloadResult.STATUS_DOWNLOADED
+    assert (tmp_path / 'data' / 'jira_metrics.csv').read_bytes() == csv_content
+
+@pytest.mark.parametrize("compression", ['gzip', 'zstd'])
+def test_download_csv_from_s3_decompresses_object(s3_client, tmp_path, monkeypatch, compression):
+    csv_content = get_csv_content(300000)
+    if compression == 'gzip':
+        key, compressed_content = 'jira_metrics.csv.gz', gzip.compress(csv_content)
+    else:
+        zstandard = pytest.importorskip('zstandard')
+        key, compressed_content = 'jira_metrics.csv.zst', zstandard.ZstdCompressor().compress(csv_content)
+    s3_client.put_object(Bucket=BUCKET_NAME, Key=key, Body=compressed_content)
+    monkeypatch.setenv('S3_CSV_COMPRESSION', compression)
+
+    result = download_csv_from_s3(s3_client)
+
+    assert result.status == S3DownloadResult.STATUS_DOWNLOADED
+    assert result.key == key
+    assert result.bytes_transferred == len(compressed_content)
+    assert (tmp_path / 'data' / 'jira_metrics.csv').read_bytes() == csv_content
+    # Only the CSV file and its download metadata are left behind
+    assert sorted(path.name for path in (tmp_path / 'data').iterdir()) == ['jira_metrics.csv', 'jira_metrics.csv.s3.json']
+    assert download_csv_from_s3(s3_client).status == S3DownloadResult.STATUS_NOT_MODIFIED
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.data_loaders import JiraDataLoader, CsvDataLoader
+from src.data.data_filters import JiraDataFilter, JiraDataFilterService
+from src.utils.stage_utils import StageUtils
+from src.utils.sprint_utils import get_sprint_date_range
+from src.config.constants import THRESHOLD_STAGE_COLUMNS_DURATION_IN_DAYS
+from tests.test_helpers import TestHelpers
+
+def reference_days_in_sprint(sprint_tickets: pd.DataFrame, sprint_name: str) -> pd.DataFrame:
+    # Per-row implementation that calculate_tickets_duration_in_sprint used before it was vectorized
+    sprint_start_date, sprint_end_date = get_sprint_date_range(sprint_tickets, sprint_name)
+    result = {}
+    for stage in THRESHOLD_STAGE_COLUMNS_DURATION_IN_DAYS:
+        start_col = StageUtils.to_stage_start_date_column_name(stage)
+        end_col = StageUtils.to_stage_end_date_column_name(stage)
+        sprint_days_col = StageUtils.to_stage_in_sprint_duration_days_column_name(stage)
+        result[sprint_days_col] = sprint_tickets.apply(
+            lambda row: len([
+                d for d in pd.date_range(
+                    max(sprint_start_date, row[start_col]),
+                    min(sprint_end_date, row[end_col]),
+                    freq='D'
+                ) if d.weekday() < 5
+            ]) if pd.notna(row[start_col]) and pd.notna(row[end_col]) else 0,
+            axis=1
+        )
+    return pd.DataFrame(result, index=sprint_tickets.index)
+
+class MockCsvDataLoader(CsvDataLoader):
+    def load_data(self, csv_filepath: str) -> pd.DataFrame:
+        return TestHelpers.get_jira_data()
+
+@pytest.fixture(scope="module")
+def jira_tickets():
+    jira_data_loader = JiraDataLoader(MockCsvDataLoader())
+    return jira_data_loader.load_data("jira_metrics.csv").get_tickets()
+
+@pytest.mark.parametrize("sprint_name", ['MOB - Sprint 1', 'LFA - Sprint 30', 'Dory Sprint 10.2.25', 'LFW 7.2.25'])
+def test_calculate_tickets_duration_in_sprint_matches_reference(jira_tickets, sprint_name):
+    sprint_data = JiraDataFilterService().filter_tickets(jira_tickets, JiraDataFilter(sprints=[sprint_name])).tickets
+    result = StageUtils.calculate_tickets_duration_in_sprint(sprint_data, sprint_name)
+
+    assert not result.empty
+    expected = reference_days_in_sprint(result, sprint_name)
+    pd.testing.assert_frame_equal(result[expected.columns].astype('int64'), expected.astype('int64'))
+
+def test_count_business_days_overlap():
+    window_start = pd.Timestamp('2025-01-06T09:00:00Z')  # Monday
+    window_end = pd.Timestamp('2025-01-17T18:00:00Z')  # Friday, one week later
+    starts = np.array([
+        '2025-01-01T00:00:00',  # starts before the window
+        '2025-01-10T12:00:00',  # Friday, ends over the weekend
+        '2025-01-08T00:00:00',  # ends before it starts
+        'NaT',
+        '2025-01-15T10:00:00'   # ends after the window
+    ], dtype='datetime64[ns]')
+    ends = np.array([
+        '2025-01-07T08:00:00',
+        '2025-01-13T11:00:00',
+        '2025-01-07T00:00:00',
+        '2025-01-09T00:00:00',
+        '2025-02-01T00:00:00'
+    ], dtype='datetime64[ns]')
+
+    result = StageUtils.count_business_days_overlap(starts, ends, window_start, window_end)
+
+    assert result.tolist() == [1, 1, 0, 0, 3]
@@ -0,0 +1,14 @@
+import pytest
+from src.utils.startup_utils import StartupTimer
+
+def test_startuptimer_records_phases():
+    startup_timer = StartupTimer()
+    with startup_timer.phase('download'):
+        pass
+    with pytest.raises(ValueError):
+        with startup_timer.phase('load'):
+            raise ValueError()
+
+    # Failed phases are recorded too
+    assert list(startup_timer.get_phases().keys()) == ['download', 'load']
+    assert startup_timer.get_elapsed_seconds() >= sum(startup_timer.get_phases().values())
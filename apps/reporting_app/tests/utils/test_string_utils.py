@@ -1,5 +1,6 @@
 import pandas as pd
-from src.utils.string_utils import split_string_array, is_in_array
+import numpy as np
+from src.utils.string_utils import split_string_array, split_string_arrays, is_in_array
 
 def test_split_string_array():
     assert split_string_array("API,BFF,BFF-Web,SFCC", ",") == ['API,BFF,BFF-Web,SFCC']
@@ -16,4 +17,13 @@ def test_is_in_array():
     assert is_in_array("API") == False
     assert is_in_array("API,BFF,BFF-Web,SFCC") == False
     assert is_in_array("API,BFF,BFF-Web,SFCC") == False
-    assert is_in_array("API,BFF,BFF-Web,SFCC") == False
\ No newline at end of file
+    assert is_in_array("API,BFF,BFF-Web,SFCC") == False
+
+def test_split_string_arrays():
+    values = pd.Series(['["D.A.W.N - Sprint 10.2.25"-"D.A.W.N - Sprint 11.2.25"]', np.nan, 'API', '["2024-10-01T09:00:00.000Z"-null]'], index=[3, 5, 7, 9])
+
+    parts = split_string_arrays(values, '"-"')
+
+    assert parts.index.tolist() == [3, 3, 5, 7, 9, 9]
+    for label, value in values.items():
+        assert [str(part) for part in parts.loc[[label]]] == [str(part) for part in split_string_array(value, '"-"')]